@@ -1,10 +1,26 @@
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from ..core.telemetry.metrics import REGISTRY
+from ..services.container import ServiceContainer
+from .v1.compliance import router as compliance_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create application-lifetime services once at startup"""
+    container = ServiceContainer()
+    await container.startup()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await container.shutdown()
 
 app = FastAPI(
     title="ComplianceX API",
     description="API for Azure DevOps Compliance Extension",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -16,10 +32,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(compliance_router)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to ComplianceX API"}
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
\ No newline at end of file
@@ -1,44 +1,415 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, List, Optional
+import os
+import secrets
+from ...core.compliance.base_rules import ComplianceRulePlugin, UnloadableRule
+from ...core.compliance.rollups import RollupStore, content_etag
+from ...core.plugins.plugin_manager import PluginLoadError
+from ...core.reporting.renderers import RENDERERS
 from ...services.compliance_service import ComplianceService
-from ...models.compliance import ComplianceReport
+from ...services.container import ServiceContainer
+from ...services.export_service import ExportService
+from ...services.job_service import JobService
+from ...services.notification_service import NotificationService
+from ...services.remediation_service import RemediationService
+from ...services.webhook_service import WebhookService
+from ...models.compliance import (
+    ComplianceReport,
+    ExportJob,
+    ExportRequest,
+    FixPlan,
+    FixPlanSelection,
+    ScanJob,
+    ScanRequest,
+    dump_json
+)
 
 router = APIRouter(prefix="/api/v1/compliance")
 
-async def get_compliance_service():
-    """Dependency injection for ComplianceService"""
-    return ComplianceService()
+ADMIN_TOKEN_ENV = "COMPLIANCEX_ADMIN_TOKEN"
+WEBHOOK_TOKEN_ENV = "COMPLIANCEX_WEBHOOK_TOKEN"
+
+async def get_container(request: Request) -> ServiceContainer:
+    """Dependency injection for the application's ServiceContainer"""
+    return request.app.state.container
+
+async def get_compliance_service(
+    container: ServiceContainer = Depends(get_container)
+) -> ComplianceService:
+    """Dependency injection for the shared, warm ComplianceService"""
+    return container.compliance_service
+
+async def get_job_service(
+    container: ServiceContainer = Depends(get_container)
+) -> JobService:
+    """Dependency injection for the background JobService"""
+    return container.job_service
+
+async def get_rollups(
+    container: ServiceContainer = Depends(get_container)
+) -> RollupStore:
+    """Dependency injection for the dashboard rollups"""
+    if container.rollups is None:
+        raise HTTPException(status_code=503, detail="The dashboard feature is disabled")
+    return container.rollups
+
+async def get_webhooks(
+    container: ServiceContainer = Depends(get_container)
+) -> WebhookService:
+    """Dependency injection for the service hook ingest"""
+    if container.webhooks is None:
+        raise HTTPException(status_code=503, detail="The webhooks feature is disabled")
+    return container.webhooks
+
+async def get_notifications(
+    container: ServiceContainer = Depends(get_container)
+) -> NotificationService:
+    """Dependency injection for the notification dispatcher"""
+    if container.notifications is None:
+        raise HTTPException(status_code=503, detail="The notifications feature is disabled")
+    return container.notifications
+
+async def get_exports(
+    container: ServiceContainer = Depends(get_container)
+) -> ExportService:
+    """Dependency injection for the report exporter"""
+    if container.exports is None:
+        raise HTTPException(status_code=503, detail="The reporting feature is disabled")
+    return container.exports
+
+async def get_remediation(
+    container: ServiceContainer = Depends(get_container)
+) -> RemediationService:
+    """Dependency injection for the auto-fix applier"""
+    if container.remediation is None:
+        raise HTTPException(status_code=503, detail="The auto-fix feature is disabled")
+    return container.remediation
+
+async def require_webhook_token(x_webhook_token: Optional[str] = Header(None)) -> None:
+    """Allow a service hook delivery only if it carries the configured token
+    
+    Configure the token as an HTTP header of the service hook subscription.
+    Ingest is disabled entirely when no token is configured.
+    """
+    webhook_token = os.environ.get(WEBHOOK_TOKEN_ENV)
+    if not webhook_token:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Webhook ingest is disabled; set {WEBHOOK_TOKEN_ENV} to enable it"
+        )
+    if not x_webhook_token or not secrets.compare_digest(x_webhook_token, webhook_token):
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Allow a request only if it carries the configured admin token
+    
+    Admin endpoints are disabled entirely when no token is configured.
+    """
+    admin_token = os.environ.get(ADMIN_TOKEN_ENV)
+    if not admin_token:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Admin endpoints are disabled; set {ADMIN_TOKEN_ENV} to enable them"
+        )
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag, comparing weakly as RFC 9110 asks"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == etag
+        for candidate in candidates
+    )
+
+def conditional_response(request: Request, payload: bytes, etag: Optional[str] = None) -> Response:
+    """Answer with the JSON payload, or with 304 if the client already has it"""
+    etag = etag or content_etag(payload)
+    # Clients must revalidate, which is cheap, rather than reuse stale reports
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 @router.get("/check/{project_id}", response_model=ComplianceReport)
 async def check_project_compliance(
     project_id: str,
     compliance_service: ComplianceService = Depends(get_compliance_service)
 ):
-    """Check compliance for a specific project"""
+    """Check compliance for a specific project
+    
+    The report is serialized straight to bytes; response_model only
+    documents it, as the service's reports need no re-validation.
+    """
     try:
         report = await compliance_service.check_project_compliance(project_id)
-        return report
+        return Response(content=dump_json(report), media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to check compliance: {str(e)}"
         )
 
+@router.get("/scan")
+async def scan_organization(
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    compliance_service: ComplianceService = Depends(get_compliance_service)
+):
+    """Stream every check of an organization-wide scan as it completes
+    
+    Checks are sent as NDJSON lines or server-sent events. Scanning pauses
+    while the client is not reading and stops when it disconnects.
+    """
+    if compliance_service.devops_client is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Organization scans require an Azure DevOps connection"
+        )
+    checks = compliance_service.stream_organization_compliance()
+    
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for check in checks:
+            yield dump_json(check) + b"\n"
+    
+    async def sse() -> AsyncIterator[bytes]:
+        async for check in checks:
+            yield b"event: check\ndata: " + dump_json(check) + b"\n\n"
+        yield b"event: end\ndata: {}\n\n"
+    
+    if format == "sse":
+        return StreamingResponse(sse(), media_type="text/event-stream")
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    response_model=ScanJob,
+    response_model_exclude={"reports"}
+)
+async def submit_scan_job(
+    scan_request: ScanRequest,
+    compliance_service: ComplianceService = Depends(get_compliance_service),
+    job_service: JobService = Depends(get_job_service)
+):
+    """Queue a scan of some projects or of the whole organization"""
+    if scan_request.project_ids is None and compliance_service.devops_client is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Organization scans require an Azure DevOps connection"
+        )
+    try:
+        return job_service.submit(scan_request.project_ids, scan_request.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs/{job_id}", response_model=ScanJob, response_model_exclude={"reports"})
+async def get_scan_job(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service)
+):
+    """Get the status and progress of a scan job"""
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+@router.get("/jobs/{job_id}/results")
+async def get_scan_job_results(
+    request: Request,
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    job_service: JobService = Depends(get_job_service)
+):
+    """Get the reports a scan job has completed, starting at `offset`"""
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    reports = job.reports[offset:]
+    payload = dump_json({
+        "job": job.model_dump(exclude={"reports"}),
+        "reports": reports,
+        "next_offset": offset + len(reports)
+    })
+    return conditional_response(request, payload)
+
+@router.get("/dashboard")
+async def get_dashboard_overview(
+    request: Request,
+    rollups: RollupStore = Depends(get_rollups)
+):
+    """Get the organization-wide score and status counts from the rollups"""
+    return conditional_response(request, rollups.get_overview_payload(), rollups.get_overview_etag())
+
+@router.get("/dashboard/{project_id}")
+async def get_project_dashboard(
+    request: Request,
+    project_id: str,
+    since: Optional[str] = Query(None),
+    rollups: RollupStore = Depends(get_rollups)
+):
+    """Get a project's dashboard from the rollups, without rescanning or recomputing reports
+    
+    With `since`, a version or ISO timestamp, only the checks whose status
+    changed after it are returned.
+    """
+    if since is not None:
+        try:
+            payload = rollups.get_project_changes(project_id, since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        etag = None
+    else:
+        payload = rollups.get_project_payload(project_id)
+        etag = rollups.get_project_etag(project_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"No results recorded for project: {project_id}")
+    return conditional_response(request, payload, etag)
+
+@router.post("/webhooks/devops", status_code=202, dependencies=[Depends(require_webhook_token)])
+async def ingest_service_hook(
+    payload: dict,
+    webhooks: WebhookService = Depends(get_webhooks)
+):
+    """Queue a targeted re-check for an Azure DevOps service hook event
+    
+    Bursts are debounced, so the re-check runs shortly after the response.
+    """
+    return {"status": webhooks.ingest(payload)}
+
+@router.get("/webhooks/stats")
+async def get_webhook_stats(webhooks: WebhookService = Depends(get_webhooks)):
+    """Get counts of received, deduplicated and coalesced events and of re-checks run"""
+    return webhooks.get_stats()
+
+@router.get("/fixes", response_model=List[FixPlan])
+async def get_fix_plans(
+    status: Optional[str] = Query(None, pattern="^(pending|approved|rejected|applied|failed)$"),
+    project_id: Optional[str] = None,
+    remediation: RemediationService = Depends(get_remediation)
+):
+    """Get the fixes planned for failed checks, oldest first"""
+    return remediation.get_plans(status, project_id)
+
+@router.get("/fixes/stats")
+async def get_fix_stats(remediation: RemediationService = Depends(get_remediation)):
+    """Get plan counts, applied and failed fixes and today's auto-fix budget"""
+    return remediation.get_stats()
+
+@router.post("/fixes/approve", response_model=List[FixPlan], dependencies=[Depends(require_admin)])
+async def approve_fix_plans(
+    selection: FixPlanSelection,
+    remediation: RemediationService = Depends(get_remediation)
+):
+    """Approve pending fix plans; they are applied in the background"""
+    return remediation.fixes.approve(selection.ids)
+
+@router.post("/fixes/reject", response_model=List[FixPlan], dependencies=[Depends(require_admin)])
+async def reject_fix_plans(
+    selection: FixPlanSelection,
+    remediation: RemediationService = Depends(get_remediation)
+):
+    """Reject pending or approved fix plans so they are never applied"""
+    return remediation.fixes.reject(selection.ids)
+
+@router.post("/fixes/apply", status_code=202, dependencies=[Depends(require_admin)])
+async def apply_fix_plans(remediation: RemediationService = Depends(get_remediation)):
+    """Apply approved fix plans now, as far as today's budget allows"""
+    remediation.wake()
+    return {"approved": len(remediation.get_plans("approved"))}
+
+@router.get("/notifications/stats")
+async def get_notification_stats(notifications: NotificationService = Depends(get_notifications)):
+    """Get pending and deduplicated notifications, digests sent, retries and failures"""
+    return notifications.get_stats()
+
+@router.post("/exports", response_model=ExportJob, status_code=202)
+async def submit_export(
+    export_request: ExportRequest,
+    exports: ExportService = Depends(get_exports)
+):
+    """Queue an export of stored check results; poll it and download the file when completed"""
+    try:
+        return exports.submit(export_request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/exports/stats")
+async def get_export_stats(exports: ExportService = Depends(get_exports)):
+    """Get running, completed and failed exports and the rows and bytes written"""
+    return exports.get_stats()
+
+@router.get("/exports/{export_id}", response_model=ExportJob)
+async def get_export(
+    export_id: str,
+    exports: ExportService = Depends(get_exports)
+):
+    """Get the status and progress of an export"""
+    job = exports.get_job(export_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {export_id}")
+    return job
+
+@router.get("/exports/{export_id}/download")
+async def download_export(
+    export_id: str,
+    exports: ExportService = Depends(get_exports)
+):
+    """Stream a completed export from storage, gzip-encoded"""
+    job = exports.get_job(export_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {export_id}")
+    try:
+        content = exports.read(job)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    renderer = RENDERERS[job.format]
+    return StreamingResponse(
+        content,
+        media_type=renderer.media_type,
+        headers={
+            "Content-Encoding": "gzip",
+            "Content-Disposition": f'attachment; filename="compliance-{job.id}.{renderer.extension}"'
+        }
+    )
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    compliance_service: ComplianceService = Depends(get_compliance_service)
+):
+    """Get hit rates and sizes of the report cache and the rule result store"""
+    return compliance_service.get_cache_stats()
+
 @router.get("/rules", response_model=List[dict])
 async def get_compliance_rules(
     compliance_service: ComplianceService = Depends(get_compliance_service)
 ):
-    """Get all available compliance rules"""
-    rules = [
-        {
+    """Get all available compliance rules, reporting any that fail to load"""
+    plugin_manager = compliance_service.plugin_manager
+    rules = []
+    for name in plugin_manager.get_plugin_names_by_type(ComplianceRulePlugin):
+        try:
+            rule = plugin_manager.get_plugin(name)
+            error = None
+        except PluginLoadError as e:
+            rule = UnloadableRule(e)
+            error = str(e)
+        rules.append({
             "id": rule.rule.id,
             "name": rule.rule.name,
             "description": rule.rule.description,
             "level": rule.rule.level,
-            "enabled": rule.enabled
-        }
-        for rule in compliance_service.plugin_manager.get_plugins_by_type(
-            ComplianceRulePlugin
-        )
-    ]
-    return rules
\ No newline at end of file
+            "enabled": rule.enabled and error is None,
+            "error": error
+        })
+    return rules
+
+@router.post("/plugins/reload", dependencies=[Depends(require_admin)])
+async def reload_plugins(container: ServiceContainer = Depends(get_container)):
+    """Hot-reload rule plugins without dropping in-flight checks"""
+    plugins = await container.reload_plugins()
+    return {"plugins": plugins}
\ No newline at end of file
@@ -1,15 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import ChainMap
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from ..plugins.plugin_manager import Plugin
-from ...models.compliance import ComplianceCheck, ComplianceRule
+from ..plugins.plugin_manager import Plugin, PluginLoadError
+from ..devops.client import DevOpsClient
+from ..telemetry.metrics import RULE_EXCEPTIONS
+from .notifications import NotificationQueue
+from .prefetch import RepositoryDataPlanner
+from .remediation import plan_id
+from .result_store import ResultStore, compute_fingerprint
+from ...models.compliance import ComplianceCheck, ComplianceRule, FixPlan, trusted_check
 
 class ComplianceRulePlugin(Plugin):
     """Base class for compliance rule plugins"""
     
+    # "project" rules run once per project, "repository" rules once per repository
+    scope: str = "project"
+    # Data kinds (see prefetch.DATA_KINDS) a repository rule reads through get_data;
+    # the service fetches the union once per project and shares it between rules
+    requires: Tuple[str, ...] = ()
+    
     def __init__(self):
         self.rule: Optional[ComplianceRule] = None
         self.enabled: bool = True
+        # Shared client and result store, bound by ComplianceService
+        self.devops_client: Optional[DevOpsClient] = None
+        self.result_store: Optional[ResultStore] = None
     
     @abstractmethod
     async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
@@ -33,8 +49,43 @@ class ComplianceRulePlugin(Plugin):
     def get_version(self) -> str:
         """Get the rule version"""
         return "1.0.0"
+    
+    async def get_inputs(self, context: Dict[str, Any]) -> Optional[Any]:
+        """Get the slice of data this rule's result depends on
+        
+        Rules that return a JSON-serializable value let unchanged results be
+        reused between scans; None disables reuse. When the check does run,
+        the slice is passed to check_compliance as context['inputs'] so it
+        does not have to be fetched twice.
+        """
+        return None
+    
+    async def get_data(self, context: Dict[str, Any], kind: str) -> Any:
+        """Get a declared kind of data for the context's repository
+        
+        Served from the read-only view the service prefetched into
+        context['data']; fetched directly when the rule runs on its own.
+        """
+        data = context.get('data')
+        if data is not None and kind in data:
+            return data[kind]
+        repository = context.get('repository')
+        views = await RepositoryDataPlanner(self.get_client()).fetch(
+            context.get('project_id'),
+            [repository],
+            [kind]
+        )
+        if repository not in views:
+            raise LookupError(f"Repository not found: {repository}")
+        return views[repository][kind]
+    
+    def get_client(self) -> DevOpsClient:
+        """Get the shared Azure DevOps client"""
+        if self.devops_client is None:
+            raise RuntimeError("No Azure DevOps client configured")
+        return self.devops_client
 
-class AutoFixMixin:
+class AutoFixMixin(ABC):
     """Mixin for rules that can automatically fix compliance issues"""
     
     @abstractmethod
@@ -46,6 +97,20 @@ class AutoFixMixin:
     async def apply_fix(self, context: Dict[str, Any]) -> bool:
         """Apply the automatic fix"""
         pass
+    
+    async def plan_fix(self, context: Dict[str, Any]) -> Optional[FixPlan]:
+        """Describe the fix for a failed check without applying it; None if it cannot be fixed"""
+        return None
+    
+    @abstractmethod
+    async def apply_plan(self, plan: FixPlan) -> None:
+        """Perform the write a plan describes, raising if it fails"""
+        pass
+    
+    @abstractmethod
+    async def verify_plan(self, plan: FixPlan) -> ComplianceCheck:
+        """Re-read what an applied plan changed and report the resulting status"""
+        pass
 
 class NotificationMixin:
     """Mixin for rules that can send notifications"""
@@ -68,9 +133,29 @@ class ComplianceRuleBase(ComplianceRulePlugin):
         start_time = datetime.utcnow()
         
         try:
+            fingerprint = None
+            if self.result_store is not None:
+                inputs = await self.get_inputs(context)
+                if inputs is not None:
+                    fingerprint = compute_fingerprint(self.rule.id, self.get_version(), inputs)
+            
+            key = (self.rule.id, context.get('project_id'), context.get('repository'))
+            if fingerprint is not None:
+                previous = self.result_store.get(key, fingerprint)
+                if previous is not None:
+                    previous.reused = True
+                    return previous
+                context = ChainMap({'inputs': inputs}, context)
+            
             result = await self.check_compliance(context)
+            
+            if fingerprint is not None:
+                result.reused = False
+                if result.status != "error":
+                    self.result_store.put(key, fingerprint, result)
         except Exception as e:
-            result = ComplianceCheck(
+            RULE_EXCEPTIONS.inc(self.rule.id, type(e).__name__)
+            result = trusted_check(
                 rule_id=self.rule.id,
                 status="error",
                 details={"error": str(e)},
@@ -80,10 +165,54 @@ class ComplianceRuleBase(ComplianceRulePlugin):
         return result
 
 class AutoFixableRule(ComplianceRuleBase, AutoFixMixin):
-    """Base class for rules that support automatic fixing"""
+    """Base class for rules that support automatic fixing
+    
+    Services plan fixes during checks and apply approved plans later in
+    bulk. The defaults below plan an opaque fix wherever can_auto_fix allows
+    one and verify it with a full check; rules that can describe and verify
+    their writes more precisely override plan_fix, apply_plan and verify_plan.
+    """
+    
+    def make_fix_plan(
+        self,
+        context: Dict[str, Any],
+        changes: List[Dict[str, Any]],
+        action: Dict[str, Any]
+    ) -> FixPlan:
+        """Build a pending plan for the context's repository"""
+        project_id = context.get('project_id')
+        repository = context.get('repository')
+        return FixPlan(
+            id=plan_id(self.rule.id, project_id, repository, action),
+            rule_id=self.rule.id,
+            project_id=project_id,
+            repository=repository,
+            changes=changes,
+            action=action,
+            created_at=datetime.utcnow().isoformat()
+        )
+    
+    async def plan_fix(self, context: Dict[str, Any]) -> Optional[FixPlan]:
+        if not context.get('repository') or not await self.can_auto_fix(context):
+            return None
+        return self.make_fix_plan(context, [], {})
+    
+    async def apply_plan(self, plan: FixPlan) -> None:
+        context = {"project_id": plan.project_id, "repository": plan.repository}
+        if not await self.apply_fix(context):
+            raise RuntimeError(f"Fix did not bring {plan.repository} into compliance")
+    
+    async def verify_plan(self, plan: FixPlan) -> ComplianceCheck:
+        check = await self.execute_check({
+            "project_id": plan.project_id,
+            "repository": plan.repository,
+            "data": None
+        })
+        check.details["auto_fixed"] = check.status == "passed"
+        return check
     
     async def execute_with_auto_fix(self, context: Dict[str, Any]) -> ComplianceCheck:
-        """Execute check and attempt to fix if needed"""
+        """Execute check and attempt to fix if needed, all inline"""
         check_result = await self.execute_check(context)
         
         if (check_result.status == "failed" and 
@@ -91,22 +220,57 @@ class AutoFixableRule(ComplianceRuleBase, AutoFixMixin):
             
             fix_success = await self.apply_fix(context)
             if fix_success:
-                # Re-run check after fix
-                check_result = await self.execute_check(context)
-                check_result.details["auto_fixed"] = True
+                # Re-run check after fix, against fresh data rather than the prefetched view
+                check_result = await self.execute_check(ChainMap({'data': None}, context))
+                check_result.details["auto_fixed"] = check_result.status == "passed"
         
         return check_result
 
 class NotifiableRule(ComplianceRuleBase, NotificationMixin):
     """Base class for rules that support notifications"""
     
-    async def execute_with_notification(self, context: Dict[str, Any]) -> ComplianceCheck:
-        """Execute check and handle notifications"""
+    async def execute_with_notification(
+        self,
+        context: Dict[str, Any],
+        notifications: Optional[NotificationQueue] = None
+    ) -> ComplianceCheck:
+        """Execute check and queue a notification for background delivery
+        
+        Only the decision to notify is made inline; the message is formatted
+        and delivered by the dispatcher draining `notifications`.
+        """
         check_result = await self.execute_check(context)
         
-        if await self.should_notify(check_result):
-            notification_msg = await self.get_notification_message(check_result)
-            # Notification handling would go here
-            check_result.details["notification_sent"] = True
+        if notifications is not None and await self.should_notify(check_result):
+            notifications.enqueue(self, context.get('project_id'), context.get('repository'), check_result)
+            check_result.details["notification_queued"] = True
         
-        return check_result
\ No newline at end of file
+        return check_result
+
+class UnloadableRule(ComplianceRuleBase):
+    """Stand-in for a rule plugin that failed to load, reporting it as an error"""
+    
+    def __init__(self, load_error: PluginLoadError):
+        super().__init__()
+        self.load_error = load_error
+        self.initialize({})
+    
+    def get_rule_definition(self) -> ComplianceRule:
+        entry = self.load_error.entry
+        return ComplianceRule(
+            id=entry.rule_id or entry.name,
+            name=entry.name,
+            description=str(self.load_error),
+            level="error"
+        )
+    
+    def get_version(self) -> str:
+        return self.load_error.entry.version
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        return trusted_check(
+            rule_id=self.rule.id,
+            status="error",
+            details={"error": str(self.load_error)},
+            timestamp=datetime.utcnow().isoformat()
+        )
\ No newline at end of file
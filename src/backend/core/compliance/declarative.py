@@ -0,0 +1,171 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from pydantic import BaseModel
+import yaml
+from ...models.compliance import ComplianceCheck, ComplianceRule, trusted_check
+from .prefetch import (
+    BRANCH_POLICIES,
+    BRANCH_PROTECTION_SETTINGS,
+    DataView,
+    get_branch_protection_settings
+)
+
+# Operators a condition can apply to a setting, as `<operator>: <operand>`
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "equals": lambda value, operand: value == operand,
+    "not_equals": lambda value, operand: value != operand,
+    "at_least": lambda value, operand: value is not None and value >= operand,
+    "at_most": lambda value, operand: value is not None and value <= operand,
+    "one_of": lambda value, operand: value in operand,
+    "present": lambda value, operand: (value is not None) == operand
+}
+
+# Only repository rules have settings to evaluate; other categories are
+# registered with the engine but not compiled
+PLAN_CATEGORY = "repository"
+
+ColumnTest = Callable[[List[Any]], List[bool]]
+
+class RuleCondition(BaseModel):
+    """A requirement on one repository setting"""
+    setting: str
+    equals: Optional[Any] = None
+    not_equals: Optional[Any] = None
+    at_least: Optional[Any] = None
+    at_most: Optional[Any] = None
+    one_of: Optional[List[Any]] = None
+    present: Optional[bool] = None
+    
+    def get_operator(self) -> Tuple[str, Any]:
+        """Get the condition's single operator and its operand"""
+        operators = [name for name in OPERATORS if name in self.model_fields_set]
+        if len(operators) != 1:
+            raise ValueError(
+                f"Condition on {self.setting!r} needs exactly one of: {', '.join(OPERATORS)}"
+            )
+        return operators[0], getattr(self, operators[0])
+
+class RuleDefinition(BaseModel):
+    """A declarative rule, as listed under `rules:` in the settings file"""
+    rule: str
+    level: str
+    description: str
+    category: str
+    conditions: List[RuleCondition] = []
+    
+    def to_rule(self) -> ComplianceRule:
+        return ComplianceRule(
+            id=self.rule,
+            name=self.rule.replace("_", " ").capitalize(),
+            description=self.description,
+            level=self.level
+        )
+
+def load_rule_definitions(source: Union[str, Path, Mapping[str, Any]]) -> List[RuleDefinition]:
+    """Read rule definitions from a YAML file or an already parsed mapping"""
+    if not isinstance(source, Mapping):
+        with open(source, 'r') as f:
+            source = yaml.safe_load(f) or {}
+    return [
+        RuleDefinition(category=category, **entry)
+        for category, entries in (source.get('rules') or {}).items()
+        for entry in entries or []
+    ]
+
+def _compile_test(operator: str, operand: Any) -> ColumnTest:
+    """Build a test that checks a whole column of setting values at once"""
+    test = OPERATORS[operator]
+    if operator == "one_of":
+        operand = frozenset(operand)
+    return lambda column: [test(value, operand) for value in column]
+
+class RulePlan:
+    """Repository rules compiled for batch evaluation
+    
+    Instead of running a coroutine per repository per rule, the plan gathers
+    each referenced setting into a column across all repositories and tests
+    every distinct condition once per column. Conditions shared by several
+    rules are only tested once.
+    """
+    
+    requires = (BRANCH_POLICIES,)
+    
+    def __init__(self, definitions: Sequence[RuleDefinition]):
+        self.rules: List[ComplianceRule] = []
+        self._conditions: List[List[Tuple[str, Tuple[str, str, str]]]] = []
+        self._tests: Dict[Tuple[str, str, str], Tuple[str, ColumnTest]] = {}
+        for definition in definitions:
+            conditions = []
+            for condition in definition.conditions:
+                if condition.setting not in BRANCH_PROTECTION_SETTINGS:
+                    raise ValueError(
+                        f"Rule {definition.rule!r} refers to unknown setting {condition.setting!r}"
+                    )
+                operator, operand = condition.get_operator()
+                key = (condition.setting, operator, repr(operand))
+                if key not in self._tests:
+                    self._tests[key] = (condition.setting, _compile_test(operator, operand))
+                conditions.append((condition.setting, key))
+            self.rules.append(definition.to_rule())
+            self._conditions.append(conditions)
+        self.settings = sorted({setting for setting, _ in self._tests.values()})
+    
+    def evaluate_rows(self, rows: Sequence[Mapping[str, Any]]) -> List[List[Tuple[str, ...]]]:
+        """Get, per rule, the settings each row fails (empty when it complies)"""
+        columns = {setting: [row.get(setting) for row in rows] for setting in self.settings}
+        passed = {key: test(columns[setting]) for key, (setting, test) in self._tests.items()}
+        results = []
+        for conditions in self._conditions:
+            settings = tuple(setting for setting, _ in conditions)
+            masks = [passed[key] for _, key in conditions]
+            results.append([
+                () if all(flags) else
+                tuple(setting for setting, ok in zip(settings, flags) if not ok)
+                for flags in zip(*masks)
+            ] if masks else [()] * len(rows))
+        return results
+    
+    def evaluate(
+        self,
+        project_id: Optional[str],
+        repositories: Sequence[str],
+        views: Mapping[str, DataView]
+    ) -> List[ComplianceCheck]:
+        """Check every repository against every rule, ordered by repository then rule
+        
+        Checks are built without validation; a repository without data gets
+        an error check per rule.
+        """
+        timestamp = datetime.utcnow().isoformat()
+        names = [repository for repository in repositories if repository in views]
+        rows = [get_branch_protection_settings(views[name][BRANCH_POLICIES]) for name in names]
+        failures = dict(zip(names, zip(*self.evaluate_rows(rows)))) if self.rules else {}
+        
+        checks = []
+        for repository in repositories:
+            missing = failures.get(repository)
+            for index, rule in enumerate(self.rules):
+                if missing is None:
+                    status = "error"
+                    details = {"error": "No repository data available", "repository": repository}
+                elif missing[index]:
+                    status = "warning" if rule.level == "warning" else "failed"
+                    details = {
+                        "message": rule.description,
+                        "missing_settings": list(missing[index]),
+                        "repository": repository
+                    }
+                else:
+                    status = "passed"
+                    details = {"message": rule.description, "repository": repository}
+                checks.append(trusted_check(
+                    rule_id=rule.id,
+                    status=status,
+                    details=details,
+                    timestamp=timestamp,
+                    repository=repository,
+                    project_id=project_id,
+                    reused=None
+                ))
+        return checks
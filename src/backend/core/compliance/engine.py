@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from ..models.compliance import ComplianceRule, ComplianceCheck
+from typing import List, Dict, Any, Iterable
+from ...models.compliance import ComplianceRule, ComplianceCheck
+from .declarative import PLAN_CATEGORY, RuleDefinition, RulePlan
 
 class ComplianceChecker(ABC):
     """Base class for compliance checkers"""
@@ -16,11 +17,27 @@ class RuleEngine:
     def __init__(self):
         self.rules: Dict[str, ComplianceRule] = {}
         self.checkers: Dict[str, ComplianceChecker] = {}
+        self.definitions: Dict[str, RuleDefinition] = {}
     
     def register_rule(self, rule: ComplianceRule):
         """Register a new compliance rule"""
         self.rules[rule.id] = rule
     
+    def register_definitions(self, definitions: Iterable[RuleDefinition]):
+        """Register declarative rules"""
+        for definition in definitions:
+            self.register_rule(definition.to_rule())
+            self.definitions[definition.rule] = definition
+    
+    def compile(self) -> RulePlan:
+        """Compile the enabled declarative repository rules into a plan"""
+        return RulePlan([
+            definition for rule_id, definition in self.definitions.items()
+            if definition.category == PLAN_CATEGORY and
+            definition.conditions and
+            self.rules[rule_id].enabled
+        ])
+    
     def register_checker(self, rule_id: str, checker: ComplianceChecker):
         """Register a checker for a specific rule"""
         self.checkers[rule_id] = checker
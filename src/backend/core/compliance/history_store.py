@@ -0,0 +1,404 @@
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+import json
+import os
+import struct
+import threading
+from ...models.compliance import ComplianceCheck
+
+# One fixed-width record per check: epoch seconds, then the string ids of
+# project, repository and rule, then the status code
+RECORD = struct.Struct("<IIIIB")
+# Whole records read from a segment at a time
+READ_BLOCK_SIZE = RECORD.size * 4096
+STATUSES = ("passed", "warning", "failed", "error")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+DEFAULT_RETENTION_DAYS = 90
+
+SEGMENT_SUFFIX = ".seg"
+SUMMARY_SUFFIX = ".sum"
+STRINGS_FILE = "strings.jsonl"
+
+# (timestamp, project id, repository, rule id, status)
+HistoryRecord = Tuple[str, str, Optional[str], str, str]
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _to_epoch(timestamp: str) -> int:
+    """Parse a check timestamp; naive timestamps are UTC, as the rules write them"""
+    moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+class SegmentSummary:
+    """Status counts of one segment, by project and rule"""
+    
+    __slots__ = ("records", "total", "by_rule", "by_project")
+    
+    def __init__(self):
+        self.records = 0
+        self.total = [0] * len(STATUSES)
+        self.by_rule: Dict[int, List[int]] = {}
+        self.by_project: Dict[int, Dict[int, List[int]]] = {}
+    
+    def add(self, project: int, rule: int, status: int) -> None:
+        self.records += 1
+        self.total[status] += 1
+        counts = self.by_rule.get(rule)
+        if counts is None:
+            counts = self.by_rule[rule] = [0] * len(STATUSES)
+        counts[status] += 1
+        rules = self.by_project.get(project)
+        if rules is None:
+            rules = self.by_project[project] = {}
+        counts = rules.get(rule)
+        if counts is None:
+            counts = rules[rule] = [0] * len(STATUSES)
+        counts[status] += 1
+    
+    def counts(self, project: Optional[int], rule: Optional[int]) -> List[int]:
+        """Get the status counts matching an optional project and rule"""
+        if project is None:
+            source = self.total if rule is None else self.by_rule.get(rule)
+            return list(source) if source is not None else [0] * len(STATUSES)
+        rules = self.by_project.get(project, {})
+        if rule is not None:
+            return list(rules.get(rule, [0] * len(STATUSES)))
+        totals = [0] * len(STATUSES)
+        for counts in rules.values():
+            for index, count in enumerate(counts):
+                totals[index] += count
+        return totals
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Serialize as a flat list of (project, rule, *counts) rows, which parses quickly"""
+        entries: List[int] = []
+        for project, rules in self.by_project.items():
+            for rule, counts in rules.items():
+                entries.append(project)
+                entries.append(rule)
+                entries.extend(counts)
+        return {"records": self.records, "entries": entries}
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SegmentSummary":
+        summary = cls()
+        entries = data["entries"]
+        width = 2 + len(STATUSES)
+        for offset in range(0, len(entries), width):
+            project, rule = entries[offset], entries[offset + 1]
+            counts = entries[offset + 2:offset + width]
+            rules = summary.by_project.get(project)
+            if rules is None:
+                rules = summary.by_project[project] = {}
+            rules[rule] = counts
+            totals = summary.by_rule.get(rule)
+            if totals is None:
+                summary.by_rule[rule] = list(counts)
+            else:
+                for index, count in enumerate(counts):
+                    totals[index] += count
+        for counts in summary.by_rule.values():
+            for index, count in enumerate(counts):
+                summary.total[index] += count
+        summary.records = sum(summary.total)
+        if summary.records != data["records"]:
+            raise ValueError("Summary counts do not match its record count")
+        return summary
+
+class HistoryStore:
+    """Append-only history of check results, one segment file per UTC day
+    
+    Checks are stored as fixed-width binary records, with project, repository
+    and rule names interned in a shared string table. Each segment keeps an
+    in-memory summary of status counts by project and rule, persisted next to
+    it, so trend queries read a handful of counters per day instead of the
+    records. Retention drops whole segments.
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        clock: Callable[[], datetime] = _utcnow
+    ):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.clock = clock
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._summaries: Dict[date, SegmentSummary] = {}
+        self._dirty: Set[date] = set()
+        self._segment: Optional[Tuple[date, BinaryIO]] = None
+        self._strings_file: Optional[TextIO] = None
+        self._lock = threading.RLock()
+        self._load()
+    
+    def _load(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        strings_path = self.path / STRINGS_FILE
+        try:
+            data = strings_path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            # Drop a line cut short by a crash, so new ids line up
+            with open(strings_path, 'r+b') as f:
+                f.truncate(len(complete))
+        for line in complete.splitlines():
+            value = json.loads(line)
+            self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        self._strings_file = open(strings_path, 'a')
+        
+        for segment in sorted(self.path.glob(f"*{SEGMENT_SUFFIX}")):
+            day = date.fromisoformat(segment.stem)
+            self._summaries[day] = self._load_summary(day)
+        self.enforce_retention()
+    
+    def _load_summary(self, day: date) -> SegmentSummary:
+        """Read a segment's summary, rebuilding it from the records if stale or missing"""
+        segment = self._segment_path(day)
+        records = segment.stat().st_size // RECORD.size
+        try:
+            with open(self._summary_path(day), 'r') as f:
+                summary = SegmentSummary.from_json(json.load(f))
+            if summary.records == records:
+                return summary
+        except (OSError, ValueError, KeyError):
+            pass
+        summary = SegmentSummary()
+        for _, project, _, rule, status in self._read_segment(day):
+            summary.add(project, rule, status)
+        self._dirty.add(day)
+        return summary
+    
+    def _segment_path(self, day: date) -> Path:
+        return self.path / f"{day.isoformat()}{SEGMENT_SUFFIX}"
+    
+    def _summary_path(self, day: date) -> Path:
+        return self.path / f"{day.isoformat()}{SUMMARY_SUFFIX}"
+    
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+            self._strings_file.write(json.dumps(value) + "\n")
+            # Names reach the disk before any record that refers to them
+            self._strings_file.flush()
+        return string_id
+    
+    def _get_segment(self, day: date) -> BinaryIO:
+        """Get the append handle of a day's segment, sealing the previous one"""
+        if self._segment is not None and self._segment[0] == day:
+            return self._segment[1]
+        self._close_segment()
+        path = self._segment_path(day)
+        f = open(path, 'ab')
+        # Drop a partial record left by a crash
+        size = f.tell()
+        if size % RECORD.size:
+            f.truncate(size - size % RECORD.size)
+        self._segment = (day, f)
+        self._summaries.setdefault(day, SegmentSummary())
+        return f
+    
+    def _close_segment(self) -> None:
+        """Close the open segment and persist its summary"""
+        if self._segment is not None:
+            day, f = self._segment
+            f.close()
+            self._segment = None
+            if day in self._dirty and day in self._summaries:
+                self._write_summary(day)
+                self._dirty.discard(day)
+    
+    def append(self, checks: Iterable[ComplianceCheck]) -> int:
+        """Record checks, returning how many were stored"""
+        with self._lock:
+            return self._append(checks)
+    
+    def _append(self, checks: Iterable[ComplianceCheck]) -> int:
+        count = 0
+        cutoff = self._get_cutoff()
+        if self._summaries and min(self._summaries) < cutoff:
+            self.enforce_retention()
+        for check in checks:
+            epoch = _to_epoch(check.timestamp)
+            day = datetime.fromtimestamp(epoch, timezone.utc).date()
+            if day < cutoff:
+                continue
+            project = self._intern(check.project_id or "")
+            repository = self._intern(check.repository or "")
+            rule = self._intern(check.rule_id)
+            status = STATUS_CODES.get(check.status, STATUS_CODES["error"])
+            self._get_segment(day).write(RECORD.pack(epoch, project, repository, rule, status))
+            self._summaries[day].add(project, rule, status)
+            self._dirty.add(day)
+            count += 1
+        self.flush()
+        return count
+    
+    def flush(self) -> None:
+        """Flush appended records and the string table to disk"""
+        with self._lock:
+            self._strings_file.flush()
+            if self._segment is not None:
+                self._segment[1].flush()
+    
+    def close(self) -> None:
+        """Flush everything and persist the summaries of changed segments"""
+        with self._lock:
+            if self._strings_file is None:
+                return
+            self.flush()
+            self._close_segment()
+            for day in sorted(self._dirty):
+                if day in self._summaries:
+                    self._write_summary(day)
+            self._dirty.clear()
+            self._strings_file.close()
+            self._strings_file = None
+    
+    def _write_summary(self, day: date) -> None:
+        path = self._summary_path(day)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self._summaries[day].to_json(), f, separators=(",", ":"))
+        os.replace(temp_path, path)
+    
+    def _get_cutoff(self) -> date:
+        """Get the oldest day still inside the retention period"""
+        return self.clock().astimezone(timezone.utc).date() - timedelta(days=self.retention_days - 1)
+    
+    def enforce_retention(self) -> List[date]:
+        """Drop the segments of days past the retention period"""
+        with self._lock:
+            cutoff = self._get_cutoff()
+            dropped = [day for day in self._summaries if day < cutoff]
+            for day in dropped:
+                if self._segment is not None and self._segment[0] == day:
+                    self._close_segment()
+                for path in (self._segment_path(day), self._summary_path(day)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                del self._summaries[day]
+                self._dirty.discard(day)
+            return sorted(dropped)
+    
+    def get_days(self) -> List[date]:
+        """Get the days that have a segment"""
+        with self._lock:
+            return sorted(self._summaries)
+    
+    def trend(
+        self,
+        project_id: Optional[str] = None,
+        rule_id: Optional[str] = None,
+        days: Optional[int] = None,
+        end: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """Get daily status counts for the last `days` days, oldest first
+        
+        Reads only the segment summaries; days without results count zero.
+        """
+        days = days or self.retention_days
+        end = end or self.clock().astimezone(timezone.utc).date()
+        project = self._string_ids.get(project_id) if project_id is not None else None
+        rule = self._string_ids.get(rule_id) if rule_id is not None else None
+        unknown = (project_id is not None and project is None) or (rule_id is not None and rule is None)
+        
+        points = []
+        with self._lock:
+            for offset in range(days - 1, -1, -1):
+                day = end - timedelta(days=offset)
+                summary = self._summaries.get(day)
+                if summary is None or unknown:
+                    counts = [0] * len(STATUSES)
+                else:
+                    counts = summary.counts(project, rule)
+                point: Dict[str, Any] = {"date": day.isoformat()}
+                point.update(zip(STATUSES, counts))
+                points.append(point)
+        return points
+    
+    def iter_records(
+        self,
+        start: date,
+        end: date,
+        project_id: Optional[str] = None,
+        rule_id: Optional[str] = None
+    ) -> Iterator[HistoryRecord]:
+        """Iterate stored checks of the days from `start` to `end` as plain tuples
+        
+        Segments the summaries show have no matching records are skipped
+        without being read. The records are those stored when this is
+        called; checks appended while iterating are not included.
+        """
+        project = self._string_ids.get(project_id) if project_id is not None else None
+        rule = self._string_ids.get(rule_id) if rule_id is not None else None
+        if (project_id is not None and project is None) or (rule_id is not None and rule is None):
+            return iter(())
+        with self._lock:
+            self.flush()
+            segments = [
+                (day, self._segment_path(day).stat().st_size)
+                for day in sorted(self._summaries)
+                if start <= day <= end and any(self._summaries[day].counts(project, rule))
+            ]
+        return self._iter_segments(segments, project, rule)
+    
+    def _iter_segments(
+        self,
+        segments: List[Tuple[date, int]],
+        project: Optional[int],
+        rule: Optional[int]
+    ) -> Iterator[HistoryRecord]:
+        for day, size in segments:
+            try:
+                for epoch, project_key, repository, rule_key, status in self._read_segment(day, size):
+                    if project is not None and project_key != project:
+                        continue
+                    if rule is not None and rule_key != rule:
+                        continue
+                    yield (
+                        datetime.fromtimestamp(epoch, timezone.utc).isoformat(),
+                        self._strings[project_key],
+                        self._strings[repository] or None,
+                        self._strings[rule_key],
+                        STATUSES[status]
+                    )
+            except FileNotFoundError:
+                # Dropped by retention since iteration started
+                continue
+    
+    def _read_segment(
+        self,
+        day: date,
+        size: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, int, int, int]]:
+        """Read a segment's records a block at a time, so large days are never held whole
+        
+        With `size`, only that many bytes are read, so records appended
+        meanwhile, possibly still half written, are left alone.
+        """
+        remaining = size - size % RECORD.size if size is not None else None
+        with open(self._segment_path(day), 'rb') as f:
+            while remaining is None or remaining > 0:
+                data = f.read(READ_BLOCK_SIZE if remaining is None else min(READ_BLOCK_SIZE, remaining))
+                usable = len(data) - len(data) % RECORD.size
+                if not usable:
+                    return
+                if usable != len(data):
+                    # A partial record is only ever the tail of a crashed append
+                    data = data[:usable]
+                if remaining is not None:
+                    remaining -= usable
+                yield from RECORD.iter_unpack(data)
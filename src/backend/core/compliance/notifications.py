@@ -0,0 +1,208 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+from ...models.compliance import ComplianceCheck
+
+# A project id and a rule id; notifications with the same key share a digest entry
+NotificationKey = Tuple[str, str]
+
+DEFAULT_MAX_PENDING = 10000
+DEFAULT_MAX_DIGESTS = 100
+
+# Seconds between digests for each notification_frequency; immediate digests
+# are sent as soon as the dispatcher wakes
+DIGEST_INTERVALS = {
+    "immediate": 0.0,
+    "hourly": 3600.0,
+    "daily": 86400.0,
+    "weekly": 604800.0
+}
+
+class Notification:
+    """A rule's failing checks in one project, pending delivery
+    
+    The message is formatted by the dispatcher from the latest check, so
+    checks never wait on it.
+    """
+    
+    __slots__ = ("project_id", "rule", "repositories", "check", "count", "first_seen", "last_seen", "message")
+    
+    def __init__(self, project_id: str, rule: Any, repository: Optional[str], check: ComplianceCheck):
+        self.project_id = project_id
+        self.rule = rule
+        self.repositories: List[str] = []
+        self.check = check
+        self.count = 0
+        self.first_seen = check.timestamp
+        self.last_seen = check.timestamp
+        self.message: Optional[str] = None
+        self.add(repository, check)
+    
+    @property
+    def key(self) -> NotificationKey:
+        return (self.project_id, self.rule.rule.id)
+    
+    def add(self, repository: Optional[str], check: ComplianceCheck) -> None:
+        """Fold another failing check of the same rule and project into this notification"""
+        if repository and repository not in self.repositories:
+            self.repositories.append(repository)
+        self.check = check
+        self.count += 1
+        self.last_seen = check.timestamp
+    
+    def merge(self, other: "Notification") -> None:
+        """Fold a newer notification for the same key into this one"""
+        for repository in other.repositories:
+            if repository not in self.repositories:
+                self.repositories.append(repository)
+        self.rule = other.rule
+        self.check = other.check
+        self.count += other.count
+        self.last_seen = other.last_seen
+        self.message = None
+    
+    async def format(self) -> str:
+        """Get the rule's message for the latest check"""
+        if self.message is None:
+            try:
+                self.message = await self.rule.get_notification_message(self.check)
+            except Exception as e:
+                self.message = f"{self.rule.rule.name}: {self.check.status} ({e})"
+        return self.message
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "rule_id": self.rule.rule.id,
+            "level": self.rule.rule.level,
+            "status": self.check.status,
+            "message": self.message,
+            "repositories": list(self.repositories),
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen
+        }
+
+class NotificationDigest:
+    """Notifications delivered together"""
+    
+    __slots__ = ("frequency", "channels", "created_at", "notifications")
+    
+    def __init__(self, frequency: str, channels: List[str], notifications: List[Notification]):
+        self.frequency = frequency
+        self.channels = channels
+        self.created_at = datetime.utcnow().isoformat()
+        self.notifications = notifications
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "frequency": self.frequency,
+            "channels": list(self.channels),
+            "created_at": self.created_at,
+            "notifications": [notification.to_dict() for notification in self.notifications]
+        }
+
+class NotificationQueue:
+    """Pending notifications, deduplicated by project and rule
+    
+    Enqueueing never waits: a failing check is folded into the pending
+    notification for its project and rule, or starts a new one. Beyond
+    `max_pending` keys the oldest notification is dropped.
+    """
+    
+    def __init__(
+        self,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        on_enqueued: Optional[Callable[[], None]] = None
+    ):
+        self.max_pending = max_pending
+        # Called whenever a notification is enqueued
+        self.on_enqueued = on_enqueued
+        self._pending: "OrderedDict[NotificationKey, Notification]" = OrderedDict()
+        self.reset_stats()
+    
+    def enqueue(self, rule: Any, project_id: str, repository: Optional[str], check: ComplianceCheck) -> None:
+        """Queue a notification for a rule's failing check"""
+        self.enqueued += 1
+        key = (project_id, rule.rule.id)
+        notification = self._pending.get(key)
+        if notification is not None:
+            notification.add(repository, check)
+            notification.rule = rule
+            self.deduplicated += 1
+        else:
+            self._pending[key] = Notification(project_id, rule, repository, check)
+            self._trim()
+        if self.on_enqueued is not None:
+            self.on_enqueued()
+    
+    def drain(self) -> List[Notification]:
+        """Take every pending notification, oldest first"""
+        notifications = list(self._pending.values())
+        self._pending.clear()
+        return notifications
+    
+    def requeue(self, notifications: List[Notification]) -> None:
+        """Put back notifications that could not be delivered, ahead of newer ones"""
+        pending = self._pending
+        self._pending = OrderedDict((notification.key, notification) for notification in notifications)
+        for key, notification in pending.items():
+            if key in self._pending:
+                self._pending[key].merge(notification)
+            else:
+                self._pending[key] = notification
+        self._trim()
+    
+    def _trim(self) -> None:
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+    
+    def reset_stats(self) -> None:
+        """Reset queue counters"""
+        self.enqueued = 0
+        self.deduplicated = 0
+        self.dropped = 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get queue counters and the number of pending notifications"""
+        return {
+            "pending": len(self._pending),
+            "enqueued": self.enqueued,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped
+        }
+
+class NotificationSink(ABC):
+    """Delivery channel for notification digests"""
+    
+    @abstractmethod
+    async def send(self, digest: NotificationDigest) -> None:
+        """Deliver a digest, raising if it could not be delivered"""
+        pass
+
+class LocalSink(NotificationSink):
+    """Keeps recent digests in memory and appends them to a JSON lines file, if given"""
+    
+    def __init__(self, path: Optional[Path] = None, max_digests: int = DEFAULT_MAX_DIGESTS):
+        self.path = path
+        self.max_digests = max_digests
+        self.digests: List[Dict[str, Any]] = []
+        self.sent = 0
+    
+    async def send(self, digest: NotificationDigest) -> None:
+        record = digest.to_dict()
+        if self.path is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._append, record)
+        self.digests.append(record)
+        del self.digests[:-self.max_digests]
+        self.sent += 1
+    
+    def _append(self, record: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as file:
+            file.write(json.dumps(record) + "\n")
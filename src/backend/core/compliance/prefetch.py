@@ -0,0 +1,125 @@
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping
+from ..devops.client import (
+    BUILD_POLICY_TYPE,
+    EDIT_POLICIES_PERMISSION,
+    GIT_REPOSITORIES_NAMESPACE,
+    MIN_REVIEWERS_POLICY_TYPE,
+    REQUIRED_REVIEWERS_POLICY_TYPE,
+    DevOpsClient
+)
+
+# Data kinds a rule can declare in ComplianceRulePlugin.requires
+REPOSITORY = "repository"
+BRANCH_POLICIES = "branch_policies"
+EDIT_POLICIES = "edit_policies_permission"
+DATA_KINDS = frozenset({REPOSITORY, BRANCH_POLICIES, EDIT_POLICIES})
+
+DataView = Mapping[str, Any]
+
+# Settings get_branch_protection_settings derives from branch policies
+BRANCH_PROTECTION_SETTINGS = frozenset({
+    "require_pull_request",
+    "required_reviewers",
+    "dismiss_stale_reviews",
+    "require_code_owner_reviews",
+    "require_status_checks"
+})
+
+def get_default_branch(repository: Dict[str, Any]) -> str:
+    """Get the ref name of a repository's default branch"""
+    return repository.get("defaultBranch") or "refs/heads/main"
+
+def _applies_to(policy: Dict[str, Any], repository_id: str, ref_name: str) -> bool:
+    """Check whether a policy is scoped to a repository branch; unset fields match any"""
+    return any(
+        scope.get("repositoryId") in (None, repository_id) and
+        scope.get("refName") in (None, ref_name)
+        for scope in policy.get("settings", {}).get("scope", [])
+    )
+
+def get_branch_protection_settings(policies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Translate Azure DevOps branch policies into protection settings"""
+    settings: Dict[str, Any] = {}
+    for policy in policies:
+        if not (policy.get("isEnabled") and policy.get("isBlocking")):
+            continue
+        policy_type = policy.get("type", {}).get("id")
+        policy_settings = policy.get("settings", {})
+        if policy_type == MIN_REVIEWERS_POLICY_TYPE:
+            settings["require_pull_request"] = True
+            settings["required_reviewers"] = policy_settings.get("minimumApproverCount", 0)
+            settings["dismiss_stale_reviews"] = policy_settings.get("resetOnSourcePush", False)
+        elif policy_type == REQUIRED_REVIEWERS_POLICY_TYPE:
+            settings["require_code_owner_reviews"] = True
+        elif policy_type == BUILD_POLICY_TYPE:
+            settings["require_status_checks"] = True
+    return settings
+
+class RepositoryDataPlanner:
+    """Fetches the data repository rules declare, once per kind for a whole project
+    
+    Calls grow with the number of data kinds requested, not with the number
+    of rules or repositories: repositories are listed once, policies are
+    listed once for the project and split by scope, and permissions are
+    checked for every repository in one request. Each repository gets a
+    read-only view of its slice, shared by all rules.
+    """
+    
+    def __init__(self, client: DevOpsClient):
+        self.client = client
+    
+    async def fetch(
+        self,
+        project_id: str,
+        repositories: List[str],
+        kinds: Iterable[str]
+    ) -> Dict[str, DataView]:
+        """Get a view per repository (by name or id) holding the requested kinds"""
+        kinds = set(kinds)
+        unknown = kinds - DATA_KINDS
+        if unknown:
+            raise ValueError(f"Unknown data kinds: {', '.join(sorted(unknown))}")
+        if not kinds or not repositories:
+            return {}
+        
+        if len(repositories) == 1:
+            records = [await self.client.get_repository(project_id, repositories[0])]
+        else:
+            records = await self.client.list_repositories(project_id)
+        by_key = {}
+        for record in records:
+            by_key[record["name"]] = by_key[record["id"]] = record
+        targets = [(key, by_key[key]) for key in repositories if key in by_key]
+        data: Dict[str, Dict[str, Any]] = {key: {} for key, _ in targets}
+        
+        if REPOSITORY in kinds:
+            for key, record in targets:
+                data[key][REPOSITORY] = record
+        
+        if BRANCH_POLICIES in kinds:
+            if len(targets) == 1:
+                record = targets[0][1]
+                policies = await self.client.get_policy_configurations(
+                    project_id,
+                    record["id"],
+                    get_default_branch(record)
+                )
+            else:
+                policies = await self.client.list_project_policy_configurations(project_id)
+            for key, record in targets:
+                data[key][BRANCH_POLICIES] = [
+                    policy for policy in policies
+                    if _applies_to(policy, record["id"], get_default_branch(record))
+                ]
+        
+        if EDIT_POLICIES in kinds:
+            allowed = await self.client.has_permissions(
+                GIT_REPOSITORIES_NAMESPACE,
+                EDIT_POLICIES_PERMISSION,
+                [f"repoV2/{project_id}/{record['id']}" for _, record in targets]
+            )
+            for (key, _), value in zip(targets, allowed):
+                data[key][EDIT_POLICIES] = value
+        
+        return {key: MappingProxyType(values) for key, values in data.items()}
@@ -0,0 +1,187 @@
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+from ...models.compliance import FixPlan
+
+DEFAULT_MAX_FIXES_PER_DAY = 10
+DEFAULT_MAX_PLANS = 10000
+
+# Plans in these states are kept when the same fix is planned again
+OPEN_STATUSES = {"pending", "approved", "rejected"}
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+def plan_id(rule_id: str, project_id: str, repository: str, action: Dict[str, Any]) -> str:
+    """Identify a fix by its target and what it writes, so re-planning it yields the same id"""
+    key = json.dumps([rule_id, project_id, repository, action], sort_keys=True, default=str)
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+class FixBudget:
+    """Daily allowance of auto-fixes that survives restarts
+    
+    The day and the number of fixes used are written to a small JSON file
+    after every reservation, replacing it atomically. Days are UTC.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_per_day: int = DEFAULT_MAX_FIXES_PER_DAY,
+        today: Callable[[], date] = _utc_today
+    ):
+        self.path = path
+        self.max_per_day = max_per_day
+        self._today = today
+        self._day: Optional[date] = None
+        self._used = 0
+        self._load()
+    
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            state = json.loads(self.path.read_text())
+            self._day = date.fromisoformat(state["day"])
+            self._used = int(state["used"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # A missing or damaged file starts the day afresh
+            self._day, self._used = None, 0
+    
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporary.write_text(json.dumps({"day": self._day.isoformat(), "used": self._used}))
+        os.replace(temporary, self.path)
+    
+    def _roll_over(self) -> None:
+        today = self._today()
+        if self._day != today:
+            self._day, self._used = today, 0
+    
+    def remaining(self) -> int:
+        """Get the number of fixes still allowed today"""
+        self._roll_over()
+        return max(0, self.max_per_day - self._used)
+    
+    def reserve(self, count: int) -> int:
+        """Take up to `count` fixes from today's allowance and return how many were granted"""
+        granted = min(count, self.remaining())
+        if granted:
+            self._used += granted
+            self._save()
+        return granted
+    
+    def refund(self, count: int) -> None:
+        """Give back reserved fixes that were not attempted"""
+        if count:
+            self._roll_over()
+            self._used = max(0, self._used - count)
+            self._save()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get today's allowance and usage"""
+        remaining = self.remaining()
+        return {
+            "day": self._day.isoformat(),
+            "max_per_day": self.max_per_day,
+            "used": self._used,
+            "remaining": remaining
+        }
+
+class FixQueue:
+    """Fix plans awaiting approval or application, keyed by plan id
+    
+    Checks submit a plan for every failed check a rule knows how to fix.
+    Without `require_approval`, plans are approved on submission. Planning
+    the same fix again keeps the existing plan, and its approval or
+    rejection, unless it was already applied or failed. Only the newest
+    `max_plans` are kept; finished plans are dropped first.
+    """
+    
+    def __init__(
+        self,
+        require_approval: bool = True,
+        max_plans: int = DEFAULT_MAX_PLANS,
+        on_approved: Optional[Callable[[], None]] = None
+    ):
+        self.require_approval = require_approval
+        self.max_plans = max_plans
+        # Called whenever plans become ready to apply
+        self.on_approved = on_approved
+        self._plans: "OrderedDict[str, FixPlan]" = OrderedDict()
+    
+    def submit(self, plan: FixPlan) -> FixPlan:
+        """Queue a plan, or get the open plan for the same fix"""
+        existing = self._plans.get(plan.id)
+        if existing is not None and existing.status in OPEN_STATUSES:
+            return existing
+        if not self.require_approval:
+            plan.status = "approved"
+        self._plans[plan.id] = plan
+        self._plans.move_to_end(plan.id)
+        self._trim()
+        if plan.status == "approved":
+            self._notify()
+        return plan
+    
+    def _trim(self) -> None:
+        excess = len(self._plans) - self.max_plans
+        if excess <= 0:
+            return
+        finished = [key for key, plan in self._plans.items() if plan.status not in OPEN_STATUSES]
+        still_open = [key for key, plan in self._plans.items() if plan.status in OPEN_STATUSES]
+        for key in (finished + still_open)[:excess]:
+            del self._plans[key]
+    
+    def _notify(self) -> None:
+        if self.on_approved is not None:
+            self.on_approved()
+    
+    def get(self, plan_id: str) -> Optional[FixPlan]:
+        return self._plans.get(plan_id)
+    
+    def list(self, status: Optional[str] = None, project_id: Optional[str] = None) -> List[FixPlan]:
+        """Get plans, oldest first, optionally filtered by status and project"""
+        return [
+            plan for plan in self._plans.values()
+            if (status is None or plan.status == status) and
+            (project_id is None or plan.project_id == project_id)
+        ]
+    
+    def approve(self, plan_ids: Iterable[str]) -> List[FixPlan]:
+        """Approve pending plans; unknown ids and plans in other states are skipped"""
+        approved = self._transition(plan_ids, "pending", "approved")
+        if approved:
+            self._notify()
+        return approved
+    
+    def reject(self, plan_ids: Iterable[str]) -> List[FixPlan]:
+        """Reject pending or approved plans so they are never applied"""
+        plan_ids = list(plan_ids)
+        return (
+            self._transition(plan_ids, "pending", "rejected") +
+            self._transition(plan_ids, "approved", "rejected")
+        )
+    
+    def _transition(self, plan_ids: Iterable[str], source: str, target: str) -> List[FixPlan]:
+        changed = []
+        for key in plan_ids:
+            plan = self._plans.get(key)
+            if plan is not None and plan.status == source:
+                plan.status = target
+                changed.append(plan)
+        return changed
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of plans in each state"""
+        counts = {status: 0 for status in ("pending", "approved", "rejected", "applied", "failed")}
+        for plan in self._plans.values():
+            counts[plan.status] = counts.get(plan.status, 0) + 1
+        return counts
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import time
+from ...models.compliance import ComplianceReport
+
+# A project id and a fingerprint of the enabled features the report was built with
+ReportKey = Tuple[str, str]
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_SECONDS = 30.0
+
+class ReportCache:
+    """Short-lived LRU + TTL cache of project reports with single-flight checks
+    
+    Concurrent requests for a report that is not cached share one check
+    instead of each running their own. Reports are cached only if nothing
+    invalidated their project while they were being computed, so a check
+    that raced a change cannot bring stale results back.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[ReportKey, Tuple[float, ComplianceReport]]" = OrderedDict()
+        self._in_flight: Dict[ReportKey, asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._generation = 0
+        self.reset_stats()
+    
+    def get(self, key: ReportKey) -> Optional[ComplianceReport]:
+        """Get a cached report that has not expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, report = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return report
+    
+    async def get_or_compute(
+        self,
+        key: ReportKey,
+        compute: Callable[[], Awaitable[ComplianceReport]]
+    ) -> ComplianceReport:
+        """Get a cached report, or join or start the check that computes it"""
+        report = self.get(key)
+        if report is not None:
+            self.hits += 1
+            return report
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            generation = self._get_generation(key[0])
+            future = asyncio.ensure_future(self._compute(key, compute, generation))
+            self._in_flight[key] = future
+        # A caller that gives up must not cancel the check for the others
+        return await asyncio.shield(future)
+    
+    async def _compute(
+        self,
+        key: ReportKey,
+        compute: Callable[[], Awaitable[ComplianceReport]],
+        generation: Tuple[int, int]
+    ) -> ComplianceReport:
+        try:
+            report = await compute()
+        finally:
+            del self._in_flight[key]
+        if self._get_generation(key[0]) == generation:
+            self.put(key, report)
+        return report
+    
+    def put(self, key: ReportKey, report: ComplianceReport) -> None:
+        """Store a report, evicting the least recently used entries"""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, report)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop the reports of one project, or of every project"""
+        if project_id is None:
+            self._generation += 1
+            self._generations.clear()
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            return
+        self._generations[project_id] = self._generations.get(project_id, 0) + 1
+        for key in [key for key in self._entries if key[0] == project_id]:
+            del self._entries[key]
+            self.invalidations += 1
+    
+    def _get_generation(self, project_id: str) -> Tuple[int, int]:
+        return self._generation, self._generations.get(project_id, 0)
+    
+    def reset_stats(self) -> None:
+        """Reset hit, miss and eviction counters"""
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+from ...models.compliance import ComplianceCheck
+
+ResultKey = Tuple[str, Optional[str], Optional[str]]
+
+def compute_fingerprint(rule_id: str, version: str, inputs: Any) -> str:
+    """Hash a rule's identity, version and input slice into a stable fingerprint"""
+    payload = json.dumps(
+        {"rule_id": rule_id, "version": version, "inputs": inputs},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ResultStore:
+    """Last known check result per rule and target, keyed by input fingerprint
+    
+    Bounded LRU; a target is a (rule id, project id, repository) tuple.
+    Results live in memory only, so they do not survive a restart and are
+    not shared between processes.
+    """
+    
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[ResultKey, Tuple[str, ComplianceCheck]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: ResultKey, fingerprint: str) -> Optional[ComplianceCheck]:
+        """Get a copy of the stored result if it was computed from the same inputs"""
+        entry = self._results.get(key)
+        if entry is None or entry[0] != fingerprint:
+            self.misses += 1
+            return None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return entry[1].model_copy(deep=True)
+    
+    def put(self, key: ResultKey, fingerprint: str, result: ComplianceCheck) -> None:
+        """Store a copy of a freshly computed result"""
+        self._results[key] = (fingerprint, result.model_copy(deep=True))
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Forget all stored results"""
+        self._results.clear()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get store statistics"""
+        return {
+            "entries": len(self._results),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,299 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+from ...models.compliance import ComplianceCheck, ComplianceRule
+from .history_store import STATUSES, HistoryRecord
+
+DEFAULT_MAX_HISTORY_DAYS = 30
+
+# Dashboard vocabulary for rule levels and check statuses
+SEVERITIES = {"error": "high", "warning": "medium", "info": "low"}
+DASHBOARD_STATUSES = {
+    "passed": "compliant",
+    "warning": "warning",
+    "failed": "non-compliant",
+    "error": "non-compliant"
+}
+CHART_CATEGORIES = ("compliant", "warning", "non-compliant")
+
+def _score(counts: Dict[str, int]) -> float:
+    """Percentage of targets whose latest check passed"""
+    total = sum(counts.values())
+    return round(100.0 * counts["passed"] / total, 1) if total else 100.0
+
+def _empty_counts() -> Dict[str, int]:
+    return {status: 0 for status in STATUSES}
+
+def _normalize(status: str) -> str:
+    return status if status in DASHBOARD_STATUSES else "error"
+
+def _comparable_timestamp(timestamp: str) -> str:
+    """Reduce an ISO timestamp to its UTC date and time for comparison"""
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {timestamp}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+def content_etag(payload: bytes) -> str:
+    """Strong entity tag of a serialized payload"""
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+class ProjectRollup:
+    """Latest status per rule and repository of one project, with running counts"""
+    
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self.latest: Dict[Tuple[str, Optional[str]], str] = {}
+        self.counts = _empty_counts()
+        self.rule_counts: Dict[str, Dict[str, int]] = {}
+        self.rule_scanned: Dict[str, str] = {}
+        # Closing counts of past days, oldest first; today's are the live counts
+        self.trend: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self.day: Optional[str] = None
+        self.last_scan = ""
+        self.version = 0
+        # Targets in the order their status last changed, with when it did
+        self.changes: "OrderedDict[Tuple[str, Optional[str]], Tuple[int, str]]" = OrderedDict()
+        self.payload: Optional[bytes] = None
+        self.etag: Optional[str] = None
+    
+    def apply(self, rule_id: str, repository: Optional[str], status: str, timestamp: str) -> Optional[str]:
+        """Make a check the latest for its target, returning the status it replaced"""
+        day = timestamp[:10]
+        if self.day is None:
+            self.day = day
+        elif day > self.day:
+            self.trend[self.day] = dict(self.counts)
+            self.day = day
+        
+        key = (rule_id, repository)
+        previous = self.latest.get(key)
+        rule_counts = self.rule_counts.get(rule_id)
+        if rule_counts is None:
+            rule_counts = self.rule_counts[rule_id] = _empty_counts()
+        if previous is not None:
+            self.counts[previous] -= 1
+            rule_counts[previous] -= 1
+        self.latest[key] = status
+        self.counts[status] += 1
+        rule_counts[status] += 1
+        if timestamp > self.rule_scanned.get(rule_id, ""):
+            self.rule_scanned[rule_id] = timestamp
+        if timestamp > self.last_scan:
+            self.last_scan = timestamp
+        self.version += 1
+        if status != previous:
+            self.changes[key] = (self.version, timestamp)
+            self.changes.move_to_end(key)
+        self.payload = None
+        self.etag = None
+        return previous
+    
+    def changed_since(self, since: str) -> List[Tuple[str, Optional[str], int, str]]:
+        """Get the targets whose status changed after a version or a check timestamp"""
+        if not since.isdigit():
+            after = _comparable_timestamp(since)
+            return [
+                (*key, version, timestamp)
+                for key, (version, timestamp) in self.changes.items()
+                if _comparable_timestamp(timestamp) > after
+            ]
+        # Versions only grow, so walk back from the latest change
+        changed = []
+        for key in reversed(self.changes):
+            version, timestamp = self.changes[key]
+            if version <= int(since):
+                break
+            changed.append((*key, version, timestamp))
+        changed.reverse()
+        return changed
+    
+    def prune(self, max_days: int) -> None:
+        while len(self.trend) >= max_days:
+            self.trend.popitem(last=False)
+
+class RollupStore:
+    """Dashboard rollups maintained incrementally as checks are recorded
+    
+    Each project keeps the latest status per rule and repository and running
+    counts derived from it, updated in O(1) per check. Dashboard payloads are
+    serialized once per change and then served as-is, so a refresh costs a
+    dictionary lookup no matter how many viewers poll it.
+    """
+    
+    def __init__(self, max_history_days: int = DEFAULT_MAX_HISTORY_DAYS):
+        self.max_history_days = max_history_days
+        self.projects: Dict[str, ProjectRollup] = {}
+        self.rules: Dict[str, ComplianceRule] = {}
+        self.counts = _empty_counts()
+        self.last_scan = ""
+        self.version = 0
+        self._overview: Optional[bytes] = None
+        self._overview_etag: Optional[str] = None
+    
+    def describe_rules(self, rules: Iterable[ComplianceRule]) -> None:
+        """Remember rule names, descriptions and levels for the payloads"""
+        for rule in rules:
+            self.rules[rule.id] = rule
+    
+    def record(self, checks: Iterable[ComplianceCheck]) -> None:
+        """Fold checks into their projects' rollups"""
+        for check in checks:
+            self._apply(
+                check.project_id or "",
+                check.rule_id,
+                check.repository,
+                _normalize(check.status),
+                check.timestamp
+            )
+    
+    def replay(self, records: Iterable[HistoryRecord]) -> None:
+        """Rebuild rollups from history records, oldest first"""
+        for timestamp, project_id, repository, rule_id, status in records:
+            # History timestamps carry an offset; checks are naive UTC
+            self._apply(project_id, rule_id, repository, status, timestamp[:19])
+    
+    def _apply(
+        self,
+        project_id: str,
+        rule_id: str,
+        repository: Optional[str],
+        status: str,
+        timestamp: str
+    ) -> None:
+        project = self.projects.get(project_id)
+        if project is None:
+            project = self.projects[project_id] = ProjectRollup(project_id)
+        previous = project.apply(rule_id, repository, status, timestamp)
+        project.prune(self.max_history_days)
+        if previous is not None:
+            self.counts[previous] -= 1
+        self.counts[status] += 1
+        if timestamp > self.last_scan:
+            self.last_scan = timestamp
+        self.version += 1
+        self._overview = None
+        self._overview_etag = None
+    
+    def get_project(self, project_id: str) -> Optional[ProjectRollup]:
+        return self.projects.get(project_id)
+    
+    def get_project_payload(self, project_id: str) -> Optional[bytes]:
+        """Get a project's dashboard as JSON, serialized at most once per change"""
+        project = self.projects.get(project_id)
+        if project is None:
+            return None
+        if project.payload is None:
+            project.payload = self._dumps(self._build_project(project))
+        return project.payload
+    
+    def get_project_etag(self, project_id: str) -> Optional[str]:
+        """Get the entity tag of a project's dashboard payload"""
+        project = self.projects.get(project_id)
+        if project is None:
+            return None
+        if project.etag is None:
+            project.etag = content_etag(self.get_project_payload(project_id))
+        return project.etag
+    
+    def get_project_changes(self, project_id: str, since: str) -> Optional[bytes]:
+        """Get the checks of a project whose status changed after `since`
+        
+        `since` is a `version` from an earlier payload or an ISO timestamp
+        compared against check timestamps. The delta carries the current
+        score and counts, so a poller can apply it without the full payload.
+        """
+        project = self.projects.get(project_id)
+        if project is None:
+            return None
+        return self._dumps({
+            "projectId": project.project_id,
+            "since": since,
+            "overallScore": _score(project.counts),
+            "counts": project.counts,
+            "changes": [
+                {
+                    "ruleId": rule_id,
+                    "repository": repository,
+                    "status": project.latest[(rule_id, repository)],
+                    "changedAt": timestamp,
+                    "version": version
+                }
+                for rule_id, repository, version, timestamp in project.changed_since(since)
+            ],
+            "lastScanDate": project.last_scan,
+            "version": project.version
+        })
+    
+    def get_overview_payload(self) -> bytes:
+        """Get the organization-wide summary as JSON"""
+        if self._overview is None:
+            self._overview = self._dumps({
+                "overallScore": _score(self.counts),
+                "counts": self.counts,
+                "projects": len(self.projects),
+                "lastScanDate": self.last_scan,
+                "version": self.version
+            })
+        return self._overview
+    
+    def get_overview_etag(self) -> str:
+        """Get the entity tag of the organization-wide summary"""
+        if self._overview_etag is None:
+            self._overview_etag = content_etag(self.get_overview_payload())
+        return self._overview_etag
+    
+    def _build_project(self, project: ProjectRollup) -> Dict[str, Any]:
+        rules = []
+        severity: Dict[str, Dict[str, int]] = {}
+        for rule_id, counts in project.rule_counts.items():
+            rule = self.rules.get(rule_id)
+            level = rule.level if rule else "error"
+            level_severity = SEVERITIES.get(level, "high")
+            totals = severity.setdefault(level_severity, _empty_counts())
+            for status, count in counts.items():
+                totals[status] += count
+            # A rule is as bad as its worst repository
+            worst = next(
+                (status for status in reversed(STATUSES) if counts[status]),
+                "passed"
+            )
+            rules.append({
+                "ruleId": rule_id,
+                "ruleName": rule.name if rule else rule_id,
+                "status": DASHBOARD_STATUSES[worst],
+                "severity": level_severity,
+                "description": rule.description if rule else "",
+                "lastScanned": project.rule_scanned.get(rule_id, ""),
+                "counts": counts
+            })
+        
+        chart = dict.fromkeys(CHART_CATEGORIES, 0)
+        for status, count in project.counts.items():
+            chart[DASHBOARD_STATUSES[status]] += count
+        trend = [
+            {"date": day, "score": _score(counts), **counts}
+            for day, counts in project.trend.items()
+        ]
+        if project.day is not None:
+            trend.append({"date": project.day, "score": _score(project.counts), **project.counts})
+        return {
+            "projectId": project.project_id,
+            "overallScore": _score(project.counts),
+            "counts": project.counts,
+            "severity": severity,
+            "rules": rules,
+            "chartData": [{"category": category, "count": count} for category, count in chart.items()],
+            "trend": trend,
+            "lastScanDate": project.last_scan,
+            "version": project.version
+        }
+    
+    @staticmethod
+    def _dumps(payload: Dict[str, Any]) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode()
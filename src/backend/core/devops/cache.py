@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import time
+
+class CachedResponse:
+    """A cached GET response along with its validator and continuation token"""
+    
+    __slots__ = ("body", "etag", "expires_at", "continuation_token")
+    
+    def __init__(
+        self,
+        body: Any,
+        etag: Optional[str],
+        expires_at: float,
+        continuation_token: Optional[str] = None
+    ):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+        self.continuation_token = continuation_token
+
+class ResponseCache:
+    """TTL + LRU cache of DevOps API responses keyed by request URL
+    
+    Entries past their TTL are kept until evicted so that they can be
+    revalidated with If-None-Match instead of being downloaded again.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get an entry, fresh or stale, marking it as recently used"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check whether an entry can be served without revalidation"""
+        return entry.expires_at > self._clock()
+    
+    def put(
+        self,
+        key: str,
+        body: Any,
+        etag: Optional[str],
+        continuation_token: Optional[str] = None
+    ) -> None:
+        """Store a response, evicting the least recently used entries"""
+        self._entries[key] = CachedResponse(
+            body,
+            etag,
+            self._clock() + self.ttl_seconds,
+            continuation_token
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def refresh(self, entry: CachedResponse) -> None:
+        """Extend an entry's lifetime after a 304 Not Modified"""
+        entry.expires_at = self._clock() + self.ttl_seconds
+        self.revalidations += 1
+    
+    def invalidate_path(self, path: str) -> None:
+        """Drop every entry for a URL path, regardless of query string"""
+        for key in [key for key in self._entries if key.split("?", 1)[0] == path]:
+            del self._entries[key]
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+    
+    def reset_stats(self) -> None:
+        """Reset hit, miss and revalidation counters"""
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,358 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import asyncio
+import base64
+import os
+import random
+import time
+import aiohttp
+from ..telemetry.metrics import DEVOPS_REQUEST_DURATION, DEVOPS_REQUESTS, DEVOPS_RETRIES
+from .cache import ResponseCache
+from .throttle import ConcurrencyController
+
+API_VERSION = "7.1"
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Safe to replay after an ambiguous failure; other writes may already have applied
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Well-known Azure DevOps policy types and security namespaces
+MIN_REVIEWERS_POLICY_TYPE = "fa4e907d-c16b-4a4c-9dfa-4906e5d171dd"
+REQUIRED_REVIEWERS_POLICY_TYPE = "fd2167ab-b0be-447a-8ec8-39368250530e"
+BUILD_POLICY_TYPE = "0609b952-1397-4640-95ec-e00a01b2c241"
+GIT_REPOSITORIES_NAMESPACE = "2e9eb7ed-3c0a-47d4-87c1-0ffdd275fd87"
+EDIT_POLICIES_PERMISSION = 2048
+
+# Paged collections return the token for the next page in this header
+CONTINUATION_HEADER = "x-ms-continuationtoken"
+# Security tokens checked per permissions request, keeping the URL well under server limits
+PERMISSION_TOKENS_PER_REQUEST = 20
+
+class DevOpsClientError(Exception):
+    """Raised when an Azure DevOps API call fails"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class DevOpsClient:
+    """Shared async Azure DevOps REST client
+
+    A single instance is shared by every rule through ComplianceService. It
+    keeps one pooled keep-alive session, caches GET responses with a TTL + LRU
+    cache revalidated through ETags, and retries transient failures with
+    exponential backoff. Requests in flight are bounded by adaptive read and
+    write budgets that shrink on 429s and slow responses and grow back while
+    the service keeps up.
+    """
+
+    def __init__(
+        self,
+        organization_url: str,
+        pat_token: str = "",
+        max_connections: int = 100,
+        keepalive_timeout: float = 30.0,
+        request_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        cache: Optional[ResponseCache] = None,
+        concurrency: Optional[ConcurrencyController] = None
+    ):
+        self.organization_url = organization_url.rstrip("/")
+        # Kept so worker processes can open their own connections
+        self.pat_token = pat_token
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.cache = cache if cache is not None else ResponseCache()
+        self.concurrency = concurrency or ConcurrencyController()
+        self.request_count = 0
+        self.retry_count = 0
+        self._headers = {"Accept": "application/json"}
+        if pat_token:
+            token = base64.b64encode(f":{pat_token}".encode()).decode()
+            self._headers["Authorization"] = f"Basic {token}"
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["DevOpsClient"]:
+        """Create a client from AZURE_DEVOPS_ORG_URL / AZURE_DEVOPS_PAT, if set"""
+        organization_url = os.environ.get("AZURE_DEVOPS_ORG_URL")
+        if not organization_url:
+            return None
+        return cls(organization_url, os.environ.get("AZURE_DEVOPS_PAT", ""))
+
+    async def __aenter__(self) -> "DevOpsClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the underlying connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _build_url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build an absolute, versioned API URL"""
+        query = {"api-version": API_VERSION}
+        if params:
+            query.update({key: value for key, value in params.items() if value is not None})
+        return f"{self.organization_url}/{path.lstrip('/')}?{urlencode(sorted(query.items()))}"
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a resource, serving it from cache or revalidating it when possible"""
+        body, _ = await self.get_page(path, params)
+        return body
+
+    async def get_page(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """GET one page of a resource along with the continuation token of the next page, if any"""
+        url = self._build_url(path, params)
+        cached = self.cache.get(url)
+        if cached is not None and self.cache.is_fresh(cached):
+            self.cache.hits += 1
+            return cached.body, cached.continuation_token
+
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
+        status, body, response_headers = await self._request("GET", url, headers=headers)
+        if status == 304 and cached is not None:
+            self.cache.hits += 1
+            self.cache.refresh(cached)
+            return cached.body, cached.continuation_token
+
+        self.cache.misses += 1
+        continuation_token = response_headers.get(CONTINUATION_HEADER)
+        self.cache.put(url, body, response_headers.get("ETag"), continuation_token)
+        return body, continuation_token
+
+    async def get_all(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """GET every item of a paged collection, following continuation tokens"""
+        params = dict(params or {})
+        items: List[Any] = []
+        while True:
+            body, continuation_token = await self.get_page(path, params)
+            items.extend(body.get("value", []))
+            if not continuation_token:
+                return items
+            params["continuationToken"] = continuation_token
+
+    async def send_json(
+        self,
+        method: str,
+        path: str,
+        body: Any,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Send a write request and invalidate cached reads of the resource and its collection"""
+        url = self._build_url(path, params)
+        _, response_body, _ = await self._request(method, url, json=body)
+        resource_path = url.split("?", 1)[0]
+        self.cache.invalidate_path(resource_path)
+        self.cache.invalidate_path(resource_path.rsplit("/", 1)[0])
+        return response_body
+
+    def invalidate(self, path: str) -> None:
+        """Drop cached reads of a resource changed elsewhere, e.g. as reported by a service hook"""
+        self.cache.invalidate_path(self._build_url(path).split("?", 1)[0])
+
+    async def _request(self, method: str, url: str, **kwargs) -> tuple:
+        """Perform a request, retrying transient failures with backoff
+
+        Idempotent methods are retried on 429, 5xx, timeouts and connection
+        errors. Other writes are only retried when the server certainly did
+        not apply them: on 429, or when the connection was never established.
+        """
+        session = self._get_session()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        limiter = self.concurrency.for_method(method)
+        attempt = 0
+        while True:
+            retry_after = None
+            status = None
+            started = await limiter.acquire()
+            sent = time.perf_counter()
+            try:
+                self.request_count += 1
+                async with session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    if response.status == 304:
+                        return 304, None, response.headers
+                    if response.status < 400:
+                        body = await response.json(content_type=None)
+                        return response.status, body, response.headers
+                    error = DevOpsClientError(
+                        f"{method} {url} failed with status {response.status}",
+                        status=response.status
+                    )
+                    retryable = response.status == 429 or (
+                        idempotent and response.status in RETRYABLE_STATUSES
+                    )
+                    retry_after = response.headers.get("Retry-After")
+            except aiohttp.ClientConnectorError as e:
+                error = DevOpsClientError(f"{method} {url} failed: {e}")
+                retryable = True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = DevOpsClientError(f"{method} {url} failed: {e}")
+                retryable = idempotent
+            finally:
+                limiter.release(started, throttled=status == 429)
+                DEVOPS_REQUEST_DURATION.observe(time.perf_counter() - sent, method.upper())
+                DEVOPS_REQUESTS.inc(method.upper(), str(status) if status is not None else "error")
+
+            if status == 429 and retry_after is not None:
+                limiter.pause(self._get_backoff(attempt + 1, retry_after))
+            if not retryable or attempt >= self.max_retries:
+                raise error
+            attempt += 1
+            self.retry_count += 1
+            DEVOPS_RETRIES.inc(method.upper())
+            await asyncio.sleep(self._get_backoff(attempt, retry_after))
+
+    def _get_backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Get the delay before a retry, honoring Retry-After when present"""
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        delay = self.backoff_base * (2 ** (attempt - 1))
+        return delay + random.uniform(0, delay / 2)
+
+    def reset_stats(self) -> None:
+        """Reset request and cache counters"""
+        self.request_count = 0
+        self.retry_count = 0
+        self.cache.reset_stats()
+        self.concurrency.reset_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, cache and concurrency statistics"""
+        return {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "cache": self.cache.get_stats(),
+            "concurrency": self.concurrency.get_stats()
+        }
+
+    async def iter_projects(self, page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate every project in the organization, one page at a time"""
+        skip = 0
+        while True:
+            body = await self.get_json("_apis/projects", {"$top": page_size, "$skip": skip})
+            projects = body.get("value", [])
+            for project in projects:
+                yield project
+            if len(projects) < page_size:
+                return
+            skip += page_size
+
+    async def get_project(self, project_id: str) -> Dict[str, Any]:
+        """Get a project by id or name"""
+        return await self.get_json(f"_apis/projects/{project_id}")
+
+    async def list_repositories(self, project_id: str) -> List[Dict[str, Any]]:
+        """List the git repositories of a project"""
+        return await self.get_all(f"{project_id}/_apis/git/repositories")
+
+    async def get_repository(self, project_id: str, repository: str) -> Dict[str, Any]:
+        """Get a git repository by id or name"""
+        return await self.get_json(f"{project_id}/_apis/git/repositories/{repository}")
+
+    async def get_policy_configurations(
+        self,
+        project_id: str,
+        repository_id: str,
+        ref_name: str
+    ) -> List[Dict[str, Any]]:
+        """List the policy configurations scoped to a repository branch"""
+        return await self.get_all(
+            f"{project_id}/_apis/policy/configurations",
+            {"repositoryId": repository_id, "refName": ref_name}
+        )
+
+    async def list_project_policy_configurations(self, project_id: str) -> List[Dict[str, Any]]:
+        """List every policy configuration in a project, page by page"""
+        return await self.get_all(f"{project_id}/_apis/policy/configurations")
+
+    async def create_policy_configuration(
+        self,
+        project_id: str,
+        configuration: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Create a policy configuration"""
+        return await self.send_json(
+            "POST",
+            f"{project_id}/_apis/policy/configurations",
+            configuration
+        )
+
+    async def update_policy_configuration(
+        self,
+        project_id: str,
+        configuration_id: int,
+        configuration: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Replace an existing policy configuration"""
+        return await self.send_json(
+            "PUT",
+            f"{project_id}/_apis/policy/configurations/{configuration_id}",
+            configuration
+        )
+
+    async def has_permission(
+        self,
+        namespace_id: str,
+        permission: int,
+        token: str
+    ) -> bool:
+        """Check whether the caller holds a permission on a security token"""
+        body = await self.get_json(
+            f"_apis/permissions/{namespace_id}/{permission}",
+            {"tokens": token}
+        )
+        return bool(body.get("value")) and all(body["value"])
+
+    async def has_permissions(
+        self,
+        namespace_id: str,
+        permission: int,
+        tokens: List[str]
+    ) -> List[bool]:
+        """Check a permission on several security tokens, in token order
+
+        Tokens are sent in chunks of PERMISSION_TOKENS_PER_REQUEST, concurrently,
+        so a project with many repositories does not produce an over-long URL.
+        """
+        chunks = [
+            tokens[start:start + PERMISSION_TOKENS_PER_REQUEST]
+            for start in range(0, len(tokens), PERMISSION_TOKENS_PER_REQUEST)
+        ]
+        bodies = await asyncio.gather(*(
+            self.get_json(f"_apis/permissions/{namespace_id}/{permission}", {"tokens": ",".join(chunk)})
+            for chunk in chunks
+        ))
+        return [bool(value) for body in bodies for value in body.get("value", [])]
@@ -0,0 +1,291 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import uuid
+from aiohttp import web
+from .client import (
+    BUILD_POLICY_TYPE,
+    MIN_REVIEWERS_POLICY_TYPE,
+    REQUIRED_REVIEWERS_POLICY_TYPE
+)
+
+class FakeDevOpsServer:
+    """In-process fake of the Azure DevOps REST endpoints used by ComplianceX
+
+    Serves projects, repositories, branch policies and permissions from memory
+    with ETag support, and can inject latency, failures and throttling so the
+    client and the rules can be tested and benchmarked offline.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.permissions: Dict[str, bool] = {}
+        self.request_counts: Counter = Counter()
+        self.not_modified_count = 0
+        self._failures: List[tuple] = []
+        # Requests beyond max_in_flight at once are throttled with a 429
+        self.max_in_flight: Optional[int] = None
+        self.throttle_retry_after: Optional[str] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.throttled_count = 0
+        # Collections are served in pages of this size, with a continuation token
+        self.page_size: Optional[int] = None
+        # Requests with longer URLs are rejected with a 414, like the real service
+        self.max_url_length: Optional[int] = None
+        self._next_policy_id = 1
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self) -> str:
+        """Start serving on a free localhost port and return the base URL"""
+        app = web.Application(middlewares=[self._inject_faults])
+        app.router.add_get("/_apis/projects", self._list_projects)
+        app.router.add_get("/_apis/projects/{project}", self._get_project)
+        app.router.add_get("/_apis/permissions/{namespace}/{permission}", self._get_permission)
+        app.router.add_get("/{project}/_apis/git/repositories", self._list_repositories)
+        app.router.add_get("/{project}/_apis/git/repositories/{repository}", self._get_repository)
+        app.router.add_get("/{project}/_apis/policy/configurations", self._list_policies)
+        app.router.add_post("/{project}/_apis/policy/configurations", self._create_policy)
+        app.router.add_put("/{project}/_apis/policy/configurations/{policy_id}", self._update_policy)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop the server"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeDevOpsServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def add_project(self, project_id: str, name: Optional[str] = None) -> None:
+        """Add an empty project"""
+        self.projects.setdefault(project_id, {
+            "id": project_id,
+            "name": name or project_id,
+            "repositories": {}
+        })
+
+    def add_repository(
+        self,
+        project_id: str,
+        name: str,
+        protected: bool = True,
+        policies: Optional[List[Dict[str, Any]]] = None,
+        default_branch: str = "refs/heads/main"
+    ) -> Dict[str, Any]:
+        """Add a repository whose default branch is fully protected or unprotected"""
+        self.add_project(project_id)
+        repository_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project_id}/{name}"))
+        repository = {
+            "id": repository_id,
+            "name": name,
+            "defaultBranch": default_branch,
+            "policies": list(policies) if policies is not None else (
+                self.protected_policies(repository_id, default_branch) if protected else []
+            )
+        }
+        self.projects[project_id]["repositories"][name] = repository
+        self.permissions[f"repoV2/{project_id}/{repository_id}"] = True
+        return repository
+
+    @staticmethod
+    def protected_policies(repository_id: str, ref_name: str = "refs/heads/main") -> List[Dict[str, Any]]:
+        """Policies that satisfy the branch protection rule"""
+        scope = [{"repositoryId": repository_id, "refName": ref_name, "matchKind": "exact"}]
+        return [
+            {
+                "isEnabled": True,
+                "isBlocking": True,
+                "type": {"id": MIN_REVIEWERS_POLICY_TYPE},
+                "settings": {"minimumApproverCount": 1, "resetOnSourcePush": True, "scope": scope}
+            },
+            {
+                "isEnabled": True,
+                "isBlocking": True,
+                "type": {"id": REQUIRED_REVIEWERS_POLICY_TYPE},
+                "settings": {"requiredReviewerIds": [], "scope": scope}
+            },
+            {
+                "isEnabled": True,
+                "isBlocking": True,
+                "type": {"id": BUILD_POLICY_TYPE},
+                "settings": {"buildDefinitionId": 1, "scope": scope}
+            }
+        ]
+
+    def fail_next(self, status: int, count: int = 1, headers: Optional[Dict[str, str]] = None) -> None:
+        """Answer the next `count` requests with an error status"""
+        self._failures.extend([(status, headers or {})] * count)
+
+    def throttle(self, max_in_flight: Optional[int], retry_after: Optional[str] = None) -> None:
+        """Answer 429 to requests arriving while `max_in_flight` are already being served"""
+        self.max_in_flight = max_in_flight
+        self.throttle_retry_after = retry_after
+
+    def reset_stats(self) -> None:
+        """Reset request counters"""
+        self.request_counts.clear()
+        self.not_modified_count = 0
+        self.peak_in_flight = 0
+        self.throttled_count = 0
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests and apply throttling, latency and injected failures before any handler runs"""
+        self.request_counts[request.path] += 1
+        if self.max_url_length is not None and len(str(request.rel_url)) > self.max_url_length:
+            return web.json_response({"message": "URI too long"}, status=414)
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            self.throttled_count += 1
+            headers = {"Retry-After": self.throttle_retry_after} if self.throttle_retry_after else {}
+            return web.json_response({"message": "Too many requests"}, status=429, headers=headers)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self._failures:
+                status, headers = self._failures.pop(0)
+                return web.json_response({"message": "Injected failure"}, status=status, headers=headers)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    async def _respond(
+        self,
+        request: web.Request,
+        body: Any,
+        headers: Optional[Dict[str, str]] = None
+    ) -> web.Response:
+        """Serve a JSON body with ETags"""
+        if body is None:
+            return web.json_response({"message": "Not found"}, status=404)
+
+        payload = json.dumps(body, sort_keys=True)
+        etag = '"' + hashlib.sha1(payload.encode()).hexdigest() + '"'
+        headers = {**(headers or {}), "ETag": etag}
+        if request.method == "GET" and request.headers.get("If-None-Match") == etag:
+            self.not_modified_count += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(text=payload, content_type="application/json", headers=headers)
+
+    async def _respond_page(self, request: web.Request, items: List[Any]) -> web.Response:
+        """Serve one page of a collection, continued from the request's continuation token"""
+        if self.page_size is None:
+            return await self._respond(request, {"count": len(items), "value": items})
+        start = int(request.query.get("continuationToken", 0))
+        page = items[start:start + self.page_size]
+        headers = {}
+        if start + self.page_size < len(items):
+            headers["x-ms-continuationtoken"] = str(start + self.page_size)
+        return await self._respond(request, {"count": len(page), "value": page}, headers)
+
+    def _find_repository(self, project_id: str, repository: str) -> Optional[Dict[str, Any]]:
+        project = self.projects.get(project_id)
+        if not project:
+            return None
+        for candidate in project["repositories"].values():
+            if repository in (candidate["id"], candidate["name"]):
+                return candidate
+        return None
+
+    @staticmethod
+    def _public_repository(repository: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in repository.items() if key != "policies"}
+
+    async def _list_projects(self, request: web.Request) -> web.Response:
+        top = int(request.query.get("$top", 100))
+        skip = int(request.query.get("$skip", 0))
+        projects = [
+            {"id": project["id"], "name": project["name"]}
+            for project in list(self.projects.values())[skip:skip + top]
+        ]
+        return await self._respond(request, {"count": len(projects), "value": projects})
+
+    async def _get_project(self, request: web.Request) -> web.Response:
+        project = self.projects.get(request.match_info["project"])
+        body = {"id": project["id"], "name": project["name"]} if project else None
+        return await self._respond(request, body)
+
+    async def _list_repositories(self, request: web.Request) -> web.Response:
+        project = self.projects.get(request.match_info["project"])
+        if not project:
+            return await self._respond(request, None)
+        repositories = [self._public_repository(repo) for repo in project["repositories"].values()]
+        return await self._respond_page(request, repositories)
+
+    async def _get_repository(self, request: web.Request) -> web.Response:
+        repository = self._find_repository(request.match_info["project"], request.match_info["repository"])
+        return await self._respond(request, self._public_repository(repository) if repository else None)
+
+    async def _list_policies(self, request: web.Request) -> web.Response:
+        project = self.projects.get(request.match_info["project"])
+        repository_id = request.query.get("repositoryId")
+        if repository_id is None:
+            # Unfiltered: every policy in the project
+            repositories = list(project["repositories"].values()) if project else None
+        else:
+            repository = self._find_repository(request.match_info["project"], repository_id)
+            repositories = [repository] if repository else None
+        if repositories is None:
+            return await self._respond(request, None)
+        ref_name = request.query.get("refName")
+        policies = [
+            policy
+            for repository in repositories
+            for policy in repository["policies"]
+            if ref_name is None or any(
+                scope.get("refName") == ref_name
+                for scope in policy["settings"].get("scope", [])
+            )
+        ]
+        return await self._respond_page(request, policies)
+
+    async def _create_policy(self, request: web.Request) -> web.Response:
+        configuration = await request.json()
+        scopes = configuration.get("settings", {}).get("scope", [])
+        repository = self._find_repository(
+            request.match_info["project"],
+            scopes[0].get("repositoryId", "") if scopes else ""
+        )
+        if repository:
+            configuration["id"] = self._next_policy_id
+            self._next_policy_id += 1
+            repository["policies"].append(configuration)
+        return await self._respond(request, configuration if repository else None)
+
+    async def _update_policy(self, request: web.Request) -> web.Response:
+        configuration = await request.json()
+        policy_id = int(request.match_info["policy_id"])
+        project = self.projects.get(request.match_info["project"], {"repositories": {}})
+        for repository in project["repositories"].values():
+            for index, policy in enumerate(repository["policies"]):
+                if policy.get("id") == policy_id:
+                    configuration["id"] = policy_id
+                    repository["policies"][index] = configuration
+                    return await self._respond(request, configuration)
+        return await self._respond(request, None)
+
+    async def _get_permission(self, request: web.Request) -> web.Response:
+        tokens = request.query.get("tokens", "").split(",")
+        values = [self.permissions.get(token, False) for token in tokens]
+        return await self._respond(request, {"count": len(values), "value": values})
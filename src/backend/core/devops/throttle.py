@@ -0,0 +1,175 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+import asyncio
+import math
+import time
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+DEFAULT_READ_LIMIT = 16
+DEFAULT_READ_MAX_LIMIT = 64
+DEFAULT_READ_LATENCY_TARGET = 2.0
+DEFAULT_WRITE_LIMIT = 4
+DEFAULT_WRITE_MAX_LIMIT = 8
+DEFAULT_WRITE_LATENCY_TARGET = 5.0
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by additive increase, multiplicative decrease
+    
+    A request that completes quickly while at least half the limit is in
+    use grows the limit by 1/limit, about one slot per round trip. A 429 or a response
+    slower than `latency_target` cuts it by `backoff`. Only requests started
+    after the last cut can cut it again, so a burst of 429s from one
+    overloaded moment counts once. A Retry-After pauses the whole budget.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 64,
+        latency_target: float = 2.0,
+        backoff: float = 0.5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._clock = clock
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._last_decrease = -math.inf
+        self._paused_until = -math.inf
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.in_flight = 0
+        self.reset_stats()
+    
+    @property
+    def limit(self) -> int:
+        """Get the number of requests currently allowed in flight"""
+        return max(self.minimum, int(self._limit))
+    
+    async def acquire(self) -> float:
+        """Wait for a slot, returning the start time to pass to release"""
+        waited = False
+        while True:
+            delay = self._paused_until - self._clock()
+            if delay > 0:
+                waited = True
+                await asyncio.sleep(delay)
+                continue
+            if self.in_flight < self.limit:
+                break
+            waited = True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wake-up this task can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        if waited:
+            self.waits += 1
+        return self._clock()
+    
+    def release(self, started: float, throttled: bool = False) -> None:
+        """Return a slot and adapt the limit to how the request went"""
+        now = self._clock()
+        # Only grow a limit that is actually in use
+        saturated = self.in_flight * 2 >= self.limit or bool(self._waiters)
+        self.in_flight -= 1
+        slow = now - started > self.latency_target
+        if throttled:
+            self.throttled += 1
+        elif slow:
+            self.slow += 1
+        
+        if throttled or slow:
+            if started > self._last_decrease:
+                self._limit = max(float(self.minimum), self._limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        elif saturated and self._limit < self.maximum:
+            self._limit = min(float(self.maximum), self._limit + 1 / self._limit)
+            self.increases += 1
+        self._wake()
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back new requests for a while, as asked by a Retry-After"""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        self.pauses += 1
+    
+    def _wake(self) -> None:
+        free = self.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+    
+    def reset_stats(self) -> None:
+        """Reset event counters, keeping the learned limit"""
+        self.throttled = 0
+        self.slow = 0
+        self.increases = 0
+        self.decreases = 0
+        self.pauses = 0
+        self.waits = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current limit and throttling counters"""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "throttled": self.throttled,
+            "slow": self.slow,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "pauses": self.pauses,
+            "waits": self.waits
+        }
+
+class ConcurrencyController:
+    """Outbound concurrency budgets of a DevOps client, one for reads and one for writes
+    
+    Writes get a smaller budget of their own so that auto-fixes neither
+    starve scans nor get starved by them.
+    """
+    
+    def __init__(
+        self,
+        read: Optional[AdaptiveLimiter] = None,
+        write: Optional[AdaptiveLimiter] = None
+    ):
+        self.read = read or AdaptiveLimiter(
+            "read",
+            DEFAULT_READ_LIMIT,
+            maximum=DEFAULT_READ_MAX_LIMIT,
+            latency_target=DEFAULT_READ_LATENCY_TARGET
+        )
+        self.write = write or AdaptiveLimiter(
+            "write",
+            DEFAULT_WRITE_LIMIT,
+            maximum=DEFAULT_WRITE_MAX_LIMIT,
+            latency_target=DEFAULT_WRITE_LATENCY_TARGET
+        )
+    
+    def for_method(self, method: str) -> AdaptiveLimiter:
+        """Get the budget an HTTP method is charged to"""
+        return self.read if method.upper() in READ_METHODS else self.write
+    
+    def reset_stats(self) -> None:
+        self.read.reset_stats()
+        self.write.reset_stats()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"read": self.read.get_stats(), "write": self.write.get_stats()}
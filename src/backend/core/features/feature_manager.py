@@ -1,17 +1,165 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Iterable, Optional, Tuple
 from pydantic import BaseModel
+import asyncio
+import hashlib
+import json
+import os
 import yaml
 from pathlib import Path
 
+# COMPLIANCEX_FEATURES_PATH overrides the feature flag file
+FEATURES_PATH_ENV = "COMPLIANCEX_FEATURES_PATH"
+DEFAULT_FEATURES_PATH = Path(__file__).resolve().parents[4] / "config" / "features.yaml"
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+class FeatureOverride(BaseModel):
+    """Per-project or per-rule override of a feature flag"""
+    enabled: Optional[bool] = None
+    parameters: Dict[str, Any] = {}
+
 class FeatureFlag(BaseModel):
     """Feature flag configuration"""
     name: str
     enabled: bool
     description: str
     parameters: Dict[str, Any] = {}
+    # Overrides by project id and by rule id; a rule override wins over a project override
+    projects: Dict[str, FeatureOverride] = {}
+    rules: Dict[str, FeatureOverride] = {}
+
+# Resolved state of a feature: whether it is enabled, and its parameters
+Resolution = Tuple[bool, Dict[str, Any]]
+
+class FeatureSnapshot:
+    """Immutable, compiled state of every feature flag
+    
+    Built once per load or change and swapped in whole, so a check reads
+    one consistent set of flags and lookups are a set or dict access.
+    Overrides are resolved on first use and memoized.
+    """
+    
+    __slots__ = (
+        "version",
+        "features",
+        "fingerprint",
+        "_enabled",
+        "_parameters",
+        "_overridden",
+        "_projects",
+        "_resolved"
+    )
+    
+    def __init__(self, features: Iterable[FeatureFlag] = (), version: int = 0):
+        self.version = version
+        self.features: Dict[str, FeatureFlag] = {
+            feature.name: feature.model_copy(deep=True) for feature in features
+        }
+        self._enabled: FrozenSet[str] = frozenset(
+            name for name, feature in self.features.items() if feature.enabled
+        )
+        self._parameters: Dict[str, Dict[str, Any]] = {
+            name: feature.parameters for name, feature in self.features.items()
+        }
+        self._overridden: FrozenSet[str] = frozenset(
+            name for name, feature in self.features.items() if feature.projects or feature.rules
+        )
+        self._projects: FrozenSet[str] = frozenset(
+            project_id for feature in self.features.values() for project_id in feature.projects
+        )
+        self._resolved: Dict[Tuple[str, Optional[str], Optional[str]], Resolution] = {}
+        # Enabled features, their parameters and every override shape a report
+        shape = {
+            name: [feature.parameters, feature.model_dump(include={"projects", "rules"})]
+            for name, feature in self.features.items()
+            if feature.enabled or name in self._overridden
+        }
+        self.fingerprint = hashlib.sha256(
+            json.dumps(shape, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    
+    def _resolve(self, name: str, project_id: Optional[str], rule_id: Optional[str]) -> Resolution:
+        key = (name, project_id, rule_id)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            feature = self.features[name]
+            enabled = feature.enabled
+            parameters = feature.parameters
+            for override in (feature.projects.get(project_id), feature.rules.get(rule_id)):
+                if override is None:
+                    continue
+                if override.enabled is not None:
+                    enabled = override.enabled
+                if override.parameters:
+                    parameters = {**parameters, **override.parameters}
+            resolved = self._resolved[key] = (enabled, parameters)
+        return resolved
+    
+    def is_enabled(
+        self,
+        feature_name: str,
+        project_id: Optional[str] = None,
+        rule_id: Optional[str] = None
+    ) -> bool:
+        """Check if a feature is enabled, for a project and rule if given"""
+        if feature_name in self._overridden and (project_id is not None or rule_id is not None):
+            return self._resolve(feature_name, project_id, rule_id)[0]
+        return feature_name in self._enabled
+    
+    def get_parameter(
+        self,
+        feature_name: str,
+        parameter_name: str,
+        project_id: Optional[str] = None,
+        rule_id: Optional[str] = None
+    ) -> Optional[Any]:
+        """Get a feature's parameter value, for a project and rule if given"""
+        if feature_name in self._overridden and (project_id is not None or rule_id is not None):
+            enabled, parameters = self._resolve(feature_name, project_id, rule_id)
+            return parameters.get(parameter_name) if enabled else None
+        if feature_name not in self._enabled:
+            return None
+        return self._parameters[feature_name].get(parameter_name)
+    
+    def has_project_overrides(self, project_id: str) -> bool:
+        """Check whether any feature is overridden for a project"""
+        return project_id in self._projects
+    
+    def get_enabled_features(self) -> Dict[str, Dict[str, Any]]:
+        """Get the parameters of every enabled feature"""
+        return {name: self._parameters[name] for name in self.features if name in self._enabled}
+    
+    def replace(self, name: str, feature: Optional[FeatureFlag]) -> "FeatureSnapshot":
+        """Build the next snapshot with a feature added, replaced or (with None) removed"""
+        features = dict(self.features)
+        if feature is None:
+            features.pop(name, None)
+        else:
+            features[name] = feature
+        return FeatureSnapshot(features.values(), self.version + 1)
+    
+    def to_config(self) -> Dict[str, Any]:
+        """Get the snapshot in the layout of the configuration file"""
+        config: Dict[str, Any] = {}
+        for name, feature in self.features.items():
+            entry = feature.model_dump(exclude={"name", "projects", "rules"})
+            for scope in ("projects", "rules"):
+                overrides = getattr(feature, scope)
+                if overrides:
+                    entry[scope] = {
+                        key: override.model_dump(exclude_defaults=True)
+                        for key, override in overrides.items()
+                    }
+            config[name] = entry
+        return {'features': config}
 
 class FeatureManager:
-    """Manages feature flags and their states"""
+    """Manages feature flags and their states
+    
+    Flags live in an immutable FeatureSnapshot that is replaced, never
+    changed, when a feature is registered or the file changes on disk, so
+    lookups need no lock and in-flight checks are never blocked. Changes
+    are written to the file off the event loop, atomically.
+    """
     _instance = None
     
     def __new__(cls):
@@ -22,54 +170,159 @@ class FeatureManager:
     
     def __init__(self):
         if not self._initialized:
-            self._features: Dict[str, FeatureFlag] = {}
-            self._config_path = Path("config/features.yaml")
-            self._load_features()
+            path = os.environ.get(FEATURES_PATH_ENV)
+            self._config_path = Path(path) if path else DEFAULT_FEATURES_PATH
+            self._snapshot = FeatureSnapshot()
+            # (mtime, size) of the file as last loaded or written
+            self._signature: Optional[Tuple[int, int]] = None
+            # Whether registered changes still have to be written
+            self._unsaved = False
+            self._saving: Optional[asyncio.Future] = None
+            self._watcher: Optional[asyncio.Future] = None
+            self.last_error: Optional[str] = None
+            self.reload()
             self._initialized = True
     
-    def _load_features(self):
-        """Load features from configuration file"""
-        if not self._config_path.exists():
-            return
-        
-        with open(self._config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            for feature_name, feature_config in config.get('features', {}).items():
-                self._features[feature_name] = FeatureFlag(
-                    name=feature_name,
-                    **feature_config
-                )
-    
-    def is_enabled(self, feature_name: str) -> bool:
-        """Check if a feature is enabled"""
-        feature = self._features.get(feature_name)
-        return feature.enabled if feature else False
-    
-    def get_parameter(self, feature_name: str, parameter_name: str) -> Optional[Any]:
-        """Get a feature's parameter value"""
-        feature = self._features.get(feature_name)
-        if not feature or not feature.enabled:
+    @property
+    def snapshot(self) -> FeatureSnapshot:
+        """Get the current flags; hold on to it for a consistent view across a check"""
+        return self._snapshot
+    
+    def _get_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self._config_path.stat()
+        except FileNotFoundError:
             return None
-        return feature.parameters.get(parameter_name)
-    
-    def register_feature(self, feature: FeatureFlag):
-        """Register a new feature flag"""
-        self._features[feature.name] = feature
-        self._save_features()
-    
-    def _save_features(self):
-        """Save features to configuration file"""
-        config = {
-            'features': {
-                name: {
-                    'enabled': feature.enabled,
-                    'description': feature.description,
-                    'parameters': feature.parameters
-                }
-                for name, feature in self._features.items()
-            }
-        }
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_features(self) -> Optional[FeatureSnapshot]:
+        """Compile the configuration file, or None if it has not changed since last loaded or written"""
+        signature = self._get_signature()
+        if signature is None or signature == self._signature:
+            return None
+        with open(self._config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        features = [
+            FeatureFlag(name=feature_name, **feature_config)
+            for feature_name, feature_config in config.get('features', {}).items()
+        ]
+        self._signature = signature
+        return FeatureSnapshot(features, self._snapshot.version + 1)
+    
+    def _is_saving(self) -> bool:
+        """Check for registered changes not yet written, which are newer than the file"""
+        return self._unsaved or (self._saving is not None and not self._saving.done())
+    
+    def reload(self) -> bool:
+        """Load features from configuration file if it changed, returning whether they were swapped"""
+        if self._is_saving():
+            return False
+        snapshot = self._read_features()
+        if snapshot is None:
+            return False
+        self._snapshot = snapshot
+        return True
+    
+    def start_watching(self, interval: float = DEFAULT_RELOAD_INTERVAL) -> None:
+        """Reload the configuration file in the background whenever it changes"""
+        if self._watcher is None:
+            self._watcher = asyncio.ensure_future(self._watch(interval))
+    
+    async def stop_watching(self) -> None:
+        """Stop reloading and wait for pending writes"""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+        await self.flush()
+    
+    async def _watch(self, interval: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            if self._is_saving():
+                continue
+            try:
+                # Parse in a thread; only the swap happens on the event loop
+                snapshot = await loop.run_in_executor(None, self._read_features)
+            except Exception as e:
+                # Keep the last good flags until the file is fixed
+                self.last_error = str(e)
+                continue
+            if snapshot is not None and not self._is_saving():
+                self._snapshot = snapshot
+    
+    def is_enabled(
+        self,
+        feature_name: str,
+        project_id: Optional[str] = None,
+        rule_id: Optional[str] = None
+    ) -> bool:
+        """Check if a feature is enabled, for a project and rule if given"""
+        return self._snapshot.is_enabled(feature_name, project_id, rule_id)
+    
+    def get_parameter(
+        self,
+        feature_name: str,
+        parameter_name: str,
+        project_id: Optional[str] = None,
+        rule_id: Optional[str] = None
+    ) -> Optional[Any]:
+        """Get a feature's parameter value, for a project and rule if given"""
+        return self._snapshot.get_parameter(feature_name, parameter_name, project_id, rule_id)
+    
+    def get_enabled_features(self) -> Dict[str, Dict[str, Any]]:
+        """Get the parameters of every enabled feature"""
+        return self._snapshot.get_enabled_features()
+    
+    def register_feature(self, feature: FeatureFlag, persist: bool = True):
+        """Register a new feature flag, replacing one of the same name
         
+        Without `persist` the change lasts until the file is next reloaded.
+        """
+        self._swap(self._snapshot.replace(feature.name, feature), persist)
+    
+    def unregister_feature(self, feature_name: str, persist: bool = True):
+        """Remove a feature flag"""
+        self._swap(self._snapshot.replace(feature_name, None), persist)
+    
+    def _swap(self, snapshot: FeatureSnapshot, persist: bool) -> None:
+        self._snapshot = snapshot
+        if not persist:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_features(snapshot)
+            return
+        self._unsaved = True
+        if self._saving is None or self._saving.done():
+            self._saving = loop.create_task(self._save())
+    
+    async def _save(self) -> None:
+        """Write the newest snapshot until the file has caught up with every change"""
+        loop = asyncio.get_running_loop()
+        while self._unsaved:
+            self._unsaved = False
+            try:
+                await loop.run_in_executor(None, self._save_features, self._snapshot)
+            except Exception as e:
+                # The flags stay in effect in memory until the file is next reloaded
+                self.last_error = str(e)
+                return
+    
+    async def flush(self) -> None:
+        """Wait until registered changes have been written"""
+        if self._saving is not None:
+            await asyncio.gather(self._saving)
+    
+    def _save_features(self, snapshot: FeatureSnapshot):
+        """Save features to configuration file, replacing it atomically"""
         self._config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._config_path, 'w') as f:
-            yaml.safe_dump(config, f)
\ No newline at end of file
+        temp_path = self._config_path.with_name(self._config_path.name + ".tmp")
+        with open(temp_path, 'w') as f:
+            yaml.safe_dump(snapshot.to_config(), f, sort_keys=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._config_path)
+        self._signature = self._get_signature()
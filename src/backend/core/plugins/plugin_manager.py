@@ -1,9 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Type
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Type
+from pydantic import BaseModel
+import hashlib
 import importlib
+import inspect
+import json
+import os
 import pkgutil
+import sys
+import tempfile
 from pathlib import Path
 
+# Anchored to the backend package rather than the working directory;
+# COMPLIANCEX_PLUGIN_MANIFEST overrides it
+MANIFEST_PATH_ENV = "COMPLIANCEX_PLUGIN_MANIFEST"
+DEFAULT_MANIFEST_PATH = Path(__file__).resolve().parents[2] / ".cache" / "plugin_manifest.json"
+MANIFEST_VERSION = 1
+
 class Plugin(ABC):
     """Base class for all plugins"""
     
@@ -22,8 +36,40 @@ class Plugin(ABC):
         """Get the plugin version"""
         pass
 
+class PluginManifestEntry(BaseModel):
+    """Manifest record of a plugin class, enough to register it without importing"""
+    module: str
+    class_name: str
+    name: str
+    rule_id: Optional[str] = None
+    version: str
+    bases: List[str]
+
+class ModuleManifest(BaseModel):
+    """Manifest record of a plugin module and the file state it was built from"""
+    mtime_ns: int
+    size: int
+    hash: str
+    plugins: List[PluginManifestEntry] = []
+
+class PluginLoadError(Exception):
+    """Raised when a plugin registered from the manifest cannot be loaded"""
+    
+    def __init__(self, entry: PluginManifestEntry, error: Exception):
+        super().__init__(f"Failed to load plugin {entry.name!r} from {entry.module}: {error}")
+        self.entry = entry
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
 class PluginManager:
-    """Manages plugin discovery, loading, and lifecycle"""
+    """Manages plugin discovery, loading, and lifecycle
+    
+    Discovery is backed by a persisted manifest: modules whose files are
+    unchanged since the manifest was written are registered from it without
+    being imported, and each plugin is imported and instantiated the first
+    time it is requested.
+    """
     _instance = None
     
     def __new__(cls):
@@ -35,42 +81,266 @@ class PluginManager:
     def __init__(self):
         if not self._initialized:
             self._plugins: Dict[str, Plugin] = {}
+            self._pending: Dict[str, PluginManifestEntry] = {}
             self._plugin_configs: Dict[str, Dict[str, Any]] = {}
+            self.manifest_path = Path(os.environ.get(MANIFEST_PATH_ENV, DEFAULT_MANIFEST_PATH))
             self._initialized = True
     
     def discover_plugins(self, plugin_dir: str) -> None:
-        """Discover and load plugins from a directory"""
-        plugin_path = Path(plugin_dir)
+        """Discover plugins in a package, deferring imports to first use"""
+        for name, entry in self._discover(plugin_dir).items():
+            if name not in self._plugins:
+                self._pending[name] = entry
+    
+    def rediscover_plugins(self, plugin_dir: str) -> Dict[str, PluginManifestEntry]:
+        """Forget a package's imported plugin modules and discover it again
+        
+        Returns the manifest entries without registering them; pass them to
+        replace_plugins to swap them in. Modules are re-executed when their
+        plugins are next used.
+        """
+        for name in [name for name in sys.modules if name.startswith(f"{plugin_dir}.")]:
+            del sys.modules[name]
+        importlib.invalidate_caches()
+        return self._discover(plugin_dir)
+    
+    def replace_plugins(
+        self,
+        plugin_dir: str,
+        entries: Dict[str, PluginManifestEntry]
+    ) -> None:
+        """Swap in a freshly discovered plugin set for a package
         
-        for module_info in pkgutil.iter_modules([str(plugin_path)]):
-            module = importlib.import_module(f"{plugin_dir}.{module_info.name}")
-            
-            # Look for Plugin subclasses in the module
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and 
-                    issubclass(attr, Plugin) and 
-                    attr is not Plugin):
-                    plugin_instance = attr()
-                    self._plugins[plugin_instance.get_name()] = plugin_instance
+        The registries are replaced rather than mutated, so callers that
+        already hold plugins from the previous set keep using them undisturbed.
+        Plugins from other packages are kept.
+        """
+        prefix = f"{plugin_dir}."
+        plugins = {
+            name: plugin for name, plugin in self._plugins.items()
+            if not type(plugin).__module__.startswith(prefix)
+        }
+        pending = {
+            name: entry for name, entry in self._pending.items()
+            if not entry.module.startswith(prefix)
+        }
+        pending.update(entries)
+        self._plugins, self._pending = plugins, pending
+    
+    def _discover(self, plugin_dir: str) -> Dict[str, PluginManifestEntry]:
+        """Get manifest entries for a package's plugins, refreshing the manifest"""
+        try:
+            package = importlib.import_module(plugin_dir)
+        except ModuleNotFoundError:
+            return {}
+        
+        manifest = self._read_manifest()
+        cached_modules = manifest.get(plugin_dir, {})
+        modules: Dict[str, ModuleManifest] = {}
+        changed = False
+        
+        for module_info in pkgutil.iter_modules(package.__path__):
+            module_path = self._get_module_path(module_info)
+            cached = cached_modules.get(module_info.name)
+            entry = self._revalidate(module_path, cached) if cached else None
+            if entry is None:
+                entry = self._build_module_manifest(
+                    f"{plugin_dir}.{module_info.name}",
+                    module_path
+                )
+            changed = changed or entry is not cached
+            modules[module_info.name] = entry
+        
+        if changed or set(modules) != set(cached_modules):
+            manifest[plugin_dir] = modules
+            self._write_manifest(manifest)
+        
+        return {
+            plugin.name: plugin
+            for entry in modules.values()
+            for plugin in entry.plugins
+        }
     
     def initialize_plugin(self, plugin_name: str, config: Dict[str, Any]) -> None:
         """Initialize a specific plugin with configuration"""
+        self._plugin_configs[plugin_name] = config
         if plugin_name in self._plugins:
             self._plugins[plugin_name].initialize(config)
-            self._plugin_configs[plugin_name] = config
     
     def get_plugin(self, plugin_name: str) -> Plugin:
-        """Get a plugin instance by name"""
-        return self._plugins.get(plugin_name)
+        """Get a plugin instance by name, importing it on first use"""
+        plugin = self._plugins.get(plugin_name)
+        if plugin is None and plugin_name in self._pending:
+            plugin = self._load_pending(plugin_name)
+        return plugin
+    
+    def get_plugin_names(self) -> List[str]:
+        """Get the names of all registered plugins, loaded or not"""
+        return list(self._plugins) + [
+            name for name in self._pending if name not in self._plugins
+        ]
+    
+    def get_rule_id(self, plugin_name: str) -> Optional[str]:
+        """Get the id of the rule a plugin implements, without importing it"""
+        if plugin_name in self._plugins:
+            rule = getattr(self._plugins[plugin_name], 'rule', None)
+            return getattr(rule, 'id', None)
+        entry = self._pending.get(plugin_name)
+        return entry.rule_id if entry else None
+    
+    def get_plugin_names_by_type(self, plugin_type: Type[Plugin]) -> List[str]:
+        """Get the names of plugins of a specific type without importing them"""
+        type_name = _qualified_name(plugin_type)
+        names = [
+            name for name, plugin in self._plugins.items()
+            if isinstance(plugin, plugin_type)
+        ]
+        names.extend(
+            name for name, entry in self._pending.items()
+            if type_name in entry.bases and name not in self._plugins
+        )
+        return names
     
     def get_all_plugins(self) -> List[Plugin]:
-        """Get all loaded plugins"""
-        return list(self._plugins.values())
+        """Get all plugins, importing any that are not loaded yet"""
+        return [self.get_plugin(name) for name in self.get_plugin_names()]
     
     def get_plugins_by_type(self, plugin_type: Type[Plugin]) -> List[Plugin]:
         """Get all plugins of a specific type"""
         return [
-            plugin for plugin in self._plugins.values()
-            if isinstance(plugin, plugin_type)
-        ]
\ No newline at end of file
+            self.get_plugin(name)
+            for name in self.get_plugin_names_by_type(plugin_type)
+        ]
+    
+    def _load_pending(self, plugin_name: str) -> Plugin:
+        """Import and instantiate a plugin registered from the manifest
+        
+        A plugin that fails to load stays pending, so the next request
+        retries it once its module is fixed.
+        """
+        entry = self._pending[plugin_name]
+        try:
+            module = importlib.import_module(entry.module)
+            plugin = self._instantiate(getattr(module, entry.class_name))
+        except Exception as e:
+            raise PluginLoadError(entry, e) from e
+        self._plugins[plugin_name] = plugin
+        self._pending.pop(plugin_name, None)
+        return plugin
+    
+    def _instantiate(self, plugin_class: Type[Plugin]) -> Plugin:
+        """Create and initialize a plugin, applying any stored configuration"""
+        plugin_instance = plugin_class()
+        plugin_instance.initialize({})
+        name = plugin_instance.get_name()
+        if name in self._plugin_configs:
+            plugin_instance.initialize(self._plugin_configs[name])
+        return plugin_instance
+    
+    def _find_plugin_classes(self, module: Any) -> List[Type[Plugin]]:
+        """Find concrete Plugin subclasses defined in (not imported into) a module"""
+        return [
+            attr for attr in vars(module).values()
+            if (isinstance(attr, type) and
+                issubclass(attr, Plugin) and
+                attr.__module__ == module.__name__ and
+                not inspect.isabstract(attr))
+        ]
+    
+    def _build_module_manifest(self, module_name: str, module_path: Path) -> ModuleManifest:
+        """Import a module and record its plugins"""
+        module = importlib.import_module(module_name)
+        plugins = []
+        for plugin_class in self._find_plugin_classes(module):
+            plugin_instance = plugin_class()
+            plugin_instance.initialize({})
+            rule = getattr(plugin_instance, 'rule', None)
+            plugins.append(PluginManifestEntry(
+                module=module_name,
+                class_name=plugin_class.__name__,
+                name=plugin_instance.get_name(),
+                rule_id=getattr(rule, 'id', None),
+                version=plugin_instance.get_version(),
+                bases=[_qualified_name(base) for base in plugin_class.__mro__]
+            ))
+        
+        stat = module_path.stat()
+        return ModuleManifest(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            hash=self._hash_file(module_path),
+            plugins=plugins
+        )
+    
+    def _revalidate(self, module_path: Path, cached: ModuleManifest) -> Optional[ModuleManifest]:
+        """Reuse a manifest entry if its module file is unchanged
+        
+        The file is only hashed when its mtime or size differ, so a warm start
+        costs one stat per module.
+        """
+        try:
+            stat = module_path.stat()
+        except OSError:
+            return None
+        if stat.st_mtime_ns == cached.mtime_ns and stat.st_size == cached.size:
+            return cached
+        if self._hash_file(module_path) != cached.hash:
+            return None
+        return cached.model_copy(update={"mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+    
+    @staticmethod
+    def _get_module_path(module_info: pkgutil.ModuleInfo) -> Path:
+        base = Path(module_info.module_finder.path) / module_info.name
+        return base / "__init__.py" if module_info.ispkg else base.with_suffix(".py")
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    
+    def _read_manifest(self) -> Dict[str, Dict[str, ModuleManifest]]:
+        """Read the manifest, treating a missing or stale one as empty"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') != MANIFEST_VERSION:
+                return {}
+            return {
+                package: {
+                    name: ModuleManifest(**module)
+                    for name, module in modules.items()
+                }
+                for package, modules in data.get('packages', {}).items()
+            }
+        except (OSError, ValueError, TypeError):
+            return {}
+    
+    def _write_manifest(self, manifest: Dict[str, Dict[str, ModuleManifest]]) -> None:
+        """Atomically persist the manifest
+        
+        The manifest is only a cache: if it cannot be written, discovery
+        still succeeds and simply imports every module again next time.
+        """
+        data = {
+            'version': MANIFEST_VERSION,
+            'packages': {
+                package: {name: module.model_dump() for name, module in modules.items()}
+                for package, modules in manifest.items()
+            }
+        }
+        temp_path = None
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                'w',
+                dir=self.manifest_path.parent,
+                prefix=f"{self.manifest_path.name}.",
+                suffix=".tmp",
+                delete=False
+            ) as f:
+                temp_path = f.name
+                json.dump(data, f)
+            os.replace(temp_path, self.manifest_path)
+        except OSError:
+            if temp_path is not None:
+                with suppress(OSError):
+                    os.remove(temp_path)
@@ -0,0 +1,221 @@
+from abc import ABC, abstractmethod
+from html import escape
+from typing import Any, Dict, List, Sequence, Type
+import json
+from ..compliance.history_store import HistoryRecord
+
+COLUMNS = ("timestamp", "project_id", "repository", "rule_id", "status")
+
+# Layout of PDF pages: A4 portrait, one line per check in 8 pt Helvetica
+PDF_PAGE_SIZE = (595, 842)
+PDF_ROWS_PER_PAGE = 64
+PDF_LEADING = 12
+PDF_MARGIN = 36
+# Objects every PDF starts with; pages are numbered from PDF_FIRST_PAGE_OBJECT
+PDF_CATALOG, PDF_PAGES, PDF_FONT = 1, 2, 3
+PDF_FIRST_PAGE_OBJECT = 4
+
+class ReportRenderer(ABC):
+    """Renders stored checks into one export format, a batch at a time
+    
+    `render` is a pure function of a batch so it can run in a worker
+    process; `header`, `frame` and `footer` keep whatever document state the
+    format needs and run where the output is written.
+    """
+    
+    format: str = ""
+    media_type: str = "application/octet-stream"
+    extension: str = ""
+    # Whether batches render in a worker process; only formats too cheap to
+    # be worth pickling a batch should render in a thread instead
+    offload: bool = True
+    
+    def __init__(self, title: str, generated_at: str):
+        self.title = title
+        self.generated_at = generated_at
+    
+    def header(self) -> bytes:
+        return b""
+    
+    @staticmethod
+    @abstractmethod
+    def render(rows: Sequence[HistoryRecord]) -> Any:
+        """Render a batch of checks"""
+        pass
+    
+    def frame(self, rendered: Any) -> bytes:
+        """Place a rendered batch into the document"""
+        return rendered
+    
+    def footer(self, totals: Dict[str, int]) -> bytes:
+        return b""
+
+class JsonRenderer(ReportRenderer):
+    """One JSON document with a `checks` array, written row by row"""
+    
+    format = "json"
+    media_type = "application/json"
+    extension = "json"
+    
+    def __init__(self, title: str, generated_at: str):
+        super().__init__(title, generated_at)
+        self._first = True
+    
+    def header(self) -> bytes:
+        return (
+            '{"title":' + json.dumps(self.title) +
+            ',"generated_at":' + json.dumps(self.generated_at) +
+            ',"checks":[\n'
+        ).encode()
+    
+    @staticmethod
+    def render(rows: Sequence[HistoryRecord]) -> bytes:
+        return ",\n".join(
+            json.dumps(dict(zip(COLUMNS, row)), separators=(",", ":")) for row in rows
+        ).encode()
+    
+    def frame(self, rendered: bytes) -> bytes:
+        if not rendered:
+            return b""
+        if self._first:
+            self._first = False
+            return rendered
+        return b",\n" + rendered
+    
+    def footer(self, totals: Dict[str, int]) -> bytes:
+        return ("\n],\"totals\":" + json.dumps(totals, separators=(",", ":")) + "}\n").encode()
+
+class HtmlRenderer(ReportRenderer):
+    """A standalone HTML page with one table row per check"""
+    
+    format = "html"
+    media_type = "text/html"
+    extension = "html"
+    
+    def header(self) -> bytes:
+        title = escape(self.title)
+        return (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>{title}</title><style>"
+            "body{font-family:sans-serif}table{border-collapse:collapse}"
+            "td,th{border:1px solid #ccc;padding:2px 6px;text-align:left}"
+            ".passed{color:#107c10}.warning{color:#a86800}.failed,.error{color:#c50f1f}"
+            "</style></head><body>\n"
+            f"<h1>{title}</h1><p>Generated {escape(self.generated_at)}</p>\n<table><thead><tr>"
+            + "".join(f"<th>{column}</th>" for column in COLUMNS) +
+            "</tr></thead><tbody>\n"
+        ).encode()
+    
+    @staticmethod
+    def render(rows: Sequence[HistoryRecord]) -> bytes:
+        return "".join(
+            f'<tr class="{escape(row[4])}">' +
+            "".join(f"<td>{escape(value or '')}</td>" for value in row) +
+            "</tr>\n"
+            for row in rows
+        ).encode()
+    
+    def footer(self, totals: Dict[str, int]) -> bytes:
+        summary = ", ".join(f"{count} {status}" for status, count in totals.items())
+        return f"</tbody></table>\n<p>{escape(summary)}</p>\n</body></html>\n".encode()
+
+def _pdf_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+class PdfRenderer(ReportRenderer):
+    """A text-only PDF, one line per check, built without a PDF library
+    
+    Pages are complete objects written as they are rendered; the page tree
+    and the cross-reference table, which need every page's number and byte
+    offset, are written at the end, so memory grows by two integers per page.
+    """
+    
+    format = "pdf"
+    media_type = "application/pdf"
+    extension = "pdf"
+    
+    def __init__(self, title: str, generated_at: str):
+        super().__init__(title, generated_at)
+        self._position = 0
+        self._offsets: Dict[int, int] = {}
+        self._pages: List[int] = []
+    
+    def _emit(self, number: int, body: bytes) -> bytes:
+        self._offsets[number] = self._position
+        data = b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        self._position += len(data)
+        return data
+    
+    def header(self) -> bytes:
+        data = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self._position = len(data)
+        data += self._emit(PDF_CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % PDF_PAGES)
+        data += self._emit(PDF_FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        return data
+    
+    @staticmethod
+    def render(rows: Sequence[HistoryRecord]) -> List[bytes]:
+        """Render the content stream of each page of the batch"""
+        top = PDF_PAGE_SIZE[1] - PDF_MARGIN
+        heading = _pdf_text("   ".join(COLUMNS))
+        pages = []
+        for start in range(0, len(rows), PDF_ROWS_PER_PAGE):
+            lines = [f"BT /F1 8 Tf {PDF_MARGIN} {top} Td {PDF_LEADING} TL ({heading}) Tj T*"]
+            for row in rows[start:start + PDF_ROWS_PER_PAGE]:
+                lines.append(f"({_pdf_text('   '.join(value or '-' for value in row))}) Tj T*")
+            lines.append("ET")
+            pages.append("\n".join(lines).encode("latin-1", "replace"))
+        return pages
+    
+    def frame(self, rendered: List[bytes]) -> bytes:
+        data = []
+        for content in rendered:
+            page = PDF_FIRST_PAGE_OBJECT + 2 * len(self._pages)
+            self._pages.append(page)
+            data.append(self._emit(
+                page,
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (PDF_PAGES, PDF_PAGE_SIZE[0], PDF_PAGE_SIZE[1], PDF_FONT, page + 1)
+            ))
+            data.append(self._emit(
+                page + 1,
+                b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+            ))
+        return b"".join(data)
+    
+    def footer(self, totals: Dict[str, int]) -> bytes:
+        summary = ", ".join(f"{count} {status}" for status, count in totals.items())
+        # The title page closes the document so the totals are known
+        data = self.frame([
+            f"BT /F1 14 Tf {PDF_MARGIN} {PDF_PAGE_SIZE[1] - PDF_MARGIN} Td 20 TL "
+            f"({_pdf_text(self.title)}) Tj T* /F1 10 Tf "
+            f"(Generated {_pdf_text(self.generated_at)}) Tj T* ({_pdf_text(summary)}) Tj ET".encode(
+                "latin-1", "replace"
+            )
+        ])
+        # List the title page first
+        kids = [self._pages[-1]] + self._pages[:-1]
+        data += self._emit(
+            PDF_PAGES,
+            b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % page for page in kids) +
+            b"] /Count %d >>" % len(kids)
+        )
+        size = max(self._offsets) + 1
+        xref = [b"xref\n0 %d\n0000000000 65535 f \n" % size]
+        for number in range(1, size):
+            xref.append(b"%010d 00000 n \n" % self._offsets[number])
+        xref.append(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            size,
+            PDF_CATALOG,
+            self._position
+        ))
+        return data + b"".join(xref)
+
+RENDERERS: Dict[str, Type[ReportRenderer]] = {
+    renderer.format: renderer for renderer in (JsonRenderer, HtmlRenderer, PdfRenderer)
+}
+
+def render_rows(format: str, rows: Sequence[HistoryRecord]) -> Any:
+    """Render a batch in the given format; used as the worker process entry point"""
+    return RENDERERS[format].render(rows)
@@ -0,0 +1,115 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Type
+import asyncio
+import os
+
+DEFAULT_READ_CHUNK_SIZE = 256 * 1024
+
+class ExportWriter(ABC):
+    """Destination of one export, written in chunks and published on commit"""
+    
+    @abstractmethod
+    async def write(self, chunk: bytes) -> None:
+        pass
+    
+    @abstractmethod
+    async def commit(self) -> None:
+        """Make the export visible under its name"""
+        pass
+    
+    @abstractmethod
+    async def abort(self) -> None:
+        """Discard what was written"""
+        pass
+
+class ExportStorage(ABC):
+    """Pluggable store of finished exports"""
+    
+    @abstractmethod
+    async def open(self, name: str) -> ExportWriter:
+        pass
+    
+    @abstractmethod
+    def read(self, name: str, chunk_size: int = DEFAULT_READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Stream a committed export"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, name: str) -> None:
+        pass
+
+class LocalFileWriter(ExportWriter):
+    """Writes to a partial file in a worker thread and renames it into place on commit"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._partial = path.with_name(path.name + ".part")
+        self._file: Optional[BinaryIO] = None
+    
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+    
+    async def write(self, chunk: bytes) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = await self._run(open, self._partial, "wb")
+        await self._run(self._file.write, chunk)
+    
+    async def commit(self) -> None:
+        if self._file is None:
+            await self.write(b"")
+        await self._run(self._file.close)
+        os.replace(self._partial, self.path)
+    
+    async def abort(self) -> None:
+        if self._file is not None:
+            await self._run(self._file.close)
+        try:
+            os.remove(self._partial)
+        except FileNotFoundError:
+            pass
+
+class LocalStorage(ExportStorage):
+    """Exports as files under a local directory"""
+    
+    def __init__(self, root: Path):
+        self.root = Path(root)
+    
+    def _path(self, name: str) -> Path:
+        path = (self.root / name).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Export name outside the storage root: {name}")
+        return path
+    
+    async def open(self, name: str) -> ExportWriter:
+        return LocalFileWriter(self._path(name))
+    
+    async def read(self, name: str, chunk_size: int = DEFAULT_READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        with open(self._path(name), "rb") as f:
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+    
+    async def delete(self, name: str) -> None:
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+# Backends by the `reporting` feature's storage_type. There is no Azure Blob
+# client in this tree yet, so the local backend stands in for azure_blob.
+STORAGE_BACKENDS: Dict[str, Type[ExportStorage]] = {
+    "local": LocalStorage,
+    "azure_blob": LocalStorage
+}
+
+def create_storage(storage_type: Optional[str], root: Path) -> ExportStorage:
+    """Build the storage backend for a storage_type"""
+    backend = STORAGE_BACKENDS.get(storage_type or "local")
+    if backend is None:
+        raise ValueError(f"Unknown export storage type: {storage_type}")
+    return backend(root)
@@ -0,0 +1,208 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+
+# Seconds; rules mostly wait on Azure DevOps, so the range reaches the rule timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """A named family of samples, one per combination of label values"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+    
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+    
+    def samples(self) -> Iterable[Sample]:
+        return ()
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield self.name, self._labels(labels), value
+
+class Gauge(Metric):
+    """Value that is set rather than accumulated"""
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+    
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield self.name, self._labels(labels), value
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets"""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: a count per bucket plus +Inf, then the sum
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._values.get(labels)
+        if counts is None:
+            counts = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+    
+    def samples(self) -> Iterable[Sample]:
+        for labels, counts in self._values.items():
+            base = self._labels(labels)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, counts[-1]
+            yield f"{self.name}_count", base, cumulative
+
+class MetricsRegistry:
+    """Metrics rendered in the Prometheus text exposition format
+    
+    Metrics are updated in place as things happen. Collectors are called at
+    scrape time for values that already live elsewhere, such as cache
+    statistics, and return metrics built on the spot.
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+    
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric already registered differently: {metric.name}")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+    
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+    
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self._collectors.append(collector)
+    
+    def remove_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+    
+    def collect(self) -> Iterable[Metric]:
+        yield from self._metrics.values()
+        for collector in list(self._collectors):
+            yield from collector()
+    
+    def get_sample_value(self, name: str, **labels: str) -> Optional[float]:
+        """Get the current value of one sample, mostly for tests"""
+        for metric in self.collect():
+            for sample_name, sample_labels, value in metric.samples():
+                if sample_name == name and sample_labels == labels:
+                    return value
+        return None
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format, version 0.0.4"""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+RULE_DURATION = REGISTRY.histogram(
+    "compliancex_rule_duration_seconds",
+    "Time taken by a rule to check one project or repository, timeouts included",
+    ("rule",)
+)
+RULE_CHECKS = REGISTRY.counter(
+    "compliancex_rule_checks_total",
+    "Checks produced by a rule, by status",
+    ("rule", "status")
+)
+RULE_TIMEOUTS = REGISTRY.counter(
+    "compliancex_rule_timeouts_total",
+    "Rule executions cancelled by the rule timeout",
+    ("rule",)
+)
+RULE_EXCEPTIONS = REGISTRY.counter(
+    "compliancex_rule_exceptions_total",
+    "Exceptions raised by rules and reported as error checks",
+    ("rule", "exception")
+)
+DEVOPS_REQUESTS = REGISTRY.counter(
+    "compliancex_devops_requests_total",
+    "Requests sent to Azure DevOps, retries included, by response status",
+    ("method", "status")
+)
+DEVOPS_REQUEST_DURATION = REGISTRY.histogram(
+    "compliancex_devops_request_duration_seconds",
+    "Time taken by one Azure DevOps request attempt",
+    ("method",)
+)
+DEVOPS_RETRIES = REGISTRY.counter(
+    "compliancex_devops_retries_total",
+    "Azure DevOps requests retried after a transient failure",
+    ("method",)
+)
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:  # Tracing is optional
+    trace = None
+
+TRACER_NAME = "compliancex"
+
+def _attributes(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in values.items() if value is not None}
+
+class Tracer:
+    """Optional OpenTelemetry spans for project, repository and rule checks
+    
+    Spans are created only when tracing is enabled and the OpenTelemetry API
+    is installed; otherwise every call is a no-op. Where spans are exported
+    is up to the SDK the deployment configures, e.g. with
+    opentelemetry-instrument. Without an SDK the API's spans are no-ops too.
+    """
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled and trace is not None
+        self._tracer = trace.get_tracer(TRACER_NAME) if self.enabled else None
+    
+    @contextmanager
+    def span(self, name: str, parent: Any = None, **attributes: Any) -> Iterator[Optional[Any]]:
+        """Run a block in a span, a child of `parent` or else of the current span"""
+        if not self.enabled:
+            yield None
+            return
+        context = trace.set_span_in_context(parent) if parent is not None else None
+        with self._tracer.start_as_current_span(
+            name,
+            context=context,
+            attributes=_attributes(attributes)
+        ) as span:
+            yield span
+    
+    def start_span(self, name: str, **attributes: Any) -> Optional[Any]:
+        """Start a span that is not tied to a block; end it with `end_span`"""
+        if not self.enabled:
+            return None
+        return self._tracer.start_span(name, attributes=_attributes(attributes))
+    
+    @staticmethod
+    def end_span(span: Optional[Any]) -> None:
+        if span is not None:
+            span.end()
@@ -1,5 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
+from pydantic_core import to_json
+import sys
 
 class ComplianceRule(BaseModel):
     """Base model for compliance rules"""
@@ -18,10 +20,64 @@ class ComplianceCheck(BaseModel):
     status: str
     details: Dict[str, Any]
     timestamp: str
+    repository: Optional[str] = None
+    project_id: Optional[str] = None
+    # True when reused from a previous scan with identical inputs, False when
+    # re-evaluated because inputs changed, None when the rule is not fingerprinted
+    reused: Optional[bool] = None
     
     class Config:
         from_attributes = True
 
+# Checks built by trusted code share these strings instead of holding copies
+CHECK_STATUSES = {status: sys.intern(status) for status in ("passed", "failed", "warning", "error", "unknown")}
+
+_new = object.__new__
+_set = object.__setattr__
+# trusted_check assigns every field, so every field counts as set
+_CHECK_FIELDS = frozenset(ComplianceCheck.model_fields)
+
+def trusted_check(
+    rule_id: str,
+    status: str,
+    details: Dict[str, Any],
+    timestamp: str,
+    repository: Optional[str] = None,
+    project_id: Optional[str] = None,
+    reused: Optional[bool] = None
+) -> ComplianceCheck:
+    """Build a check from values the engine produced itself, without validating them
+    
+    Checks returned by rule plugins are validated when the plugin builds
+    them; checks the engine builds (errors, timeouts, declarative results,
+    rows decoded from workers) come from typed values and skip validation.
+    This is cheaper than validating and several times cheaper than
+    model_construct.
+    """
+    check = _new(ComplianceCheck)
+    _set(check, "__dict__", {
+        "rule_id": sys.intern(rule_id),
+        "status": CHECK_STATUSES.get(status, status),
+        "details": details,
+        "timestamp": timestamp,
+        "repository": repository,
+        "project_id": project_id,
+        "reused": reused
+    })
+    # Copied, since pydantic adds to the set when a field is assigned later
+    _set(check, "__pydantic_fields_set__", set(_CHECK_FIELDS))
+    _set(check, "__pydantic_extra__", None)
+    _set(check, "__pydantic_private__", None)
+    return check
+
+def dump_json(value: Any) -> bytes:
+    """Serialize models, or plain data holding them, straight to compact JSON bytes
+    
+    Goes through pydantic-core's serializer without building intermediate
+    dicts, so API responses skip FastAPI's response_model re-validation.
+    """
+    return to_json(value)
+
 class ComplianceReport(BaseModel):
     """Model for compliance reports"""
     project_id: str
@@ -29,6 +85,89 @@ class ComplianceReport(BaseModel):
     checks: List[ComplianceCheck]
     overall_status: str
     generated_at: str
+    repositories: Dict[str, str] = {}
+    reuse_stats: Dict[str, int] = {}
+    
+    class Config:
+        from_attributes = True
+
+class ScanRequest(BaseModel):
+    """Model for scan job submissions; no project ids means the whole organization"""
+    project_ids: Optional[List[str]] = None
+    # "interactive" or "bulk"; defaults to interactive for a single project
+    priority: Optional[str] = None
+
+class ScanJob(BaseModel):
+    """Model for the state and partial results of a scan job"""
+    id: str
+    scope: str
+    project_ids: Optional[List[str]] = None
+    priority: str
+    status: str
+    total: Optional[int] = None
+    completed: int = 0
+    failed_projects: Dict[str, str] = {}
+    # Overall status of every scanned project; full reports are kept only up to a limit
+    statuses: Dict[str, str] = {}
+    reports_omitted: int = 0
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    reports: List[ComplianceReport] = []
+    
+    class Config:
+        from_attributes = True
+
+class FixPlan(BaseModel):
+    """Model for a proposed fix of a failed check, applied in bulk once approved"""
+    id: str
+    rule_id: str
+    project_id: str
+    repository: str
+    # The settings the fix changes: {"setting", "current", "proposed"}
+    changes: List[Dict[str, Any]] = []
+    # What the rule will write, in its own terms
+    action: Dict[str, Any] = {}
+    # pending (awaiting approval), approved, rejected, applied or failed
+    status: str = "pending"
+    created_at: str
+    applied_at: Optional[str] = None
+    error: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+class FixPlanSelection(BaseModel):
+    """Model for approving or rejecting fix plans by id"""
+    ids: List[str]
+
+class ExportRequest(BaseModel):
+    """Model for export submissions; no project or rule exports every stored check"""
+    format: str = "json"
+    project_id: Optional[str] = None
+    rule_id: Optional[str] = None
+    # Days of history to export, ending today; defaults to the whole retention period
+    days: Optional[int] = None
+
+class ExportJob(BaseModel):
+    """Model for the state of a report export"""
+    id: str
+    format: str
+    project_id: Optional[str] = None
+    rule_id: Optional[str] = None
+    start: str
+    end: str
+    # queued, running, completed or failed
+    status: str = "queued"
+    checks: int = 0
+    # Compressed size written to storage
+    bytes_written: int = 0
+    name: str
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
     
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,11 +1,35 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from collections import ChainMap
 from ...core.compliance.base_rules import AutoFixableRule
-from ...models.compliance import ComplianceRule, ComplianceCheck
+from ...core.compliance.prefetch import (
+    BRANCH_POLICIES,
+    EDIT_POLICIES,
+    REPOSITORY,
+    get_branch_protection_settings,
+    get_default_branch
+)
+from ...core.devops.client import MIN_REVIEWERS_POLICY_TYPE
+from ...models.compliance import ComplianceRule, ComplianceCheck, FixPlan
 from datetime import datetime
 
 class BranchProtectionRule(AutoFixableRule):
     """Rule to check and enforce branch protection settings"""
     
+    scope = "repository"
+    requires = (REPOSITORY, BRANCH_POLICIES, EDIT_POLICIES)
+    
+    REQUIRED_SETTINGS = {
+        "require_pull_request": True,
+        "required_reviewers": 1,
+        "dismiss_stale_reviews": True,
+        "require_code_owner_reviews": True,
+        "require_status_checks": True
+    }
+    
+    # Settings carried by the minimum reviewers policy, the only one that can
+    # be created without organization-specific build definitions or identities
+    FIXABLE_SETTINGS = {"require_pull_request", "required_reviewers", "dismiss_stale_reviews"}
+    
     def get_rule_definition(self) -> ComplianceRule:
         return ComplianceRule(
             id="branch-protection",
@@ -14,6 +38,16 @@ class BranchProtectionRule(AutoFixableRule):
             level="error"
         )
     
+    async def get_inputs(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The result depends only on the repository's branch policies"""
+        repository = context.get('repository')
+        if not repository:
+            return None
+        return {
+            "repository": repository,
+            "protection": await self._get_branch_protection(context)
+        }
+    
     async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
         repository = context.get('repository')
         if not repository:
@@ -24,9 +58,16 @@ class BranchProtectionRule(AutoFixableRule):
                 timestamp=datetime.utcnow().isoformat()
             )
         
-        # Check branch protection settings
-        protection_settings = await self._get_branch_protection(repository)
-        
+        # Check branch protection settings, reusing the ones get_inputs fetched
+        inputs = context.get('inputs')
+        if inputs is not None:
+            protection_settings = inputs["protection"]
+        else:
+            protection_settings = await self._get_branch_protection(context)
+        return self._evaluate(repository, protection_settings)
+    
+    def _evaluate(self, repository: str, protection_settings: Dict[str, Any]) -> ComplianceCheck:
+        """Turn a repository's branch protection settings into a check"""
         if not protection_settings:
             return ComplianceCheck(
                 rule_id=self.rule.id,
@@ -39,18 +80,7 @@ class BranchProtectionRule(AutoFixableRule):
             )
         
         # Validate protection settings
-        required_settings = {
-            "require_pull_request": True,
-            "required_reviewers": 1,
-            "dismiss_stale_reviews": True,
-            "require_code_owner_reviews": True,
-            "require_status_checks": True
-        }
-        
-        missing_settings = [
-            setting for setting, required_value in required_settings.items()
-            if protection_settings.get(setting) != required_value
-        ]
+        missing_settings = self._get_missing_settings(protection_settings)
         
         if missing_settings:
             return ComplianceCheck(
@@ -75,19 +105,24 @@ class BranchProtectionRule(AutoFixableRule):
         )
     
     async def can_auto_fix(self, context: Dict[str, Any]) -> bool:
-        # Check if we have necessary permissions to update branch protection
+        # Only fixable when every missing setting can be created by us
         repository = context.get('repository')
         if not repository:
             return False
         
         try:
+            protection_settings = await self._get_branch_protection(context)
+            missing_settings = self._get_missing_settings(protection_settings)
+            if not missing_settings or not set(missing_settings) <= self.FIXABLE_SETTINGS:
+                return False
+            
             # Check repository admin permissions
-            has_permission = await self._check_admin_permission(repository)
-            return has_permission
+            return await self.get_data(context, EDIT_POLICIES)
         except Exception:
             return False
     
     async def apply_fix(self, context: Dict[str, Any]) -> bool:
+        """Apply the minimum reviewers policy and report whether the repository now complies"""
         repository = context.get('repository')
         if not repository:
             return False
@@ -95,46 +130,177 @@ class BranchProtectionRule(AutoFixableRule):
         try:
             # Apply branch protection settings
             protection_settings = {
-                "required_status_checks": {
-                    "strict": True,
-                    "contexts": ["continuous-integration"]
-                },
-                "enforce_admins": True,
                 "required_pull_request_reviews": {
-                    "dismissal_restrictions": {},
-                    "dismiss_stale_reviews": True,
-                    "require_code_owner_reviews": True,
-                    "required_approving_review_count": 1
-                },
-                "restrictions": None
+                    "dismiss_stale_reviews": self.REQUIRED_SETTINGS["dismiss_stale_reviews"],
+                    "required_approving_review_count": self.REQUIRED_SETTINGS["required_reviewers"]
+                }
             }
             
             success = await self._update_branch_protection(
+                context.get('project_id'),
                 repository,
-                "main",
+                None,
                 protection_settings
             )
+            if not success:
+                return False
             
-            return success
+            # Verify against the policies as they are now, not the prefetched ones
+            protection_settings = await self._get_branch_protection(
+                ChainMap({'data': None}, context)
+            )
+            return not self._get_missing_settings(protection_settings)
         except Exception:
             return False
     
-    async def _get_branch_protection(self, repository: str) -> Dict[str, Any]:
-        """Get branch protection settings from Azure DevOps API"""
-        # Implementation would go here
-        pass
+    async def plan_fix(self, context: Dict[str, Any]) -> Optional[FixPlan]:
+        """Plan the minimum reviewers policy a repository lacks, from the data the check read
+        
+        The plan records whether the existing policy is updated or a new one
+        created, so applying it takes a single write.
+        """
+        repository = context.get('repository')
+        if not repository:
+            return None
+        policies = await self.get_data(context, BRANCH_POLICIES)
+        protection_settings = get_branch_protection_settings(policies)
+        missing_settings = self._get_missing_settings(protection_settings)
+        if not missing_settings or not set(missing_settings) <= self.FIXABLE_SETTINGS:
+            return None
+        if not await self.get_data(context, EDIT_POLICIES):
+            return None
+        
+        record = await self.get_data(context, REPOSITORY)
+        existing = [
+            policy for policy in policies
+            if policy.get("type", {}).get("id") == MIN_REVIEWERS_POLICY_TYPE and policy.get("id") is not None
+        ]
+        return self.make_fix_plan(
+            context,
+            changes=[
+                {
+                    "setting": setting,
+                    "current": protection_settings.get(setting),
+                    "proposed": self.REQUIRED_SETTINGS[setting]
+                }
+                for setting in missing_settings
+            ],
+            action={
+                "policy_id": existing[0]["id"] if existing else None,
+                "configuration": self._build_min_reviewers_configuration(
+                    record["id"],
+                    get_default_branch(record)
+                )
+            }
+        )
+    
+    async def apply_plan(self, plan: FixPlan) -> None:
+        client = self.get_client()
+        configuration = plan.action["configuration"]
+        if plan.action.get("policy_id") is not None:
+            await client.update_policy_configuration(plan.project_id, plan.action["policy_id"], configuration)
+        else:
+            await client.create_policy_configuration(plan.project_id, configuration)
+    
+    async def verify_plan(self, plan: FixPlan) -> ComplianceCheck:
+        """Re-read only the policies of the branch the plan wrote to"""
+        scope = plan.action["configuration"]["settings"]["scope"][0]
+        policies = await self.get_client().get_policy_configurations(
+            plan.project_id,
+            scope["repositoryId"],
+            scope["refName"]
+        )
+        check = self._evaluate(plan.repository, get_branch_protection_settings(policies))
+        check.details["auto_fixed"] = check.status == "passed"
+        return check
+    
+    def _build_min_reviewers_configuration(
+        self,
+        repository_id: str,
+        ref_name: str,
+        reviews: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the minimum reviewers policy configuration for a repository branch"""
+        reviews = reviews or {}
+        return {
+            "isEnabled": True,
+            "isBlocking": True,
+            "type": {"id": MIN_REVIEWERS_POLICY_TYPE},
+            "settings": {
+                "minimumApproverCount": reviews.get(
+                    "required_approving_review_count",
+                    self.REQUIRED_SETTINGS["required_reviewers"]
+                ),
+                "resetOnSourcePush": reviews.get(
+                    "dismiss_stale_reviews",
+                    self.REQUIRED_SETTINGS["dismiss_stale_reviews"]
+                ),
+                "scope": [{
+                    "repositoryId": repository_id,
+                    "refName": ref_name,
+                    "matchKind": "exact"
+                }]
+            }
+        }
     
-    async def _check_admin_permission(self, repository: str) -> bool:
-        """Check if current user has admin permissions"""
-        # Implementation would go here
-        pass
+    def _get_missing_settings(self, protection_settings: Dict[str, Any]) -> List[str]:
+        """Get the required settings the branch protection does not satisfy"""
+        return [
+            setting for setting, required_value in self.REQUIRED_SETTINGS.items()
+            if protection_settings.get(setting) != required_value
+        ]
+    
+    async def _get_branch_protection(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the default branch's protection settings from its policies"""
+        return get_branch_protection_settings(await self.get_data(context, BRANCH_POLICIES))
     
     async def _update_branch_protection(
         self,
+        project_id: str,
         repository: str,
-        branch: str,
+        branch: Optional[str],
         settings: Dict[str, Any]
     ) -> bool:
-        """Update branch protection settings via Azure DevOps API"""
-        # Implementation would go here
-        pass
\ No newline at end of file
+        """Update branch protection settings via Azure DevOps API
+        
+        Only the minimum reviewers policy is managed here; build validation
+        and required reviewer policies need organization-specific build
+        definitions and identities. An existing minimum reviewers policy is
+        updated in place rather than duplicated, and nothing is written when
+        it already matches. `branch` defaults to the repository's default
+        branch, the one the check reads.
+        """
+        client = self.get_client()
+        repo = await client.get_repository(project_id, repository)
+        ref_name = f"refs/heads/{branch}" if branch else get_default_branch(repo)
+        configuration = self._build_min_reviewers_configuration(
+            repo["id"],
+            ref_name,
+            settings.get("required_pull_request_reviews", {})
+        )
+        policy_settings = configuration["settings"]
+        
+        existing = [
+            policy for policy in await client.get_policy_configurations(
+                project_id,
+                repo["id"],
+                ref_name
+            )
+            if policy.get("type", {}).get("id") == MIN_REVIEWERS_POLICY_TYPE
+        ]
+        for policy in existing:
+            current = policy.get("settings", {})
+            if (policy.get("isEnabled") and policy.get("isBlocking") and
+                current.get("minimumApproverCount") == policy_settings["minimumApproverCount"] and
+                current.get("resetOnSourcePush") == policy_settings["resetOnSourcePush"]):
+                return True
+        
+        if existing and existing[0].get("id") is not None:
+            await client.update_policy_configuration(
+                project_id,
+                existing[0]["id"],
+                configuration
+            )
+        else:
+            await client.create_policy_configuration(project_id, configuration)
+        return True
@@ -1,48 +1,688 @@
-from typing import Dict, Any, List
-from ..core.features.feature_manager import FeatureManager
-from ..core.plugins.plugin_manager import PluginManager
-from ..core.compliance.base_rules import ComplianceRulePlugin
-from ..models.compliance import ComplianceCheck, ComplianceReport
+import asyncio
+from collections import ChainMap
+from contextlib import suppress
+from itertools import product
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple
+import time
+from ..core.features.feature_manager import FeatureManager, FeatureSnapshot
+from ..core.plugins.plugin_manager import PluginLoadError, PluginManager
+from ..core.compliance.base_rules import ComplianceRulePlugin, UnloadableRule
+from ..core.compliance.declarative import RulePlan, load_rule_definitions
+from ..core.compliance.engine import RuleEngine
+from ..core.compliance.history_store import HistoryStore
+from ..core.compliance.rollups import RollupStore
+from ..core.compliance.notifications import NotificationQueue
+from ..core.compliance.prefetch import DataView, RepositoryDataPlanner
+from ..core.compliance.remediation import FixQueue
+from ..core.compliance.report_cache import ReportCache
+from ..core.compliance.result_store import ResultStore
+from ..core.devops.client import DevOpsClient
+from ..core.telemetry.metrics import RULE_CHECKS, RULE_DURATION, RULE_EXCEPTIONS, RULE_TIMEOUTS
+from ..core.telemetry.tracing import Tracer
+from ..models.compliance import ComplianceCheck, ComplianceReport, trusted_check
 from datetime import datetime
 
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_RULE_TIMEOUT_SECONDS = 30.0
+DEFAULT_REPOSITORY_CONCURRENCY = 16
+DEFAULT_PROJECT_CONCURRENCY = 4
+DEFAULT_STREAM_BUFFER_SIZE = 100
+DEFAULT_RESULT_STORE_MAX_ENTRIES = 100000
+DEFAULT_REPORT_CACHE_MAX_ENTRIES = 1000
+DEFAULT_REPORT_CACHE_TTL_SECONDS = 30.0
+
+# Rule plugins live next to this package, e.g. src.backend.plugins.rules
+PLUGIN_PACKAGE = f"{__package__.rsplit('.', 1)[0]}.plugins.rules"
+# Relative paths in the feature flags, like config/rules.yaml, are relative to the repository root
+REPOSITORY_ROOT = Path(__file__).resolve().parents[3]
+
 class ComplianceService:
     """Service for managing compliance checks and reporting"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        devops_client: Optional[DevOpsClient] = None,
+        plugin_package: str = PLUGIN_PACKAGE,
+        history: Optional[HistoryStore] = None,
+        rollups: Optional[RollupStore] = None,
+        fixes: Optional[FixQueue] = None,
+        notifications: Optional[NotificationQueue] = None
+    ):
         self.feature_manager = FeatureManager()
         self.plugin_manager = PluginManager()
+        self.plugin_package = plugin_package
+        # One client and one result store are shared by every rule
+        self.devops_client = devops_client or DevOpsClient.from_env()
+        self.result_store = ResultStore(max_entries=self._get_result_store_size())
+        self.report_cache = ReportCache(*self._get_report_cache_settings())
+        self.rule_plan = self._load_rule_plan()
+        self.tracer = Tracer(self._is_tracing_enabled())
+        # Checks of project and organization scans are recorded here, if set
+        self.history = history
+        self.rollups = rollups
+        # Checks waiting to be appended to the history store by the writer task
+        self._history_buffer: List[ComplianceCheck] = []
+        self._history_writer: Optional[asyncio.Future] = None
+        # Fixes for failed checks are planned into this queue, if set
+        self.fixes = fixes
+        # Notifications of failed checks are queued here for background delivery, if set
+        self.notifications = notifications
+        if rollups is not None and self.rule_plan is not None:
+            rollups.describe_rules(self.rule_plan.rules)
+        
+        # Initialize plugins; rule modules are imported on first use
+        self.plugin_manager.discover_plugins(plugin_package)
+    
+    def _load_rule_plan(self) -> Optional[RulePlan]:
+        """Compile the declarative rules file of the `declarative-rules` feature, if enabled"""
+        path = self.feature_manager.get_parameter('declarative-rules', 'path')
+        if not path:
+            return None
+        engine = RuleEngine()
+        engine.register_definitions(load_rule_definitions(REPOSITORY_ROOT / path))
+        plan = engine.compile()
+        return plan if plan.rules else None
+    
+    def _bind_rules(self, plugins: Iterable[Any]) -> None:
+        """Hand the shared DevOps client and result store to every rule plugin"""
+        for plugin in plugins:
+            if isinstance(plugin, ComplianceRulePlugin):
+                plugin.devops_client = self.devops_client
+                plugin.result_store = self.result_store
+    
+    async def reload_plugins(self) -> List[str]:
+        """Rediscover rule plugins and swap them in without disturbing running checks
         
-        # Initialize plugins
-        self.plugin_manager.discover_plugins("plugins.rules")
+        Discovery runs in a worker thread and goes through the plugin
+        manifest, so rules are re-imported lazily on their next use. Checks
+        already in progress keep the rule instances they started with.
+        """
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(
+            None,
+            self.plugin_manager.rediscover_plugins,
+            self.plugin_package
+        )
+        self.plugin_manager.replace_plugins(self.plugin_package, entries)
+        self.report_cache.invalidate()
+        return list(entries)
     
     async def check_project_compliance(self, project_id: str) -> ComplianceReport:
-        """Check compliance for a specific project"""
-        context = await self._build_project_context(project_id)
-        checks = []
+        """Check compliance for a specific project
         
-        # Get all compliance rule plugins
-        rules = self.plugin_manager.get_plugins_by_type(ComplianceRulePlugin)
+        Reports are cached briefly per project and set of enabled features,
+        and concurrent calls for the same report share one check. The check
+        uses the feature flags as they were when it started.
+        """
+        features = self.feature_manager.snapshot
+        key = (project_id, features.fingerprint)
+        return await self.report_cache.get_or_compute(
+            key,
+            lambda: self._check_project_compliance(project_id, features)
+        )
+    
+    async def recheck_repositories(
+        self,
+        project_id: str,
+        repositories: Optional[Iterable[str]] = None,
+        kinds: Optional[Iterable[str]] = None
+    ) -> List[ComplianceCheck]:
+        """Re-evaluate repository rules for repositories that changed
         
-        for rule in rules:
-            # Check if the rule's feature is enabled
-            if not self.feature_manager.is_enabled(rule.get_name()):
-                continue
-            
-            # Execute the compliance check
-            check_result = await self._execute_rule(rule, context)
-            checks.append(check_result)
+        `repositories` are ids or names, and `kinds` the data kinds that
+        changed; None means all of them. Only rules that read a changed kind,
+        or that declare nothing and may read anything, are run. Results are
+        recorded like those of a full check and the project's cached reports
+        are dropped.
+        """
+        if self.devops_client is None:
+            return []
+        kinds = set(kinds) if kinds is not None else None
+        for path in (
+            f"{project_id}/_apis/git/repositories",
+            f"{project_id}/_apis/policy/configurations"
+        ):
+            self.devops_client.invalidate(path)
         
-        # Calculate overall status
-        overall_status = self._calculate_overall_status(checks)
+        records = await self.devops_client.list_repositories(project_id)
+        wanted = set(repositories) if repositories is not None else None
+        targets = [
+            record['name'] for record in records
+            if wanted is None or record['name'] in wanted or record['id'] in wanted
+        ]
+        rules = [
+            rule for rule in self.get_enabled_rules(project_id=project_id)
+            if rule.scope == "repository" and (
+                kinds is None or not rule.requires or kinds.intersection(rule.requires)
+            )
+        ]
+        include_plan = self.rule_plan is not None and (
+            kinds is None or bool(kinds.intersection(self.rule_plan.requires))
+        )
+        context = {
+            "project_id": project_id,
+            "project_name": "",
+            "repositories": targets
+        }
+        with self.tracer.span("compliance.recheck", project_id=project_id):
+            checks = await self._execute_repository_rules(rules, context, include_plan=include_plan)
+        self.record_checks(checks)
+        self.invalidate_reports(project_id)
+        return checks
+    
+    def invalidate_reports(self, project_id: Optional[str] = None) -> None:
+        """Forget cached reports of a project that changed, or of every project"""
+        self.report_cache.invalidate(project_id)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get statistics of the report cache and the rule result store"""
+        return {
+            "reports": self.report_cache.get_stats(),
+            "results": self.result_store.get_stats()
+        }
+    
+    async def _check_project_compliance(
+        self,
+        project_id: str,
+        features: Optional[FeatureSnapshot] = None
+    ) -> ComplianceReport:
+        """Run every rule enabled for a project against it"""
+        with self.tracer.span("compliance.project", project_id=project_id):
+            context = await self._build_project_context(project_id)
+            
+            rules = self.get_enabled_rules(features, project_id)
+            
+            project_rules = [rule for rule in rules if rule.scope != "repository"]
+            repository_rules = [rule for rule in rules if rule.scope == "repository"]
+            
+            # Execute the compliance checks
+            checks = await self._execute_rules(project_rules, context)
+            repository_checks = await self._execute_repository_rules(
+                repository_rules,
+                context
+            )
+            checks.extend(repository_checks)
         
+        self.record_checks(checks)
+        return self.build_report(project_id, checks, repository_checks, context.get('project_name', ''))
+    
+    def build_report(
+        self,
+        project_id: str,
+        checks: List[ComplianceCheck],
+        repository_checks: List[ComplianceCheck],
+        project_name: str = ""
+    ) -> ComplianceReport:
+        """Summarize a project's checks, `repository_checks` among them, into a report"""
         return ComplianceReport(
             project_id=project_id,
-            project_name=context.get('project_name', ''),
+            project_name=project_name,
             checks=checks,
-            overall_status=overall_status,
+            overall_status=self._calculate_overall_status(checks),
+            repositories=self._summarize_repositories(repository_checks),
+            reuse_stats={
+                "hits": sum(1 for check in checks if check.reused is True),
+                "misses": sum(1 for check in checks if check.reused is False)
+            },
             generated_at=datetime.utcnow().isoformat()
         )
     
+    def record_project_checks(
+        self,
+        project_id: str,
+        checks: List[ComplianceCheck],
+        features: Optional[FeatureSnapshot] = None
+    ) -> ComplianceReport:
+        """Record the checks of a project scanned elsewhere, e.g. in a worker process
+        
+        They go to the rollups and history like those of a local check, and
+        the report is cached for the feature flags the scan ran with.
+        """
+        features = features or self.feature_manager.snapshot
+        report = self.build_report(
+            project_id,
+            checks,
+            [check for check in checks if check.repository is not None]
+        )
+        self.record_checks(checks)
+        self.report_cache.put((project_id, features.fingerprint), report)
+        return report
+    
+    async def stream_organization_compliance(self) -> AsyncIterator[ComplianceCheck]:
+        """Scan every project in the organization, yielding checks as they complete
+        
+        Checks pass through a bounded queue instead of being collected into
+        reports, so memory stays flat regardless of organization size. When
+        the consumer stops reading, the queue fills and scanning pauses;
+        closing the iterator cancels the scan.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._get_stream_buffer_size())
+        finished = object()
+        
+        if self.devops_client is None:
+            raise RuntimeError("No Azure DevOps client configured")
+        
+        async def scan() -> None:
+            # No sentinel on cancellation: the consumer has already gone away.
+            # A failed scan ends with an explicit error check rather than a
+            # stream that is silently cut short.
+            async def emit(check: ComplianceCheck) -> None:
+                self.record_checks([check])
+                await queue.put(check)
+            
+            try:
+                await self.scan_projects(self.iter_project_ids(), emit)
+            except Exception as e:
+                await queue.put(trusted_check(
+                    rule_id="organization-scan",
+                    status="error",
+                    details={"error": str(e)},
+                    timestamp=datetime.utcnow().isoformat()
+                ))
+            await queue.put(finished)
+        
+        scanner = asyncio.ensure_future(scan())
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            if not scanner.done():
+                scanner.cancel()
+                with suppress(asyncio.CancelledError):
+                    await scanner
+    
+    async def scan_projects(
+        self,
+        project_ids: AsyncIterator[str],
+        emit: Callable[[ComplianceCheck], Awaitable[None]]
+    ) -> None:
+        """Scan projects with a bounded pool of workers, emitting every check
+        
+        Rules are resolved once for the scan, and again only for projects
+        that have feature overrides.
+        """
+        features = self.feature_manager.snapshot
+        
+        def by_scope(rules: List[ComplianceRulePlugin]):
+            return (
+                [rule for rule in rules if rule.scope != "repository"],
+                [rule for rule in rules if rule.scope == "repository"]
+            )
+        scoped_rules = by_scope(self.get_enabled_rules(features))
+        lock = asyncio.Lock()
+        
+        async def next_project_id() -> str:
+            # Async generators cannot be advanced by several workers at once
+            async with lock:
+                return await project_ids.__anext__()
+        
+        async def worker() -> None:
+            while True:
+                try:
+                    project_id = await next_project_id()
+                except StopAsyncIteration:
+                    return
+                with self.tracer.span("compliance.project", project_id=project_id):
+                    await scan_project(project_id)
+        
+        async def scan_project(project_id: str) -> None:
+            try:
+                context = await self._build_project_context(project_id)
+            except Exception as e:
+                await emit(trusted_check(
+                    rule_id="project-context",
+                    status="error",
+                    details={"error": str(e)},
+                    timestamp=datetime.utcnow().isoformat(),
+                    project_id=project_id
+                ))
+                return
+            project_rules, repository_rules = (
+                by_scope(self.get_enabled_rules(features, project_id))
+                if features.has_project_overrides(project_id) else scoped_rules
+            )
+            await self._execute_rules(project_rules, context, emit)
+            await self._execute_repository_rules(repository_rules, context, emit)
+        
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(self.get_project_concurrency())
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # Stop the remaining workers so none is left blocked on emit
+            for task in workers:
+                task.cancel()
+            raise
+    
+    def record_checks(self, checks: List[ComplianceCheck]) -> None:
+        """Fold checks into the dashboard rollups and queue them for the history store
+        
+        History is appended in batches by a writer task in a worker thread,
+        so file writes never block the event loop.
+        """
+        if self.rollups is not None:
+            self.rollups.record(checks)
+        if self.history is None:
+            return
+        self._history_buffer.extend(checks)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._append_history(self._take_history_buffer())
+            return
+        if self._history_writer is None or self._history_writer.done():
+            self._history_writer = loop.create_task(self._write_history())
+    
+    async def flush_history(self) -> None:
+        """Wait until recorded checks have been appended to the history store"""
+        if self._history_writer is not None:
+            await asyncio.gather(self._history_writer)
+    
+    async def _write_history(self) -> None:
+        """Append buffered checks until the buffer stays empty"""
+        loop = asyncio.get_running_loop()
+        while self._history_buffer:
+            await loop.run_in_executor(None, self._append_history, self._take_history_buffer())
+    
+    def _take_history_buffer(self) -> List[ComplianceCheck]:
+        checks, self._history_buffer = self._history_buffer, []
+        return checks
+    
+    def _append_history(self, checks: List[ComplianceCheck]) -> None:
+        # History is best effort
+        try:
+            self.history.append(checks)
+        except (OSError, ValueError):
+            pass
+    
+    async def iter_project_ids(self) -> AsyncIterator[str]:
+        """Iterate the organization's project ids page by page"""
+        async for project in self.devops_client.iter_projects():
+            yield project['id']
+    
+    def get_enabled_rules(
+        self,
+        features: Optional[FeatureSnapshot] = None,
+        project_id: Optional[str] = None
+    ) -> List[ComplianceRulePlugin]:
+        """Get the compliance rule plugins whose feature is enabled, for a project if given
+        
+        Rules are filtered by name before they are fetched, so disabled rules
+        are never imported. A rule that fails to load is replaced by one that
+        reports the failure as an error check.
+        """
+        features = features or self.feature_manager.snapshot
+        rules = []
+        for name in self.plugin_manager.get_plugin_names_by_type(ComplianceRulePlugin):
+            if not self._is_rule_enabled(name, features, project_id):
+                continue
+            try:
+                rules.append(self.plugin_manager.get_plugin(name))
+            except PluginLoadError as e:
+                # Report the broken rule instead of failing every check
+                rules.append(UnloadableRule(e))
+        self._bind_rules(rules)
+        if self.rollups is not None:
+            self.rollups.describe_rules(rule.rule for rule in rules)
+        return rules
+    
+    def _is_rule_enabled(
+        self,
+        name: str,
+        features: FeatureSnapshot,
+        project_id: Optional[str] = None
+    ) -> bool:
+        """Check the rule's feature flag, keyed by rule id (as in features.yaml) or plugin name"""
+        rule_id = self.plugin_manager.get_rule_id(name)
+        if rule_id is not None and features.is_enabled(rule_id, project_id):
+            return True
+        return features.is_enabled(name, project_id)
+    
+    async def _execute_rules(
+        self,
+        rules: List[ComplianceRulePlugin],
+        context: Dict[str, Any],
+        emit: Optional[Callable[[ComplianceCheck], Awaitable[None]]] = None
+    ) -> List[ComplianceCheck]:
+        """Execute rules concurrently, keeping results in rule order
+        
+        With `emit`, each check is handed over as soon as it completes and
+        nothing is collected.
+        """
+        semaphore = asyncio.Semaphore(self._get_max_concurrency())
+        timeout = self._get_rule_timeout()
+        
+        async def run(rule: ComplianceRulePlugin) -> Optional[ComplianceCheck]:
+            async with semaphore:
+                check = await self._execute_rule_with_timeout(rule, context, timeout)
+            if emit is None:
+                return check
+            await emit(check)
+            return None
+        
+        results = await asyncio.gather(*(run(rule) for rule in rules))
+        return [] if emit is not None else list(results)
+    
+    async def _execute_repository_rules(
+        self,
+        rules: List[ComplianceRulePlugin],
+        context: Dict[str, Any],
+        emit: Optional[Callable[[ComplianceCheck], Awaitable[None]]] = None,
+        include_plan: bool = True
+    ) -> List[ComplianceCheck]:
+        """Fan repository-scoped rules out over every repository in the project
+        
+        A fixed pool of workers pulls (repository, rule) pairs from a shared
+        iterator, so only as many per-repository contexts exist as there are
+        workers. The data the rules declare is prefetched for all repositories
+        first. Results are ordered by repository, then by rule; with `emit`
+        they are handed over as they complete instead. Checks of the compiled
+        declarative rules are evaluated for all repositories in one pass and
+        follow the plugin checks.
+        """
+        repositories = context.get('repositories') or []
+        rule_plan = self.rule_plan if include_plan else None
+        if (not rules and rule_plan is None) or not repositories:
+            return []
+        
+        views = await self._prefetch_repository_data(rules, context, rule_plan)
+        total = len(repositories) * len(rules)
+        results: List[ComplianceCheck] = [None] * (total if emit is None else 0)
+        jobs = enumerate(product(repositories, rules))
+        timeout = self._get_rule_timeout()
+        # With tracing, a span per repository is the parent of its rule spans
+        # and ends once its last rule has run
+        spans: Dict[str, Any] = {}
+        remaining = dict.fromkeys(repositories, len(rules)) if self.tracer.enabled else {}
+        
+        async def worker() -> None:
+            for index, (repository, rule) in jobs:
+                # Overlay the repository and its data on the shared project context
+                repository_context = ChainMap(
+                    {'repository': repository, 'data': views.get(repository)},
+                    context
+                )
+                if remaining and repository not in spans:
+                    spans[repository] = self.tracer.start_span(
+                        "compliance.repository",
+                        project_id=context.get('project_id'),
+                        repository=repository
+                    )
+                try:
+                    check = await self._execute_rule_with_timeout(
+                        rule,
+                        repository_context,
+                        timeout,
+                        parent_span=spans.get(repository)
+                    )
+                finally:
+                    if remaining:
+                        remaining[repository] -= 1
+                        if not remaining[repository]:
+                            self.tracer.end_span(spans.pop(repository))
+                if check.repository is None:
+                    check.repository = repository
+                if emit is None:
+                    results[index] = check
+                else:
+                    await emit(check)
+        
+        worker_count = min(self._get_repository_concurrency(), total)
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+        
+        if rule_plan is not None:
+            plan_checks = rule_plan.evaluate(context.get('project_id'), repositories, views)
+            for check in plan_checks:
+                RULE_CHECKS.inc(check.rule_id, check.status)
+            if emit is None:
+                results.extend(plan_checks)
+            else:
+                for check in plan_checks:
+                    await emit(check)
+        return results
+    
+    async def _prefetch_repository_data(
+        self,
+        rules: List[ComplianceRulePlugin],
+        context: Dict[str, Any],
+        rule_plan: Optional[RulePlan] = None
+    ) -> Dict[str, DataView]:
+        """Fetch the union of the rules' declared data once for every repository
+        
+        If prefetching fails, rules fall back to fetching their own data and
+        report any error individually.
+        """
+        kinds = set().union(*(rule.requires for rule in rules))
+        if rule_plan is not None:
+            kinds.update(rule_plan.requires)
+        if not kinds or self.devops_client is None:
+            return {}
+        try:
+            return await RepositoryDataPlanner(self.devops_client).fetch(
+                context.get('project_id'),
+                context.get('repositories') or [],
+                kinds
+            )
+        except Exception:
+            return {}
+    
+    def _summarize_repositories(
+        self,
+        checks: List[ComplianceCheck]
+    ) -> Dict[str, str]:
+        """Roll repository-scoped checks up into a status per repository"""
+        by_repository: Dict[str, List[ComplianceCheck]] = {}
+        for check in checks:
+            by_repository.setdefault(check.repository, []).append(check)
+        
+        return {
+            repository: self._calculate_overall_status(repository_checks)
+            for repository, repository_checks in by_repository.items()
+        }
+    
+    async def _execute_rule_with_timeout(
+        self,
+        rule: ComplianceRulePlugin,
+        context: Dict[str, Any],
+        timeout: float,
+        parent_span: Any = None
+    ) -> ComplianceCheck:
+        """Execute a single rule, cancelling it once the timeout expires
+        
+        Its duration and outcome are recorded in the rule metrics, and in a
+        span when tracing is enabled.
+        """
+        rule_id = rule.rule.id
+        start = time.perf_counter()
+        with self.tracer.span(
+            "compliance.rule",
+            parent=parent_span,
+            rule_id=rule_id,
+            project_id=context.get('project_id'),
+            repository=context.get('repository')
+        ) as span:
+            check = await self._execute_rule_until_timeout(rule, context, timeout)
+            if span is not None:
+                span.set_attribute("status", check.status)
+        RULE_DURATION.observe(time.perf_counter() - start, rule_id)
+        RULE_CHECKS.inc(rule_id, check.status)
+        if check.project_id is None:
+            check.project_id = context.get('project_id')
+        return check
+    
+    async def _execute_rule_until_timeout(
+        self,
+        rule: ComplianceRulePlugin,
+        context: Dict[str, Any],
+        timeout: float
+    ) -> ComplianceCheck:
+        """Execute a rule, reporting an error check if it outlives the timeout"""
+        try:
+            return await asyncio.wait_for(self._execute_rule(rule, context), timeout)
+        except asyncio.TimeoutError:
+            RULE_TIMEOUTS.inc(rule.rule.id)
+            return trusted_check(
+                rule_id=rule.rule.id,
+                status="error",
+                details={
+                    "error": f"Rule timed out after {timeout} seconds",
+                    "reason": "timeout"
+                },
+                timestamp=datetime.utcnow().isoformat()
+            )
+    
+    def _get_max_concurrency(self) -> int:
+        """Get the maximum number of rules executed at once"""
+        value = self.feature_manager.get_parameter('rule-execution', 'max_concurrency')
+        return max(1, int(value)) if value else DEFAULT_MAX_CONCURRENCY
+    
+    def _get_repository_concurrency(self) -> int:
+        """Get the number of workers used for repository fan-out"""
+        value = self.feature_manager.get_parameter('rule-execution', 'repository_concurrency')
+        return max(1, int(value)) if value else DEFAULT_REPOSITORY_CONCURRENCY
+    
+    def get_project_concurrency(self) -> int:
+        """Get the number of projects scanned at once in organization scans"""
+        value = self.feature_manager.get_parameter('rule-execution', 'project_concurrency')
+        return max(1, int(value)) if value else DEFAULT_PROJECT_CONCURRENCY
+    
+    def _get_stream_buffer_size(self) -> int:
+        """Get the number of checks buffered ahead of a streaming consumer"""
+        value = self.feature_manager.get_parameter('rule-execution', 'stream_buffer_size')
+        return max(1, int(value)) if value else DEFAULT_STREAM_BUFFER_SIZE
+    
+    def _get_result_store_size(self) -> int:
+        """Get the number of rule results kept for reuse between scans"""
+        value = self.feature_manager.get_parameter('rule-execution', 'result_store_max_entries')
+        return max(0, int(value)) if value is not None else DEFAULT_RESULT_STORE_MAX_ENTRIES
+    
+    def _get_report_cache_settings(self) -> Tuple[int, float]:
+        """Get the size and lifetime of the report cache"""
+        max_entries = self.feature_manager.get_parameter('rule-execution', 'report_cache_max_entries')
+        ttl_seconds = self.feature_manager.get_parameter('rule-execution', 'report_cache_ttl_seconds')
+        return (
+            max(0, int(max_entries)) if max_entries is not None else DEFAULT_REPORT_CACHE_MAX_ENTRIES,
+            float(ttl_seconds) if ttl_seconds is not None else DEFAULT_REPORT_CACHE_TTL_SECONDS
+        )
+    
+    def _is_tracing_enabled(self) -> bool:
+        """Check whether rule checks are traced, per the `telemetry` feature"""
+        return bool(
+            self.feature_manager.is_enabled('telemetry') and
+            self.feature_manager.get_parameter('telemetry', 'tracing')
+        )
+    
+    def _get_rule_timeout(self) -> float:
+        """Get the per-rule timeout in seconds"""
+        value = self.feature_manager.get_parameter('rule-execution', 'rule_timeout_seconds')
+        return float(value) if value else DEFAULT_RULE_TIMEOUT_SECONDS
+    
     async def _execute_rule(
         self,
         rule: ComplianceRulePlugin,
@@ -50,26 +690,47 @@ class ComplianceService:
     ) -> ComplianceCheck:
         """Execute a single compliance rule"""
         try:
-            # Check if auto-fix is enabled for this rule
-            if (hasattr(rule, 'execute_with_auto_fix') and 
-                self.feature_manager.is_enabled('auto-fix')):
-                return await rule.execute_with_auto_fix(context)
-            
             # Check if notifications are enabled for this rule
-            if (hasattr(rule, 'execute_with_notification') and 
-                self.feature_manager.is_enabled('notifications')):
-                return await rule.execute_with_notification(context)
-            
-            # Default execution
-            return await rule.execute_check(context)
+            if (hasattr(rule, 'execute_with_notification') and
+                self.feature_manager.is_enabled('notifications', context.get('project_id'), rule.rule.id)):
+                check = await rule.execute_with_notification(context, self.notifications)
+            else:
+                # Default execution
+                check = await rule.execute_check(context)
         except Exception as e:
             # Log the error and return a failed check
-            return ComplianceCheck(
+            RULE_EXCEPTIONS.inc(rule.rule.id, type(e).__name__)
+            return trusted_check(
                 rule_id=rule.rule.id,
                 status="error",
                 details={"error": str(e)},
                 timestamp=datetime.utcnow().isoformat()
             )
+        
+        if check.status == "failed" and self.fixes is not None and hasattr(rule, 'plan_fix'):
+            await self._plan_fix(rule, context, check)
+        return check
+    
+    async def _plan_fix(
+        self,
+        rule: ComplianceRulePlugin,
+        context: Dict[str, Any],
+        check: ComplianceCheck
+    ) -> None:
+        """Queue a fix plan for a failed check, if auto-fix is enabled and the rule has one
+        
+        Fixes are never applied inline; the RemediationService applies
+        approved plans in bulk. Planning reads the data the check already
+        read, and a rule that cannot plan leaves the check as it is.
+        """
+        if not self.feature_manager.is_enabled('auto-fix', context.get('project_id'), rule.rule.id):
+            return
+        try:
+            plan = await rule.plan_fix(context)
+        except Exception:
+            return
+        if plan is not None:
+            check.details["fix_plan"] = self.fixes.submit(plan).id
     
     def _calculate_overall_status(self, checks: List[ComplianceCheck]) -> str:
         """Calculate overall compliance status"""
@@ -93,10 +754,17 @@ class ComplianceService:
     
     async def _build_project_context(self, project_id: str) -> Dict[str, Any]:
         """Build context for compliance checking"""
-        # This would fetch project details, repositories, etc.
-        # Implementation would go here
+        if self.devops_client is None:
+            return {
+                "project_id": project_id,
+                "project_name": "Sample Project",
+                "repositories": []
+            }
+        
+        project = await self.devops_client.get_project(project_id)
+        repositories = await self.devops_client.list_repositories(project_id)
         return {
             "project_id": project_id,
-            "project_name": "Sample Project",
-            "repositories": []
+            "project_name": project.get('name', ''),
+            "repositories": [repository['name'] for repository in repositories]
         }
\ No newline at end of file
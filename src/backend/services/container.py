@@ -0,0 +1,310 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from ..core.compliance.history_store import DEFAULT_RETENTION_DAYS, HistoryStore
+from ..core.compliance.notifications import LocalSink, NotificationQueue
+from ..core.compliance.remediation import DEFAULT_MAX_FIXES_PER_DAY, FixBudget, FixQueue
+from ..core.compliance.rollups import DEFAULT_MAX_HISTORY_DAYS, RollupStore
+from ..core.devops.client import DevOpsClient
+from ..core.features.feature_manager import FeatureManager
+from ..core.reporting.storage import create_storage
+from ..core.telemetry.metrics import REGISTRY, Counter, Gauge, Metric
+from .compliance_service import ComplianceService
+from .export_service import DEFAULT_BATCH_SIZE, DEFAULT_WORKERS, ExportService
+from .job_service import JobService
+from .notification_service import (
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_FREQUENCY,
+    DEFAULT_MAX_ATTEMPTS,
+    NotificationService
+)
+from .remediation_service import DEFAULT_WRITE_CONCURRENCY, RemediationService
+from .scheduler import ComplianceScheduler
+from .webhook_service import (
+    DEFAULT_DEBOUNCE_SECONDS,
+    DEFAULT_DEDUPE_WINDOW,
+    DEFAULT_MAX_DELAY_SECONDS,
+    WebhookService
+)
+
+# COMPLIANCEX_HISTORY_PATH overrides the `reporting` feature's history_path
+HISTORY_PATH_ENV = "COMPLIANCEX_HISTORY_PATH"
+DEFAULT_HISTORY_PATH = Path(__file__).resolve().parents[1] / ".cache" / "history"
+DEFAULT_FIX_BUDGET_PATH = Path(__file__).resolve().parents[1] / ".cache" / "auto_fix_budget.json"
+DEFAULT_NOTIFICATION_SINK_PATH = Path(__file__).resolve().parents[1] / ".cache" / "notifications.jsonl"
+DEFAULT_EXPORT_PATH = Path(__file__).resolve().parents[1] / ".cache" / "exports"
+
+class ServiceContainer:
+    """Application-lifetime owner of the warm ComplianceService
+    
+    Created once in the API lifespan, so plugin discovery and the DevOps
+    connection pool are set up at startup instead of on every request.
+    """
+    
+    def __init__(self, devops_client: Optional[DevOpsClient] = None):
+        self._devops_client = devops_client
+        self._compliance_service: Optional[ComplianceService] = None
+        self._job_service: Optional[JobService] = None
+        self._scheduler: Optional[ComplianceScheduler] = None
+        self._history: Optional[HistoryStore] = None
+        self._rollups: Optional[RollupStore] = None
+        self._webhooks: Optional[WebhookService] = None
+        self._remediation: Optional[RemediationService] = None
+        self._notifications: Optional[NotificationService] = None
+        self._exports: Optional[ExportService] = None
+        self._reload_lock = asyncio.Lock()
+    
+    async def startup(self) -> None:
+        """Build services, discover plugins and start the job workers"""
+        self._history = self._create_history_store()
+        self._rollups = self._create_rollup_store(self._history)
+        if self._history is not None:
+            self._exports = self._create_export_service(self._history)
+        fixes = self._create_fix_queue()
+        self._notifications = self._create_notification_service()
+        self._compliance_service = ComplianceService(
+            devops_client=self._devops_client,
+            history=self._history,
+            rollups=self._rollups,
+            fixes=fixes,
+            notifications=self._notifications.queue if self._notifications else None
+        )
+        self._job_service = JobService(self._compliance_service)
+        await self._job_service.start()
+        service = self._compliance_service
+        if service.devops_client and service.feature_manager.is_enabled('compliance-scheduling'):
+            self._scheduler = ComplianceScheduler(service, self._job_service)
+            self._scheduler.start()
+        if service.feature_manager.is_enabled('webhooks'):
+            self._webhooks = self._create_webhook_service(service)
+        if fixes is not None:
+            self._remediation = self._create_remediation_service(service, fixes)
+            self._remediation.start()
+        if self._notifications is not None:
+            self._notifications.start()
+        service.feature_manager.start_watching()
+        REGISTRY.add_collector(self.collect_metrics)
+    
+    async def shutdown(self) -> None:
+        """Stop the scheduler and job workers and release pooled connections"""
+        REGISTRY.remove_collector(self.collect_metrics)
+        await FeatureManager().stop_watching()
+        if self._scheduler is not None:
+            await self._scheduler.stop()
+            self._scheduler = None
+        if self._webhooks is not None:
+            await self._webhooks.close()
+            self._webhooks = None
+        if self._remediation is not None:
+            await self._remediation.stop()
+            self._remediation = None
+        if self._notifications is not None:
+            await self._notifications.stop()
+            self._notifications = None
+        if self._exports is not None:
+            await self._exports.close()
+            self._exports = None
+        if self._job_service is not None:
+            await self._job_service.stop()
+            self._job_service = None
+        if self._compliance_service is not None:
+            await self._compliance_service.flush_history()
+        if self._compliance_service and self._compliance_service.devops_client:
+            await self._compliance_service.devops_client.close()
+        self._compliance_service = None
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+        self._rollups = None
+    
+    @staticmethod
+    def _create_history_store() -> Optional[HistoryStore]:
+        """Open the check history of the `reporting` feature, if enabled"""
+        feature_manager = FeatureManager()
+        if not feature_manager.is_enabled('reporting'):
+            return None
+        path = os.environ.get(HISTORY_PATH_ENV) or feature_manager.get_parameter('reporting', 'history_path')
+        retention_days = feature_manager.get_parameter('reporting', 'retention_days')
+        return HistoryStore(
+            Path(path) if path else DEFAULT_HISTORY_PATH,
+            int(retention_days) if retention_days else DEFAULT_RETENTION_DAYS
+        )
+    
+    @staticmethod
+    def _create_export_service(history: HistoryStore) -> ExportService:
+        """Build the report exporter from the `reporting` feature's parameters"""
+        feature_manager = FeatureManager()
+        export_path = feature_manager.get_parameter('reporting', 'export_path')
+        workers = feature_manager.get_parameter('reporting', 'export_workers')
+        batch_size = feature_manager.get_parameter('reporting', 'export_batch_size')
+        storage = create_storage(
+            feature_manager.get_parameter('reporting', 'storage_type'),
+            Path(export_path) if export_path else DEFAULT_EXPORT_PATH
+        )
+        return ExportService(
+            history,
+            storage,
+            formats=feature_manager.get_parameter('reporting', 'formats'),
+            batch_size=int(batch_size) if batch_size else DEFAULT_BATCH_SIZE,
+            processes=int(workers) if workers else DEFAULT_WORKERS
+        )
+    
+    @staticmethod
+    def _create_rollup_store(history: Optional[HistoryStore]) -> Optional[RollupStore]:
+        """Build the dashboard rollups, replaying recent history, if `dashboard` is enabled"""
+        feature_manager = FeatureManager()
+        if not feature_manager.is_enabled('dashboard'):
+            return None
+        value = feature_manager.get_parameter('dashboard', 'max_history_days')
+        max_history_days = max(1, int(value)) if value else DEFAULT_MAX_HISTORY_DAYS
+        rollups = RollupStore(max_history_days)
+        if history is not None:
+            today = datetime.utcnow().date()
+            rollups.replay(history.iter_records(today - timedelta(days=max_history_days - 1), today))
+        return rollups
+    
+    @staticmethod
+    def _create_fix_queue() -> Optional[FixQueue]:
+        """Build the fix plan queue, if the `auto-fix` feature is enabled"""
+        feature_manager = FeatureManager()
+        if not feature_manager.is_enabled('auto-fix'):
+            return None
+        require_approval = feature_manager.get_parameter('auto-fix', 'require_approval')
+        return FixQueue(require_approval=require_approval is None or bool(require_approval))
+    
+    @staticmethod
+    def _create_remediation_service(service: ComplianceService, fixes: FixQueue) -> RemediationService:
+        """Build the fix applier and its daily budget from the `auto-fix` feature's parameters"""
+        feature_manager = service.feature_manager
+        budget_path = feature_manager.get_parameter('auto-fix', 'budget_path')
+        max_per_day = feature_manager.get_parameter('auto-fix', 'max_auto_fixes_per_day')
+        write_concurrency = feature_manager.get_parameter('auto-fix', 'write_concurrency')
+        budget = FixBudget(
+            Path(budget_path) if budget_path else DEFAULT_FIX_BUDGET_PATH,
+            int(max_per_day) if max_per_day is not None else DEFAULT_MAX_FIXES_PER_DAY
+        )
+        return RemediationService(
+            service,
+            fixes,
+            budget,
+            write_concurrency=int(write_concurrency) if write_concurrency else DEFAULT_WRITE_CONCURRENCY
+        )
+    
+    @staticmethod
+    def _create_notification_service() -> Optional[NotificationService]:
+        """Build the notification dispatcher from the `notifications` feature's parameters"""
+        feature_manager = FeatureManager()
+        if not feature_manager.is_enabled('notifications'):
+            return None
+        sink_path = feature_manager.get_parameter('notifications', 'sink_path')
+        max_attempts = feature_manager.get_parameter('notifications', 'max_attempts')
+        backoff = feature_manager.get_parameter('notifications', 'backoff_seconds')
+        channels = [
+            channel for channel in ("email", "teams")
+            if feature_manager.get_parameter('notifications', f'{channel}_notifications')
+        ]
+        return NotificationService(
+            NotificationQueue(),
+            LocalSink(Path(sink_path) if sink_path else DEFAULT_NOTIFICATION_SINK_PATH),
+            frequency=feature_manager.get_parameter('notifications', 'notification_frequency') or DEFAULT_FREQUENCY,
+            channels=channels,
+            max_attempts=int(max_attempts) if max_attempts else DEFAULT_MAX_ATTEMPTS,
+            backoff_base=float(backoff) if backoff is not None else DEFAULT_BACKOFF_BASE
+        )
+    
+    @staticmethod
+    def _create_webhook_service(service: ComplianceService) -> WebhookService:
+        """Build the service hook ingest from the `webhooks` feature's parameters"""
+        feature_manager = service.feature_manager
+        debounce = feature_manager.get_parameter('webhooks', 'debounce_seconds')
+        max_delay = feature_manager.get_parameter('webhooks', 'max_delay_seconds')
+        dedupe_window = feature_manager.get_parameter('webhooks', 'dedupe_window')
+        return WebhookService(
+            service,
+            debounce_seconds=float(debounce) if debounce is not None else DEFAULT_DEBOUNCE_SECONDS,
+            max_delay_seconds=float(max_delay) if max_delay is not None else DEFAULT_MAX_DELAY_SECONDS,
+            dedupe_window=int(dedupe_window) if dedupe_window is not None else DEFAULT_DEDUPE_WINDOW
+        )
+    
+    def collect_metrics(self) -> Iterable[Metric]:
+        """Export cache and outbound concurrency statistics at scrape time"""
+        service = self._compliance_service
+        if service is None:
+            return []
+        caches: Dict[str, Dict[str, Any]] = dict(service.get_cache_stats())
+        budgets: Dict[str, Dict[str, Any]] = {}
+        if service.devops_client is not None:
+            client_stats = service.devops_client.get_stats()
+            caches["devops"] = client_stats["cache"]
+            budgets = client_stats["concurrency"]
+        
+        hits = Counter("compliancex_cache_hits_total", "Lookups answered from a cache", ("cache",))
+        misses = Counter("compliancex_cache_misses_total", "Lookups a cache could not answer", ("cache",))
+        entries = Gauge("compliancex_cache_entries", "Entries held by a cache", ("cache",))
+        hit_ratio = Gauge("compliancex_cache_hit_ratio", "Share of lookups answered from a cache", ("cache",))
+        for name, stats in caches.items():
+            hits.inc(name, amount=stats["hits"])
+            misses.inc(name, amount=stats["misses"])
+            entries.set(stats["entries"], name)
+            lookups = stats["hits"] + stats["misses"]
+            hit_ratio.set(stats.get("hit_rate", stats["hits"] / lookups if lookups else 0.0), name)
+        
+        limit = Gauge("compliancex_devops_concurrency_limit", "Current outbound concurrency limit", ("budget",))
+        in_flight = Gauge("compliancex_devops_in_flight", "Azure DevOps requests in flight", ("budget",))
+        throttled = Counter("compliancex_devops_throttled_total", "Responses that signalled throttling", ("budget",))
+        for name, stats in budgets.items():
+            limit.set(stats["limit"], name)
+            in_flight.set(stats["in_flight"], name)
+            throttled.inc(name, amount=stats["throttled"])
+        return [hits, misses, entries, hit_ratio, limit, in_flight, throttled]
+    
+    @property
+    def exports(self) -> Optional[ExportService]:
+        """Get the report exporter, if the `reporting` feature is enabled"""
+        return self._exports
+    
+    @property
+    def notifications(self) -> Optional[NotificationService]:
+        """Get the notification dispatcher, if the `notifications` feature is enabled"""
+        return self._notifications
+    
+    @property
+    def remediation(self) -> Optional[RemediationService]:
+        """Get the fix applier, if the `auto-fix` feature is enabled"""
+        return self._remediation
+    
+    @property
+    def webhooks(self) -> Optional[WebhookService]:
+        """Get the service hook ingest, if the `webhooks` feature is enabled"""
+        return self._webhooks
+    
+    @property
+    def rollups(self) -> Optional[RollupStore]:
+        """Get the dashboard rollups, if the `dashboard` feature is enabled"""
+        return self._rollups
+    
+    @property
+    def history(self) -> Optional[HistoryStore]:
+        """Get the check history, if the `reporting` feature is enabled"""
+        return self._history
+    
+    @property
+    def compliance_service(self) -> ComplianceService:
+        """Get the shared ComplianceService"""
+        if self._compliance_service is None:
+            raise RuntimeError("Service container has not been started")
+        return self._compliance_service
+    
+    @property
+    def job_service(self) -> JobService:
+        """Get the shared JobService"""
+        if self._job_service is None:
+            raise RuntimeError("Service container has not been started")
+        return self._job_service
+    
+    async def reload_plugins(self) -> List[str]:
+        """Hot-reload rule plugins, one reload at a time"""
+        async with self._reload_lock:
+            return await self.compliance_service.reload_plugins()
@@ -0,0 +1,214 @@
+import asyncio
+import multiprocessing
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+from ..core.compliance.history_store import STATUSES, HistoryStore
+from ..core.reporting.renderers import RENDERERS, render_rows
+from ..core.reporting.storage import ExportStorage
+from ..models.compliance import ExportJob, ExportRequest
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_WORKERS = 2
+DEFAULT_CONCURRENT_EXPORTS = 2
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_MAX_FINISHED_JOBS = 100
+# wbits for a gzip container around the deflate stream
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+class ExportService:
+    """Streams stored check history into compressed report files
+    
+    Each export reads `batch_size` records at a time in a thread, renders
+    the batch in a worker process, gzips it in a thread and writes the chunk
+    to storage before reading the next, so an export holds one batch at a
+    time whatever its size and never blocks the event loop. It covers the
+    checks stored when it starts; appends made meanwhile are left out.
+    """
+    
+    def __init__(
+        self,
+        history: HistoryStore,
+        storage: ExportStorage,
+        formats: Optional[Iterable[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        processes: int = DEFAULT_WORKERS,
+        max_concurrent: int = DEFAULT_CONCURRENT_EXPORTS,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+        executor: Optional[Executor] = None
+    ):
+        self.history = history
+        self.storage = storage
+        self.formats = [format for format in (formats or RENDERERS) if format in RENDERERS]
+        self.batch_size = max(1, batch_size)
+        self.processes = max(1, processes)
+        self.compression_level = compression_level
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._jobs: "OrderedDict[str, ExportJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.reset_stats()
+    
+    def _get_executor(self) -> Executor:
+        """Get the render pool, starting it on first use"""
+        if self._executor is None:
+            # Spawned rather than forked: workers must not inherit the caller's event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    async def close(self) -> None:
+        """Cancel running exports and shut the render pool down"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def submit(self, request: ExportRequest) -> ExportJob:
+        """Queue an export and return its job to poll"""
+        if request.format not in self.formats:
+            raise ValueError(f"Unsupported export format: {request.format}")
+        if request.days is not None and request.days < 1:
+            raise ValueError("days must be at least 1")
+        end = self.history.clock().astimezone(timezone.utc).date()
+        days = min(request.days or self.history.retention_days, self.history.retention_days)
+        job_id = uuid.uuid4().hex
+        job = ExportJob(
+            id=job_id,
+            format=request.format,
+            project_id=request.project_id,
+            rule_id=request.rule_id,
+            start=(end - timedelta(days=days - 1)).isoformat(),
+            end=end.isoformat(),
+            name=f"{job_id}.{RENDERERS[request.format].extension}.gz",
+            created_at=datetime.utcnow().isoformat()
+        )
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.ensure_future(self._run(job))
+        self._prune()
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[ExportJob]:
+        """Get an export job"""
+        return self._jobs.get(job_id)
+    
+    async def wait(self, job_id: str) -> ExportJob:
+        """Wait until an export has finished"""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self._jobs[job_id]
+    
+    def read(self, job: ExportJob) -> AsyncIterator[bytes]:
+        """Stream a completed export's compressed bytes from storage"""
+        if job.status != "completed":
+            raise ValueError(f"Export {job.id} is {job.status}")
+        return self.storage.read(job.name)
+    
+    async def _run(self, job: ExportJob) -> None:
+        async with self._semaphore:
+            job.status = "running"
+            job.started_at = datetime.utcnow().isoformat()
+            loop = asyncio.get_running_loop()
+            renderer_type = RENDERERS[job.format]
+            renderer = renderer_type(self._get_title(job), job.started_at)
+            compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, GZIP_WBITS)
+            totals = dict.fromkeys(STATUSES, 0)
+            writer = await self.storage.open(job.name)
+            
+            async def write(data: bytes, final: bool = False) -> None:
+                def compress() -> bytes:
+                    chunk = compressor.compress(data)
+                    return chunk + compressor.flush() if final else chunk
+                chunk = await loop.run_in_executor(None, compress)
+                if chunk:
+                    await writer.write(chunk)
+                    job.bytes_written += len(chunk)
+            
+            try:
+                await write(renderer.header())
+                records = self.history.iter_records(
+                    date.fromisoformat(job.start),
+                    date.fromisoformat(job.end),
+                    job.project_id,
+                    job.rule_id
+                )
+                while True:
+                    rows = await loop.run_in_executor(None, lambda: list(islice(records, self.batch_size)))
+                    if not rows:
+                        break
+                    # Formats too cheap to be worth pickling render in a thread instead
+                    executor = self._get_executor() if renderer_type.offload else None
+                    rendered = await loop.run_in_executor(executor, render_rows, job.format, rows)
+                    for row in rows:
+                        totals[row[4]] += 1
+                    job.checks += len(rows)
+                    await write(renderer.frame(rendered))
+                    self.rows_exported += len(rows)
+                # A PDF footer indexes every object, too much work for the event loop
+                await write(await loop.run_in_executor(None, renderer.footer, totals), final=True)
+                await writer.commit()
+                job.status = "completed"
+                self.completed += 1
+            except asyncio.CancelledError:
+                await writer.abort()
+                job.status = "failed"
+                job.error = "Export cancelled"
+                raise
+            except Exception as e:
+                await writer.abort()
+                job.status = "failed"
+                job.error = str(e)
+                self.failed += 1
+            finally:
+                job.finished_at = datetime.utcnow().isoformat()
+                self.bytes_written += job.bytes_written
+                self._tasks.pop(job.id, None)
+    
+    @staticmethod
+    def _get_title(job: ExportJob) -> str:
+        scope = [f"project {job.project_id}"] if job.project_id else ["all projects"]
+        if job.rule_id:
+            scope.append(f"rule {job.rule_id}")
+        return f"Compliance checks for {', '.join(scope)}, {job.start} to {job.end}"
+    
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit, deleting their files"""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status not in ("queued", "running")
+        ]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            job = self._jobs.pop(job_id)
+            if job.status == "completed":
+                asyncio.ensure_future(self.storage.delete(job.name))
+    
+    def reset_stats(self) -> None:
+        """Reset export counters"""
+        self.completed = 0
+        self.failed = 0
+        self.rows_exported = 0
+        self.bytes_written = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get export counters"""
+        return {
+            "formats": list(self.formats),
+            "running": len(self._tasks),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rows_exported": self.rows_exported,
+            "bytes_written": self.bytes_written
+        }
@@ -0,0 +1,252 @@
+import asyncio
+import itertools
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ..core.features.feature_manager import FeatureManager
+from ..models.compliance import ComplianceCheck, ComplianceReport, ScanJob
+from .compliance_service import ComplianceService
+from .sharded_scan import DEFAULT_SHARD_SIZE, ShardedScanner
+from datetime import datetime
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+# Lower runs first
+PRIORITIES = {INTERACTIVE: 0, BULK: 1}
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_FINISHED_JOBS = 1000
+DEFAULT_MAX_JOB_REPORTS = 100
+# Organization scans run in this process unless scan_processes is above 1
+DEFAULT_SCAN_PROCESSES = 1
+
+class JobService:
+    """Runs compliance scans as background jobs on a bounded worker pool
+    
+    Jobs wait in a priority queue, so interactive checks are picked up ahead
+    of queued bulk scans. Submitting a scope that already has a queued or
+    running job returns that job instead of starting another one. Reports are
+    added to the job as each project completes, so callers can poll partial
+    results; past `max_job_reports` only each project's status is kept, so an
+    organization scan does not hold every report in memory. With
+    `scan_processes` above 1, organization scans run on a ShardedScanner.
+    """
+    
+    def __init__(self, compliance_service: ComplianceService):
+        self.compliance_service = compliance_service
+        self.feature_manager = FeatureManager()
+        self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+        # Scope key -> id of the queued or running job for that scope
+        self._active: Dict[Tuple[str, ...], str] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+        self._sequence = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Future] = []
+        self._scanner: Optional[ShardedScanner] = None
+    
+    async def start(self) -> None:
+        """Start the worker pool"""
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.ensure_future(self._worker())
+            for _ in range(self._get_worker_count())
+        ]
+    
+    async def stop(self) -> None:
+        """Cancel the workers; running jobs end as cancelled"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._scanner is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._scanner.close)
+            self._scanner = None
+    
+    def submit(
+        self,
+        project_ids: Optional[List[str]] = None,
+        priority: Optional[str] = None
+    ) -> ScanJob:
+        """Queue a scan of some projects, or of the whole organization without project ids"""
+        if project_ids is not None:
+            project_ids = sorted(set(project_ids))
+            if not project_ids:
+                raise ValueError("No projects to scan")
+        if priority is None:
+            priority = INTERACTIVE if project_ids is not None and len(project_ids) == 1 else BULK
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        
+        key = self._scope_key(project_ids)
+        job_id = self._active.get(key)
+        if job_id is not None:
+            job = self._jobs[job_id]
+            if job.status == "queued" and PRIORITIES[priority] < PRIORITIES[job.priority]:
+                # Queue it again ahead; the stale entry is skipped when popped
+                job.priority = priority
+                self._enqueue(job)
+            return job
+        
+        if project_ids is None:
+            scope = "organization"
+        else:
+            scope = "project" if len(project_ids) == 1 else "projects"
+        job = ScanJob(
+            id=uuid.uuid4().hex,
+            scope=scope,
+            project_ids=project_ids,
+            priority=priority,
+            status="queued",
+            total=len(project_ids) if project_ids is not None else None,
+            created_at=datetime.utcnow().isoformat()
+        )
+        self._jobs[job.id] = job
+        self._active[key] = job.id
+        self._done[job.id] = asyncio.Event()
+        self._enqueue(job)
+        self._prune()
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[ScanJob]:
+        """Get a job, including the reports completed so far"""
+        return self._jobs.get(job_id)
+    
+    async def wait(self, job_id: str) -> ScanJob:
+        """Wait until a job has finished"""
+        await self._done[job_id].wait()
+        return self._jobs[job_id]
+    
+    def _enqueue(self, job: ScanJob) -> None:
+        if self._queue is None:
+            raise RuntimeError("Job service has not been started")
+        self._queue.put_nowait((PRIORITIES[job.priority], next(self._sequence), job.id))
+    
+    @staticmethod
+    def _scope_key(project_ids: Optional[List[str]]) -> Tuple[str, ...]:
+        return ("organization",) if project_ids is None else ("projects", *project_ids)
+    
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+            await self._run(job)
+    
+    async def _run(self, job: ScanJob) -> None:
+        """Scan a job's projects with bounded concurrency, recording each report"""
+        job.status = "running"
+        job.started_at = datetime.utcnow().isoformat()
+        service = self.compliance_service
+        try:
+            project_ids = job.project_ids
+            if project_ids is None:
+                if service.devops_client is None:
+                    raise RuntimeError("No Azure DevOps client configured")
+                project_ids = [project_id async for project_id in service.iter_project_ids()]
+                job.total = len(project_ids)
+            
+            max_reports = self._get_max_job_reports()
+            if job.project_ids is None and self._get_scan_processes() > 1:
+                await self._run_sharded(job, project_ids, max_reports)
+            else:
+                semaphore = asyncio.Semaphore(service.get_project_concurrency())
+                
+                async def scan(project_id: str) -> None:
+                    async with semaphore:
+                        try:
+                            report = await service.check_project_compliance(project_id)
+                            self._add_report(job, report, max_reports)
+                        except Exception as e:
+                            job.failed_projects[project_id] = str(e)
+                        job.completed += 1
+                
+                await asyncio.gather(*(scan(project_id) for project_id in project_ids))
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            self._active.pop(self._scope_key(job.project_ids), None)
+            self._done[job.id].set()
+    
+    async def _run_sharded(self, job: ScanJob, project_ids: List[str], max_reports: int) -> None:
+        """Scan projects on worker processes, recording each shard's checks as it completes"""
+        service = self.compliance_service
+        features = service.feature_manager.snapshot
+        async for shard, checks in self._get_scanner().scan_shards(project_ids):
+            by_project: Dict[str, List[ComplianceCheck]] = {project_id: [] for project_id in shard}
+            for check in checks:
+                by_project[check.project_id].append(check)
+            for project_id, project_checks in by_project.items():
+                # A project whose context could not be built fails, as in a local scan
+                failure = next((
+                    check for check in project_checks
+                    if check.rule_id == "project-context" and check.status == "error"
+                ), None)
+                if failure is not None:
+                    job.failed_projects[project_id] = failure.details.get("error", "")
+                else:
+                    report = service.record_project_checks(project_id, project_checks, features)
+                    self._add_report(job, report, max_reports)
+                job.completed += 1
+    
+    @staticmethod
+    def _add_report(job: ScanJob, report: ComplianceReport, max_reports: int) -> None:
+        job.statuses[report.project_id] = report.overall_status
+        if len(job.reports) < max_reports:
+            job.reports.append(report)
+        else:
+            job.reports_omitted += 1
+    
+    def _get_scanner(self) -> ShardedScanner:
+        """Get the process pool for organization scans, starting it on first use"""
+        if self._scanner is None:
+            client = self.compliance_service.devops_client
+            self._scanner = ShardedScanner(
+                processes=self._get_scan_processes(),
+                shard_size=self._get_scan_shard_size(),
+                organization_url=client.organization_url,
+                pat_token=client.pat_token,
+                plugin_package=self.compliance_service.plugin_package
+            )
+        return self._scanner
+    
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit"""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status not in ("queued", "running")
+        ]
+        for job_id in finished[:max(0, len(finished) - self._get_max_finished_jobs())]:
+            del self._jobs[job_id]
+            del self._done[job_id]
+    
+    def _get_worker_count(self) -> int:
+        """Get the number of jobs run at once"""
+        value = self.feature_manager.get_parameter('scan-jobs', 'workers')
+        return max(1, int(value)) if value else DEFAULT_WORKERS
+    
+    def _get_max_finished_jobs(self) -> int:
+        """Get the number of finished jobs kept for polling"""
+        value = self.feature_manager.get_parameter('scan-jobs', 'max_finished_jobs')
+        return max(0, int(value)) if value is not None else DEFAULT_MAX_FINISHED_JOBS
+    
+    def _get_max_job_reports(self) -> int:
+        """Get the number of full reports kept per job"""
+        value = self.feature_manager.get_parameter('scan-jobs', 'max_job_reports')
+        return max(0, int(value)) if value is not None else DEFAULT_MAX_JOB_REPORTS
+    
+    def _get_scan_processes(self) -> int:
+        """Get the number of worker processes organization scans run on"""
+        value = self.feature_manager.get_parameter('scan-jobs', 'scan_processes')
+        return max(1, int(value)) if value else DEFAULT_SCAN_PROCESSES
+    
+    def _get_scan_shard_size(self) -> int:
+        """Get the number of projects each worker process scans at a time"""
+        value = self.feature_manager.get_parameter('scan-jobs', 'scan_shard_size')
+        return max(1, int(value)) if value else DEFAULT_SHARD_SIZE
@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from ..core.compliance.notifications import (
+    DIGEST_INTERVALS,
+    NotificationDigest,
+    NotificationQueue,
+    NotificationSink
+)
+
+DEFAULT_FREQUENCY = "immediate"
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 1.0
+
+class NotificationService:
+    """Delivers queued notifications in digests, off the check path
+    
+    Checks only enqueue. With `immediate` frequency the dispatcher sends a
+    digest of whatever is pending as soon as something arrives; otherwise
+    it sends one digest per `hourly`, `daily` or `weekly` interval. A digest
+    the sink rejects is retried with exponential backoff, and after
+    `max_attempts` its notifications go back into the queue for the next
+    digest.
+    """
+    
+    def __init__(
+        self,
+        queue: NotificationQueue,
+        sink: NotificationSink,
+        frequency: str = DEFAULT_FREQUENCY,
+        channels: Optional[List[str]] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        if frequency not in DIGEST_INTERVALS:
+            raise ValueError(f"Unknown notification frequency: {frequency}")
+        self.queue = queue
+        self.sink = sink
+        self.frequency = frequency
+        self.interval = DIGEST_INTERVALS[frequency]
+        self.channels = list(channels or [])
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self._sleep = sleep
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Future] = None
+        self._lock = asyncio.Lock()
+        queue.on_enqueued = self._wakeup.set
+        self.reset_stats()
+    
+    def start(self) -> None:
+        """Start sending digests in the background"""
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the dispatcher, making one last attempt to send what is pending"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+            await self.flush(max_attempts=1)
+    
+    async def _run(self) -> None:
+        while True:
+            if self.interval:
+                await self._sleep(self.interval)
+            else:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+            failed_digests = self.failed_digests
+            try:
+                await self.flush()
+            except Exception as e:
+                # Keep the dispatcher alive; undelivered notifications stay queued
+                self.last_error = str(e)
+            if not self.interval and self.failed_digests > failed_digests:
+                # The requeued digest is retried after one more backoff step, not at once
+                await self._sleep(self.backoff_base * 2 ** (self.max_attempts - 1))
+    
+    async def flush(self, max_attempts: Optional[int] = None) -> int:
+        """Send everything pending as one digest and return how many notifications were delivered"""
+        async with self._lock:
+            notifications = self.queue.drain()
+            if not notifications:
+                return 0
+            for notification in notifications:
+                await notification.format()
+            digest = NotificationDigest(self.frequency, self.channels, notifications)
+            
+            attempts = max_attempts or self.max_attempts
+            for attempt in range(attempts):
+                try:
+                    await self.sink.send(digest)
+                    break
+                except Exception as e:
+                    self.last_error = str(e)
+                    if attempt + 1 < attempts:
+                        self.retries += 1
+                        await self._sleep(self.backoff_base * 2 ** attempt)
+            else:
+                self.failed_digests += 1
+                self.queue.requeue(notifications)
+                # Requeuing does not announce itself; wake the immediate dispatcher to retry
+                self._wakeup.set()
+                return 0
+            
+            self.digests_sent += 1
+            self.notifications_sent += len(notifications)
+            return len(notifications)
+    
+    def reset_stats(self) -> None:
+        """Reset delivery counters"""
+        self.digests_sent = 0
+        self.notifications_sent = 0
+        self.retries = 0
+        self.failed_digests = 0
+        self.last_error: Optional[str] = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue counters and digest delivery counters"""
+        return {
+            "frequency": self.frequency,
+            "queue": self.queue.get_stats(),
+            "digests_sent": self.digests_sent,
+            "notifications_sent": self.notifications_sent,
+            "retries": self.retries,
+            "failed_digests": self.failed_digests,
+            "last_error": self.last_error
+        }
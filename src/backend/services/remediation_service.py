@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from ..core.compliance.base_rules import AutoFixMixin
+from ..core.compliance.remediation import FixBudget, FixQueue
+from ..models.compliance import ComplianceCheck, FixPlan
+from .compliance_service import ComplianceService
+
+DEFAULT_WRITE_CONCURRENCY = 4
+
+class RemediationService:
+    """Applies approved fix plans in bulk, off the request path
+    
+    Checks only plan fixes. Whenever plans are approved, a background task
+    applies them, oldest first, as far as today's persistent budget allows,
+    with at most `write_concurrency` fixes in flight. Each fix is verified
+    by the rule's targeted re-read rather than a full re-check, and the
+    resulting check is recorded like any other. Plans left over once the
+    budget runs out stay approved for the next day.
+    """
+    
+    def __init__(
+        self,
+        compliance_service: ComplianceService,
+        fixes: FixQueue,
+        budget: FixBudget,
+        write_concurrency: int = DEFAULT_WRITE_CONCURRENCY
+    ):
+        self.compliance_service = compliance_service
+        self.fixes = fixes
+        self.budget = budget
+        self.write_concurrency = max(1, write_concurrency)
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Future] = None
+        self._lock = asyncio.Lock()
+        fixes.on_approved = self.wake
+        self.reset_stats()
+    
+    def start(self) -> None:
+        """Start applying approved plans in the background"""
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background worker; unapplied plans stay queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+    
+    def wake(self) -> None:
+        """Have the background worker apply approved plans now"""
+        self._wakeup.set()
+    
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self.apply()
+            except Exception as e:
+                # Keep the worker alive; the plans are retried on the next wakeup
+                self.last_error = str(e)
+    
+    async def apply(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Apply approved plans within today's budget and return what happened"""
+        async with self._lock:
+            plans = self.fixes.list(status="approved")
+            if limit is not None:
+                plans = plans[:limit]
+            granted = self.budget.reserve(len(plans))
+            deferred = len(plans) - granted
+            plans = plans[:granted]
+            rules = self._get_rules()
+            for plan in plans:
+                if plan.rule_id not in rules:
+                    plan.status, plan.error = "failed", f"Rule is not enabled: {plan.rule_id}"
+            runnable = [plan for plan in plans if plan.rule_id in rules]
+            # Plans that were never attempted do not count against the budget
+            self.budget.refund(len(plans) - len(runnable))
+            semaphore = asyncio.Semaphore(self.write_concurrency)
+            
+            async def run(plan: FixPlan) -> Optional[ComplianceCheck]:
+                async with semaphore:
+                    return await self._apply_plan(rules[plan.rule_id], plan)
+            
+            checks = [check for check in await asyncio.gather(*(run(plan) for plan in runnable)) if check]
+            self.compliance_service.record_checks(checks)
+            for project_id in {plan.project_id for plan in plans}:
+                self.compliance_service.invalidate_reports(project_id)
+            
+            applied = sum(1 for plan in plans if plan.status == "applied")
+            self.applied += applied
+            self.failed += len(plans) - applied
+            self.deferred += deferred
+            return {"applied": applied, "failed": len(plans) - applied, "deferred": deferred}
+    
+    async def _apply_plan(self, rule: AutoFixMixin, plan: FixPlan) -> Optional[ComplianceCheck]:
+        plan.applied_at = datetime.utcnow().isoformat()
+        try:
+            await rule.apply_plan(plan)
+            check = await rule.verify_plan(plan)
+        except Exception as e:
+            plan.status, plan.error = "failed", str(e)
+            return None
+        check.project_id = plan.project_id
+        check.repository = plan.repository
+        check.details["fix_plan"] = plan.id
+        if check.status == "passed":
+            plan.status = "applied"
+        else:
+            plan.status, plan.error = "failed", "The fix did not bring the repository into compliance"
+        return check
+    
+    def _get_rules(self) -> Dict[str, AutoFixMixin]:
+        return {
+            rule.rule.id: rule for rule in self.compliance_service.get_enabled_rules()
+            if isinstance(rule, AutoFixMixin)
+        }
+    
+    def reset_stats(self) -> None:
+        """Reset fix counters"""
+        self.applied = 0
+        self.failed = 0
+        self.deferred = 0
+        self.last_error: Optional[str] = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get plan counts, fix counters and today's budget"""
+        return {
+            "plans": self.fixes.get_stats(),
+            "applied": self.applied,
+            "failed": self.failed,
+            "deferred": self.deferred,
+            "budget": self.budget.get_stats(),
+            "last_error": self.last_error
+        }
+    
+    def get_plans(self, status: Optional[str] = None, project_id: Optional[str] = None) -> List[FixPlan]:
+        """Get queued plans, oldest first"""
+        return self.fixes.list(status, project_id)
@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+from dateutil import tz
+from ..core.features.feature_manager import FeatureManager
+from .compliance_service import ComplianceService
+from .job_service import BULK, JobService
+
+FREQUENCIES = {"hourly", "daily", "weekly"}
+DEFAULT_FREQUENCY = "daily"
+DEFAULT_TIME = "00:00"
+DEFAULT_TIMEZONE = "UTC"
+DEFAULT_WINDOW_MINUTES = 360
+DEFAULT_RETRY_SECONDS = 60
+MAX_RETRY_SECONDS = 3600
+DEFAULT_CHECKPOINT_PATH = Path(__file__).resolve().parents[1] / ".cache" / "scheduler_checkpoint.jsonl"
+
+Clock = Callable[[], datetime]
+Sleep = Callable[[float], Awaitable[None]]
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _run_id(run_start: datetime) -> str:
+    return run_start.astimezone(timezone.utc).isoformat()
+
+def _fraction(*parts: str) -> float:
+    """Map strings to a stable number in [0, 1)"""
+    digest = hashlib.sha256(":".join(parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+class ComplianceScheduler:
+    """Runs scheduled organization scans for the `compliance-scheduling` feature
+    
+    Each run starts at the configured time and spreads its projects across
+    `window_minutes`, every project at a jittered offset derived from the
+    project and the run, so the DevOps API sees a steady trickle instead of
+    a burst. With `shard_count` > 1 each backend instance only schedules the
+    projects hashed to its `shard_index`.
+    
+    Completed projects are appended to a checkpoint file; after a restart an
+    unfinished run resumes with the projects it has not scanned yet. Scans
+    go through the JobService at bulk priority, so interactive checks still
+    run first. A failed run is retried with exponential backoff, resuming
+    from its checkpoint.
+    """
+    
+    def __init__(
+        self,
+        compliance_service: ComplianceService,
+        job_service: JobService,
+        clock: Clock = _utcnow,
+        sleep: Sleep = asyncio.sleep
+    ):
+        self.compliance_service = compliance_service
+        self.job_service = job_service
+        self.feature_manager = FeatureManager()
+        self.clock = clock
+        self.sleep = sleep
+        self._task: Optional[asyncio.Future] = None
+        self.failures = 0
+        self.last_error: Optional[str] = None
+    
+    def start(self) -> None:
+        """Start scheduling in the background"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run_forever())
+    
+    async def stop(self) -> None:
+        """Stop scheduling; an interrupted run resumes from its checkpoint"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def run_forever(self) -> None:
+        """Resume an unfinished run, then run at every scheduled time"""
+        while True:
+            try:
+                now = self.clock()
+                run_start = self.get_run_start(now)
+                run_id, completed, finished = self._read_checkpoint()
+                if run_id != _run_id(run_start) or finished:
+                    # Only interrupted runs are resumed late; new runs start on time
+                    run_start = self.get_next_run_start(now)
+                    await self._sleep_until(run_start)
+                await self.run_once(run_start)
+                self.failures = 0
+            except Exception as e:
+                # Keep scheduling; the failed run resumes from its checkpoint after the backoff
+                self.failures += 1
+                self.last_error = str(e)
+                await self.sleep(self._get_retry_delay())
+    
+    async def run_once(self, run_start: datetime) -> int:
+        """Scan this shard's projects for one run, returning how many were scanned"""
+        run_id, completed, _ = self._read_checkpoint()
+        if run_id != _run_id(run_start):
+            completed = set()
+            self._start_checkpoint(run_start)
+        
+        project_ids = [
+            project_id async for project_id in self.compliance_service.iter_project_ids()
+        ]
+        plan = self.plan_run(run_start, [
+            project_id for project_id in project_ids if project_id not in completed
+        ])
+        
+        waiting = []
+        for scan_at, project_id in plan:
+            await self._sleep_until(scan_at)
+            job = self.job_service.submit([project_id], priority=BULK)
+            waiting.append(asyncio.ensure_future(self._complete(job.id, project_id)))
+        await asyncio.gather(*waiting)
+        self._append_checkpoint({"finished": True})
+        return len(plan)
+    
+    def plan_run(self, run_start: datetime, project_ids: List[str]) -> List[Tuple[datetime, str]]:
+        """Assign this shard's projects a jittered time within the run window"""
+        shard_count, shard_index = self._get_shard()
+        window = self._get_window().total_seconds()
+        run_id = _run_id(run_start)
+        plan = [
+            (run_start + timedelta(seconds=window * _fraction(run_id, project_id)), project_id)
+            for project_id in project_ids
+            if int(_fraction(project_id) * shard_count) == shard_index
+        ]
+        plan.sort()
+        return plan
+    
+    def get_run_start(self, now: datetime) -> datetime:
+        """Get the latest scheduled run start at or before `now`"""
+        frequency = self._get_frequency()
+        hour, minute = self._get_time()
+        local = now.astimezone(self._get_timezone())
+        if frequency == "hourly":
+            start = local.replace(minute=minute, second=0, microsecond=0)
+            if start > local:
+                start -= timedelta(hours=1)
+            return start
+        start = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if start > local:
+            start -= timedelta(days=1)
+        if frequency == "weekly":
+            # Weekly runs happen on Mondays
+            start -= timedelta(days=start.weekday())
+        return start
+    
+    def get_next_run_start(self, now: datetime) -> datetime:
+        """Get the first scheduled run start after `now`"""
+        start = self.get_run_start(now)
+        step = {
+            "hourly": timedelta(hours=1),
+            "daily": timedelta(days=1),
+            "weekly": timedelta(weeks=1)
+        }[self._get_frequency()]
+        return start + step
+    
+    async def _complete(self, job_id: str, project_id: str) -> None:
+        """Checkpoint a project once its scan job has succeeded"""
+        job = await self.job_service.wait(job_id)
+        if job.status == "completed" and project_id not in job.failed_projects:
+            self._append_checkpoint({"project_id": project_id})
+    
+    async def _sleep_until(self, moment: datetime) -> None:
+        delay = (moment - self.clock()).total_seconds()
+        if delay > 0:
+            await self.sleep(delay)
+    
+    def _get_checkpoint_path(self) -> Path:
+        value = self.feature_manager.get_parameter('compliance-scheduling', 'checkpoint_path')
+        return Path(value) if value else DEFAULT_CHECKPOINT_PATH
+    
+    def _read_checkpoint(self) -> Tuple[Optional[str], Set[str], bool]:
+        """Read the run id, completed projects and finished flag of the last run"""
+        run_id, completed, finished = None, set(), False
+        try:
+            with open(self._get_checkpoint_path(), 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    if 'run' in record:
+                        run_id = record['run']
+                    elif 'project_id' in record:
+                        completed.add(record['project_id'])
+                    elif record.get('finished'):
+                        finished = True
+        except OSError:
+            pass
+        return run_id, completed, finished
+    
+    def _start_checkpoint(self, run_start: datetime) -> None:
+        path = self._get_checkpoint_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(json.dumps({"run": _run_id(run_start)}) + "\n")
+    
+    def _append_checkpoint(self, record: dict) -> None:
+        with open(self._get_checkpoint_path(), 'a') as f:
+            f.write(json.dumps(record) + "\n")
+    
+    def _get_frequency(self) -> str:
+        value = self.feature_manager.get_parameter('compliance-scheduling', 'frequency')
+        frequency = value or DEFAULT_FREQUENCY
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unsupported schedule frequency: {frequency}")
+        return frequency
+    
+    def _get_time(self) -> Tuple[int, int]:
+        value = self.feature_manager.get_parameter('compliance-scheduling', 'time')
+        hour, minute = str(value or DEFAULT_TIME).split(":")
+        return int(hour), int(minute)
+    
+    def _get_timezone(self) -> tzinfo:
+        value = self.feature_manager.get_parameter('compliance-scheduling', 'timezone')
+        zone = tz.gettz(value or DEFAULT_TIMEZONE)
+        if zone is None:
+            raise ValueError(f"Unknown schedule timezone: {value}")
+        return zone
+    
+    def _get_window(self) -> timedelta:
+        value = self.feature_manager.get_parameter('compliance-scheduling', 'window_minutes')
+        return timedelta(minutes=float(value) if value is not None else DEFAULT_WINDOW_MINUTES)
+    
+    def _get_shard(self) -> Tuple[int, int]:
+        count = self.feature_manager.get_parameter('compliance-scheduling', 'shard_count')
+        index = self.feature_manager.get_parameter('compliance-scheduling', 'shard_index')
+        return max(1, int(count or 1)), int(index or 0)
+    
+    def _get_retry_delay(self) -> float:
+        value = self.feature_manager.get_parameter('compliance-scheduling', 'retry_seconds')
+        delay = float(value) if value is not None else DEFAULT_RETRY_SECONDS
+        return min(delay * 2 ** (self.failures - 1), MAX_RETRY_SECONDS)
@@ -0,0 +1,145 @@
+import asyncio
+import atexit
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..core.devops.client import DevOpsClient
+from ..models.compliance import ComplianceCheck, trusted_check
+from .compliance_service import PLUGIN_PACKAGE, ComplianceService
+
+DEFAULT_SHARD_SIZE = 25
+
+# Checks cross the process boundary as positional rows in this field order
+ROW_FIELDS = ("project_id", "repository", "rule_id", "status", "timestamp", "details", "reused")
+
+# Per-process state of a pool worker, set up once by _init_worker
+_worker: Dict[str, Any] = {}
+
+def encode_checks(checks: Iterable[ComplianceCheck]) -> bytes:
+    """Serialize checks into compact JSON rows"""
+    rows = [[getattr(check, field) for field in ROW_FIELDS] for check in checks]
+    return json.dumps(rows, separators=(",", ":"), default=str).encode()
+
+def decode_checks(payload: bytes) -> Iterator[ComplianceCheck]:
+    """Rebuild checks from rows without re-validating them"""
+    for row in json.loads(payload):
+        yield trusted_check(**dict(zip(ROW_FIELDS, row)))
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _init_worker(organization_url: Optional[str], pat_token: str, plugin_package: str) -> None:
+    """Build a warm ComplianceService and event loop in a pool process"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    client = DevOpsClient(organization_url, pat_token) if organization_url else DevOpsClient.from_env()
+    service = ComplianceService(devops_client=client, plugin_package=plugin_package)
+    if client is not None:
+        atexit.register(lambda: loop.run_until_complete(client.close()))
+    _worker.update(loop=loop, service=service)
+
+def _scan_shard(project_ids: List[str]) -> bytes:
+    """Scan a shard of projects in a pool process and return its checks as rows"""
+    service: ComplianceService = _worker["service"]
+    checks: List[ComplianceCheck] = []
+    
+    async def iter_project_ids() -> AsyncIterator[str]:
+        for project_id in project_ids:
+            yield project_id
+    
+    async def collect(check: ComplianceCheck) -> None:
+        checks.append(check)
+    
+    _worker["loop"].run_until_complete(service.scan_projects(iter_project_ids(), collect))
+    return encode_checks(checks)
+
+class ShardedScanner:
+    """Scans projects across a pool of processes
+    
+    One event loop tops out on CPU once tens of thousands of checks are being
+    built and validated, so projects are split into shards and scanned by
+    worker processes, each with its own warm PluginManager, ComplianceService
+    and DevOps connection pool. Checks come back as compact JSON rows and are
+    rebuilt in this process without validation.
+    """
+    
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        organization_url: Optional[str] = None,
+        pat_token: str = "",
+        plugin_package: str = PLUGIN_PACKAGE
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self._initargs = (organization_url, pat_token, plugin_package)
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def __enter__(self) -> "ShardedScanner":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, starting it on first use"""
+        if self._executor is None:
+            # Spawned rather than forked: workers must not inherit the caller's event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self._initargs
+            )
+        return self._executor
+    
+    def close(self) -> None:
+        """Shut the process pool down"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    async def scan(self, project_ids: Iterable[str]) -> AsyncIterator[ComplianceCheck]:
+        """Scan projects, yielding each shard's checks as soon as the shard completes"""
+        async for _, checks in self.scan_shards(project_ids):
+            for check in checks:
+                yield check
+    
+    async def scan_shards(
+        self,
+        project_ids: Iterable[str]
+    ) -> AsyncIterator[Tuple[List[str], List[ComplianceCheck]]]:
+        """Scan projects, yielding each shard's project ids and checks as the shard completes
+        
+        At most two shards per process are in flight, so a large organization
+        is not queued up front.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pending: Dict[asyncio.Future, List[str]] = {}
+        try:
+            shards = _chunks(project_ids, self.shard_size)
+            while True:
+                for shard in shards:
+                    pending[loop.run_in_executor(executor, _scan_shard, shard)] = shard
+                    if len(pending) >= self.processes * 2:
+                        break
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    shard = pending.pop(future)
+                    yield shard, list(decode_checks(future.result()))
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,236 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Optional, Set
+from ..core.compliance.prefetch import BRANCH_POLICIES, REPOSITORY
+from .compliance_service import ComplianceService
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+DEFAULT_MAX_DELAY_SECONDS = 30.0
+DEFAULT_DEDUPE_WINDOW = 10000
+
+# Service hook event types and the repository data kinds they change; None means all
+POLICY_EVENT_TYPES = {
+    "ms.vss-policy.policy-created",
+    "ms.vss-policy.policy-updated",
+    "ms.vss-policy.policy-deleted"
+}
+REPOSITORY_EVENT_TYPES = {"git.repo.created", "git.repo.renamed"}
+PUSH_EVENT_TYPE = "git.push"
+EMPTY_OBJECT_ID = "0" * 40
+
+class ServiceHookEvent:
+    """The repositories and data kinds an Azure DevOps service hook event touched"""
+    
+    __slots__ = ("id", "event_type", "project_id", "repositories", "kinds")
+    
+    def __init__(
+        self,
+        id: Optional[str],
+        event_type: str,
+        project_id: str,
+        repositories: Optional[FrozenSet[str]],
+        kinds: Optional[FrozenSet[str]]
+    ):
+        self.id = id
+        self.event_type = event_type
+        self.project_id = project_id
+        # Repository ids; None means every repository of the project
+        self.repositories = repositories
+        self.kinds = kinds
+
+def parse_event(payload: Dict[str, Any]) -> Optional[ServiceHookEvent]:
+    """Map a service hook payload to what it changed, or None if no rule cares"""
+    event_type = payload.get("eventType") or ""
+    resource = payload.get("resource") or {}
+    repository = resource.get("repository") or {}
+    project_id = (
+        ((payload.get("resourceContainers") or {}).get("project") or {}).get("id") or
+        (repository.get("project") or {}).get("id")
+    )
+    if not project_id:
+        return None
+    
+    if event_type in POLICY_EVENT_TYPES:
+        policy = resource.get("policy", resource)
+        scopes = (policy.get("settings") or {}).get("scope") or []
+        repository_ids = [scope.get("repositoryId") for scope in scopes]
+        # A policy without a repository scope applies to every repository
+        repositories = (
+            frozenset(repository_ids) if repository_ids and all(repository_ids) else None
+        )
+        kinds: Optional[FrozenSet[str]] = frozenset({BRANCH_POLICIES})
+    elif event_type in REPOSITORY_EVENT_TYPES and repository.get("id"):
+        repositories = frozenset({repository["id"]})
+        kinds = None
+    elif event_type == PUSH_EVENT_TYPE and repository.get("id"):
+        created = any(
+            update.get("oldObjectId") == EMPTY_OBJECT_ID and
+            (update.get("name") or "").startswith("refs/heads/")
+            for update in resource.get("refUpdates") or []
+        )
+        if not created:
+            return None
+        repositories = frozenset({repository["id"]})
+        kinds = frozenset({REPOSITORY, BRANCH_POLICIES})
+    else:
+        return None
+    return ServiceHookEvent(payload.get("id"), event_type, project_id, repositories, kinds)
+
+class PendingRecheck:
+    """Changes of one project merged while waiting for a burst to settle"""
+    
+    __slots__ = ("repositories", "kinds", "events", "latest", "deadline", "timer")
+    
+    def __init__(self, first_seen: float, max_delay: float):
+        self.repositories: Optional[Set[str]] = set()
+        self.kinds: Optional[Set[str]] = set()
+        self.events = 0
+        # Each event pushes the deadline back, but never past `latest`
+        self.latest = first_seen + max_delay
+        self.deadline = first_seen
+        self.timer: Optional[asyncio.Future] = None
+    
+    def merge(self, event: ServiceHookEvent) -> None:
+        if self.repositories is not None:
+            if event.repositories is None:
+                self.repositories = None
+            else:
+                self.repositories.update(event.repositories)
+        if self.kinds is not None:
+            if event.kinds is None:
+                self.kinds = None
+            else:
+                self.kinds.update(event.kinds)
+        self.events += 1
+
+class WebhookService:
+    """Turns Azure DevOps service hook events into targeted re-checks
+    
+    Events are merged per project until none has arrived for
+    `debounce_seconds`, or at most `max_delay_seconds` after the first, so
+    a burst of policy edits costs one re-check of the repositories and rules
+    it touched. Redelivered events are recognized by id and dropped.
+    Re-checks of a project run one at a time.
+    """
+    
+    def __init__(
+        self,
+        compliance_service: ComplianceService,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+        dedupe_window: int = DEFAULT_DEDUPE_WINDOW,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.compliance_service = compliance_service
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.dedupe_window = dedupe_window
+        self._clock = clock
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Dict[str, PendingRecheck] = {}
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self.reset_stats()
+    
+    def ingest(self, payload: Dict[str, Any]) -> str:
+        """Queue the re-check an event calls for: "queued", "duplicate" or "ignored" """
+        self.received += 1
+        event = parse_event(payload)
+        if event is None:
+            self.ignored += 1
+            return "ignored"
+        if event.id is not None:
+            if event.id in self._seen:
+                self.duplicates += 1
+                return "duplicate"
+            self._seen[event.id] = None
+            while len(self._seen) > self.dedupe_window:
+                self._seen.popitem(last=False)
+        
+        now = self._clock()
+        pending = self._pending.get(event.project_id)
+        if pending is None:
+            pending = self._pending[event.project_id] = PendingRecheck(now, self.max_delay_seconds)
+        else:
+            self.coalesced += 1
+        pending.merge(event)
+        pending.deadline = min(pending.latest, now + self.debounce_seconds)
+        if event.project_id not in self._tasks:
+            self._tasks[event.project_id] = asyncio.ensure_future(self._process(event.project_id))
+        return "queued"
+    
+    async def _process(self, project_id: str) -> None:
+        try:
+            while project_id in self._pending:
+                pending = self._pending[project_id]
+                delay = pending.deadline - self._clock()
+                if delay > 0:
+                    # flush() cancels the timer to run the re-check right away
+                    pending.timer = asyncio.ensure_future(asyncio.sleep(delay))
+                    await asyncio.wait({pending.timer})
+                    continue
+                del self._pending[project_id]
+                await self._recheck(project_id, pending)
+        finally:
+            self._tasks.pop(project_id, None)
+    
+    async def _recheck(self, project_id: str, pending: PendingRecheck) -> None:
+        try:
+            checks = await self.compliance_service.recheck_repositories(
+                project_id,
+                pending.repositories,
+                pending.kinds
+            )
+        except Exception as e:
+            # Keep serving events; the next scheduled scan covers what was missed
+            self.failures += 1
+            self.last_error = f"{project_id}: {e}"
+            return
+        self.rechecks += 1
+        self.checks += len(checks)
+    
+    async def flush(self) -> None:
+        """Run every pending re-check now and wait for all of them"""
+        for pending in self._pending.values():
+            pending.deadline = -math.inf
+            if pending.timer is not None:
+                pending.timer.cancel()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()))
+    
+    async def close(self) -> None:
+        """Drop pending re-checks and stop the running ones"""
+        for pending in self._pending.values():
+            if pending.timer is not None:
+                pending.timer.cancel()
+        self._pending.clear()
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def reset_stats(self) -> None:
+        """Reset event and re-check counters"""
+        self.received = 0
+        self.ignored = 0
+        self.duplicates = 0
+        self.coalesced = 0
+        self.rechecks = 0
+        self.checks = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get event and re-check counters"""
+        return {
+            "received": self.received,
+            "ignored": self.ignored,
+            "duplicates": self.duplicates,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+            "rechecks": self.rechecks,
+            "checks": self.checks,
+            "failures": self.failures,
+            "last_error": self.last_error
+        }
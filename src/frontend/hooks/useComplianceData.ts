@@ -40,7 +40,8 @@ export const useComplianceData = () => {
       }
 
       // Fetch compliance data from your backend API
-      const response = await fetch(`/api/v1/compliance/${projectId}`);
+      // Revalidate with the ETag; unchanged dashboards come back as an empty 304
+      const response = await fetch(`/api/v1/compliance/dashboard/${projectId}`, { cache: 'no-cache' });
       if (!response.ok) {
         throw new Error('Failed to fetch compliance data');
       }
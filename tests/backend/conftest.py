@@ -0,0 +1,87 @@
+import pytest
+from src.backend.core.devops.cache import ResponseCache
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.core.features.feature_manager import FeatureManager, FeatureFlag
+from src.backend.core.plugins.plugin_manager import PluginManager
+
+@pytest.fixture
+def feature_manager():
+    """Fresh FeatureManager singleton loaded from config/features.yaml"""
+    FeatureManager._instance = None
+    manager = FeatureManager()
+    yield manager
+    FeatureManager._instance = None
+
+@pytest.fixture
+def plugin_manager(tmp_path):
+    """Fresh, empty PluginManager singleton with a private manifest"""
+    PluginManager._instance = None
+    manager = PluginManager()
+    manager.manifest_path = tmp_path / "plugin_manifest.json"
+    yield manager
+    PluginManager._instance = None
+
+@pytest.fixture(autouse=True)
+def history_path(tmp_path, monkeypatch):
+    """Keep check history written by the app out of the source tree"""
+    path = tmp_path / "history"
+    monkeypatch.setenv("COMPLIANCEX_HISTORY_PATH", str(path))
+    return path
+
+@pytest.fixture
+def enable_feature(feature_manager):
+    """Enable a feature flag in memory without touching the config file"""
+    def enable(name: str, **parameters):
+        feature_manager.register_feature(FeatureFlag(
+            name=name,
+            enabled=True,
+            description=name,
+            parameters=parameters
+        ), persist=False)
+    return enable
+
+@pytest.fixture
+def register_rules(plugin_manager, feature_manager, enable_feature):
+    """Run only the given test rules, not the rules shipped in the plugin package"""
+    feature_manager.unregister_feature('branch-protection', persist=False)
+    
+    def register(*rules):
+        for rule in rules:
+            plugin_manager._plugins[rule.get_name()] = rule
+            enable_feature(rule.get_name())
+    return register
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+async def devops_server():
+    """Fake Azure DevOps with one protected and one unprotected repository"""
+    server = FakeDevOpsServer()
+    server.add_repository("project-a", "protected-repo")
+    server.add_repository("project-a", "open-repo", protected=False)
+    async with server:
+        yield server
+
+@pytest.fixture
+def clock():
+    """Fake clock driving the client's response cache"""
+    return FakeClock()
+
+@pytest.fixture
+async def devops_client(devops_server, clock):
+    """Client for the fake server with a small response cache on the fake clock"""
+    client = DevOpsClient(
+        devops_server.url,
+        backoff_base=0.001,
+        cache=ResponseCache(max_entries=2, ttl_seconds=10, clock=clock)
+    )
+    async with client:
+        yield client
@@ -0,0 +1,144 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from src.backend.api.main import app
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.plugins.plugin_manager import PluginManager, PluginManifestEntry
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.container import ServiceContainer
+from tests.backend.test_compliance_service import DelayedRule
+
+def test_service_is_built_once_per_application(feature_manager, plugin_manager, monkeypatch):
+    discoveries = []
+    original = PluginManager.discover_plugins
+    
+    def counting_discover_plugins(self, plugin_dir):
+        discoveries.append(plugin_dir)
+        return original(self, plugin_dir)
+    monkeypatch.setattr(PluginManager, "discover_plugins", counting_discover_plugins)
+    
+    with TestClient(app) as client:
+        for _ in range(3):
+            response = client.get("/api/v1/compliance/check/test-project")
+            assert response.status_code == 200
+        rules = client.get("/api/v1/compliance/rules").json()
+    
+    assert len(discoveries) == 1
+    assert [rule["id"] for rule in rules] == ["branch-protection"]
+
+def test_rules_endpoint_reports_plugins_that_fail_to_load(feature_manager, plugin_manager):
+    with TestClient(app) as client:
+        client.app.state.container.compliance_service.plugin_manager._pending["Broken Rule"] = PluginManifestEntry(
+            module="tests.backend.missing_rule_module",
+            class_name="BrokenRule",
+            name="Broken Rule",
+            rule_id="broken",
+            version="1.0.0",
+            bases=["src.backend.core.compliance.base_rules.ComplianceRulePlugin"]
+        )
+        response = client.get("/api/v1/compliance/rules")
+    
+    assert response.status_code == 200
+    rules = {rule["id"]: rule for rule in response.json()}
+    assert rules["branch-protection"]["enabled"] and rules["branch-protection"]["error"] is None
+    assert rules["broken"]["name"] == "Broken Rule"
+    assert not rules["broken"]["enabled"]
+    assert "missing_rule_module" in rules["broken"]["error"]
+
+def test_reload_endpoint_rediscovers_plugins(feature_manager, plugin_manager, monkeypatch):
+    monkeypatch.setenv("COMPLIANCEX_ADMIN_TOKEN", "secret")
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/compliance/plugins/reload",
+            headers={"X-Admin-Token": "secret"}
+        )
+        rule = plugin_manager.get_plugin("Branch Protection Rule")
+    
+    assert response.status_code == 200
+    assert response.json() == {"plugins": ["Branch Protection Rule"]}
+    assert rule.rule.id == "branch-protection"
+
+def test_reload_endpoint_requires_admin_token(feature_manager, plugin_manager, monkeypatch):
+    with TestClient(app) as client:
+        disabled = client.post("/api/v1/compliance/plugins/reload")
+        monkeypatch.setenv("COMPLIANCEX_ADMIN_TOKEN", "secret")
+        missing = client.post("/api/v1/compliance/plugins/reload")
+        wrong = client.post(
+            "/api/v1/compliance/plugins/reload",
+            headers={"X-Admin-Token": "guess"}
+        )
+    
+    assert disabled.status_code == 403
+    assert missing.status_code == 401
+    assert wrong.status_code == 401
+
+async def test_reload_does_not_disturb_in_flight_checks(plugin_manager, enable_feature):
+    container = ServiceContainer()
+    await container.startup()
+    slow_rule = DelayedRule("slow", 0.1)
+    plugin_manager._plugins[slow_rule.get_name()] = slow_rule
+    enable_feature(slow_rule.get_name())
+    
+    check = asyncio.ensure_future(
+        container.compliance_service.check_project_compliance("test-project")
+    )
+    await asyncio.sleep(0.01)
+    plugins = await container.reload_plugins()
+    report = await check
+    await container.shutdown()
+    
+    assert [result.rule_id for result in report.checks] == ["slow"]
+    assert report.checks[0].status == "passed"
+    assert plugins == ["Branch Protection Rule"]
+    assert plugin_manager.get_plugin("slow") is slow_rule
+
+def test_scan_endpoint_streams_ndjson_and_sse(feature_manager, plugin_manager, monkeypatch):
+    async def stream(self):
+        for index in range(2):
+            yield ComplianceCheck(
+                rule_id="rule",
+                status="passed",
+                details={},
+                timestamp="2025-10-10T00:00:00Z",
+                project_id=f"project-{index}"
+            )
+    monkeypatch.setattr(ComplianceService, "stream_organization_compliance", stream)
+    
+    with TestClient(app) as client:
+        app.state.container.compliance_service.devops_client = DevOpsClient("http://devops.invalid")
+        ndjson = client.get("/api/v1/compliance/scan")
+        sse = client.get("/api/v1/compliance/scan", params={"format": "sse"})
+    
+    lines = ndjson.text.splitlines()
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["project_id"] for line in lines] == ["project-0", "project-1"]
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.count("event: check") == 2
+    assert sse.text.endswith("event: end\ndata: {}\n\n")
+
+
+def test_scan_endpoint_requires_devops_connection(feature_manager, plugin_manager):
+    with TestClient(app) as client:
+        response = client.get("/api/v1/compliance/scan")
+    
+    assert response.status_code == 503
+
+def test_scan_jobs_can_be_submitted_and_polled(feature_manager, plugin_manager):
+    with TestClient(app) as client:
+        submitted = client.post("/api/v1/compliance/jobs", json={"project_ids": ["test-project"]})
+        job_id = submitted.json()["id"]
+        client.portal.call(app.state.container.job_service.wait, job_id)
+        status = client.get(f"/api/v1/compliance/jobs/{job_id}")
+        results = client.get(f"/api/v1/compliance/jobs/{job_id}/results")
+        missing = client.get("/api/v1/compliance/jobs/unknown")
+        organization = client.post("/api/v1/compliance/jobs", json={})
+    
+    assert submitted.status_code == 202
+    assert submitted.json()["priority"] == "interactive"
+    assert "reports" not in submitted.json()
+    assert status.json()["status"] == "completed"
+    assert [report["project_id"] for report in results.json()["reports"]] == ["test-project"]
+    assert results.json()["next_offset"] == 1
+    assert missing.status_code == 404
+    assert organization.status_code == 503
@@ -0,0 +1,52 @@
+import sys
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from tests.benchmarks import bench_suite
+from tests.benchmarks.synthetic import parse_distribution, populate_organization
+
+def test_synthetic_organization_is_reproducible():
+    distribution = parse_distribution("protected=2,partial=1,none=1")
+    first, second = FakeDevOpsServer(), FakeDevOpsServer()
+    
+    organization = populate_organization(first, 3, 40, distribution, seed=7)
+    populate_organization(second, 3, 40, distribution, seed=7)
+    
+    assert distribution == {"protected": 0.5, "partial": 0.25, "none": 0.25}
+    assert list(organization) == ["project-0", "project-1", "project-2"]
+    policy_counts = [
+        len(repository["policies"])
+        for project in first.projects.values()
+        for repository in project["repositories"].values()
+    ]
+    assert policy_counts == [
+        len(repository["policies"])
+        for project in second.projects.values()
+        for repository in project["repositories"].values()
+    ]
+    assert set(policy_counts) == {0, 1, 3}
+
+async def test_suite_runs_every_scenario(tmp_path, monkeypatch, feature_manager, plugin_manager):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    args = bench_suite.parse_args(["--projects", "2", "--repositories", "3", "--rules", "2", "--repeat", "1"])
+    bench_suite.prepare(tmp_path / "plugins", args.rules)
+    try:
+        results = await bench_suite.run_suite(args)
+    finally:
+        for name in [name for name in sys.modules if name.startswith(bench_suite.PACKAGE)]:
+            del sys.modules[name]
+    
+    assert list(results) == ["service", "engine", "api"]
+    for result in results.values():
+        assert result["checks"] == 2 * 3 * 2
+        assert result["p50_ms"] <= result["p99_ms"]
+        assert result["peak_memory_mb"] > 0
+
+def test_regressions_beyond_the_tolerance_are_reported():
+    baseline = {"results": {"service": {"checks_per_second": 1000.0, "p50_ms": 10.0, "p99_ms": 20.0}}}
+    results = {"service": {"checks_per_second": 700.0, "p50_ms": 10.5, "p99_ms": 30.0, "peak_memory_mb": 5.0}}
+    
+    regressions = bench_suite.compare(baseline, results, tolerance=0.2)
+    
+    assert regressions == [
+        "service checks_per_second: 1,000.0 -> 700.0 (-30%)",
+        "service p99_ms: 20.0 -> 30.0 (+50%)"
+    ]
@@ -0,0 +1,242 @@
+import asyncio
+import pytest
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict
+from src.backend.core.compliance.base_rules import ComplianceRuleBase
+from src.backend.core.compliance.history_store import HistoryStore
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.plugins.plugin_manager import PluginManifestEntry
+from src.backend.models.compliance import CHECK_STATUSES, ComplianceRule, ComplianceCheck, dump_json, trusted_check
+from src.backend.services.compliance_service import ComplianceService
+
+class DelayedRule(ComplianceRuleBase):
+    """Test rule that passes after sleeping for a fixed delay"""
+    
+    def __init__(self, rule_id: str, delay: float = 0.0):
+        super().__init__()
+        self.rule_id = rule_id
+        self.delay = delay
+        self.initialize({})
+    
+    def get_rule_definition(self) -> ComplianceRule:
+        return ComplianceRule(
+            id=self.rule_id,
+            name=self.rule_id,
+            description="Delayed test rule",
+            level="error"
+        )
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        self.started = asyncio.get_running_loop().time()
+        await asyncio.sleep(self.delay)
+        self.finished = asyncio.get_running_loop().time()
+        return ComplianceCheck(
+            rule_id=self.rule.id,
+            status="passed",
+            details={},
+            timestamp="2025-10-10T00:00:00Z"
+        )
+
+async def test_rules_run_concurrently_in_order(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', max_concurrency=4, rule_timeout_seconds=5)
+    rules = [DelayedRule("slow", 0.2), DelayedRule("fast", 0.0), DelayedRule("medium", 0.1)]
+    register_rules(*rules)
+    service = ComplianceService()
+    
+    report = await service.check_project_compliance("test-project")
+    
+    assert [check.rule_id for check in report.checks] == ["slow", "fast", "medium"]
+    assert report.overall_status == "passed"
+    # Every rule started before the slowest one finished
+    assert max(rule.started for rule in rules) < rules[0].finished
+
+async def test_rule_timeout_yields_error_check(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', max_concurrency=2, rule_timeout_seconds=0.05)
+    register_rules(DelayedRule("hung", 10.0), DelayedRule("ok", 0.0))
+    service = ComplianceService()
+    
+    report = await service.check_project_compliance("test-project")
+    
+    assert [check.status for check in report.checks] == ["error", "passed"]
+    assert report.checks[0].details["reason"] == "timeout"
+    assert report.overall_status == "error"
+
+class RepositoryRule(DelayedRule):
+    """Test rule that fails for repositories named in `failing`"""
+    
+    scope = "repository"
+    
+    def __init__(self, rule_id: str, failing=()):
+        super().__init__(rule_id)
+        self.failing = set(failing)
+        self.seen = []
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        repository = context['repository']
+        self.seen.append(repository)
+        return ComplianceCheck(
+            rule_id=self.rule.id,
+            status="failed" if repository in self.failing else "passed",
+            details={"project_name": context['project_name']},
+            timestamp="2025-10-10T00:00:00Z"
+        )
+
+async def test_repository_rules_fan_out(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', repository_concurrency=3, rule_timeout_seconds=5)
+    branch_rule = RepositoryRule("branches", failing={"repo-2"})
+    review_rule = RepositoryRule("reviews")
+    register_rules(DelayedRule("project-level"), branch_rule, review_rule)
+    service = ComplianceService()
+    repositories = [f"repo-{index}" for index in range(50)]
+    
+    async def build_context(project_id: str) -> Dict[str, Any]:
+        return {
+            "project_id": project_id,
+            "project_name": "Fan-out Project",
+            "repositories": repositories
+        }
+    service._build_project_context = build_context
+    
+    report = await service.check_project_compliance("test-project")
+    
+    assert len(report.checks) == 1 + 2 * len(repositories)
+    assert report.checks[0].repository is None
+    assert [check.repository for check in report.checks[1:5]] == ["repo-0", "repo-0", "repo-1", "repo-1"]
+    assert report.checks[1].details["project_name"] == "Fan-out Project"
+    assert sorted(branch_rule.seen) == sorted(repositories)
+    assert report.repositories["repo-2"] == "failed"
+    assert report.repositories["repo-3"] == "passed"
+    assert report.overall_status == "failed"
+
+async def test_unloadable_rule_is_reported_without_failing_the_check(
+    plugin_manager, register_rules, enable_feature
+):
+    register_rules(DelayedRule("ok", 0.0))
+    plugin_manager._pending["Broken Rule"] = PluginManifestEntry(
+        module="tests.backend.missing_rule_module",
+        class_name="BrokenRule",
+        name="Broken Rule",
+        rule_id="broken",
+        version="1.0.0",
+        bases=["src.backend.core.compliance.base_rules.ComplianceRulePlugin"]
+    )
+    enable_feature("Broken Rule")
+    service = ComplianceService()
+    
+    report = await service.check_project_compliance("test-project")
+    
+    statuses = {check.rule_id: check.status for check in report.checks}
+    assert statuses == {"ok": "passed", "broken": "error"}
+    assert "missing_rule_module" in report.checks[1].details["error"]
+    assert "Broken Rule" in plugin_manager._pending
+
+def fake_organization(service, project_count: int, repository_count: int):
+    """Serve synthetic projects and repositories without a DevOps client"""
+    async def iter_project_ids():
+        for index in range(project_count):
+            yield f"project-{index}"
+    
+    async def build_context(project_id: str) -> Dict[str, Any]:
+        return {
+            "project_id": project_id,
+            "project_name": project_id,
+            "repositories": [f"repo-{index}" for index in range(repository_count)]
+        }
+    # Never contacted; the organization scan only requires one to be configured
+    service.devops_client = DevOpsClient("http://devops.invalid")
+    service.iter_project_ids = iter_project_ids
+    service._build_project_context = build_context
+
+async def test_organization_scan_streams_every_check(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', project_concurrency=3, stream_buffer_size=5)
+    register_rules(DelayedRule("project-level"), RepositoryRule("branches", failing={"repo-1"}))
+    service = ComplianceService()
+    fake_organization(service, project_count=10, repository_count=4)
+    
+    checks = [check async for check in service.stream_organization_compliance()]
+    
+    assert len(checks) == 10 * (1 + 4)
+    assert {check.project_id for check in checks} == {f"project-{index}" for index in range(10)}
+    assert sum(1 for check in checks if check.status == "failed") == 10
+
+async def test_organization_scan_pauses_for_slow_consumers(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', project_concurrency=2, repository_concurrency=2, stream_buffer_size=3)
+    rule = RepositoryRule("branches")
+    register_rules(rule)
+    service = ComplianceService()
+    fake_organization(service, project_count=50, repository_count=20)
+    
+    stream = service.stream_organization_compliance()
+    await stream.__anext__()
+    await asyncio.sleep(0.05)
+    evaluated = len(rule.seen)
+    await stream.aclose()
+    
+    # Bounded by the buffer plus one in-flight check per worker
+    assert evaluated <= 3 + 1 + 2 * 2
+
+async def test_organization_scan_failure_ends_with_error_check(plugin_manager, register_rules):
+    register_rules(DelayedRule("project-level"))
+    service = ComplianceService()
+    fake_organization(service, project_count=3, repository_count=0)
+    
+    async def failing_project_ids():
+        yield "project-0"
+        raise RuntimeError("project listing failed")
+    service.iter_project_ids = failing_project_ids
+    
+    checks = [check async for check in service.stream_organization_compliance()]
+    
+    assert checks[-1].rule_id == "organization-scan"
+    assert checks[-1].status == "error"
+    assert checks[-1].details["error"] == "project listing failed"
+
+async def test_organization_scan_requires_devops_client(plugin_manager):
+    service = ComplianceService()
+    
+    with pytest.raises(RuntimeError):
+        await service.stream_organization_compliance().__anext__()
+
+def test_trusted_checks_match_validated_checks():
+    values = {
+        "rule_id": "".join(["branch-", "protection"]),
+        "status": "".join(["fail", "ed"]),
+        "details": {"missing_settings": ["required_reviewers"]},
+        "timestamp": "2025-10-10T00:00:00Z",
+        "repository": "repo-0"
+    }
+    
+    trusted = trusted_check(**values)
+    
+    assert trusted == ComplianceCheck(**values)
+    assert dump_json(trusted) == ComplianceCheck(**values).model_dump_json().encode()
+    assert trusted.status is CHECK_STATUSES["failed"]
+    assert trusted.rule_id is trusted_check(**values).rule_id
+    
+    every_field = {**values, "project_id": None, "reused": None}
+    assert trusted.model_dump(exclude_unset=True) == ComplianceCheck(**every_field).model_dump(exclude_unset=True)
+    trusted.project_id = "project-a"
+    assert trusted_check(**values).model_fields_set == set(every_field)
+
+async def test_history_is_appended_in_batches_off_the_event_loop(plugin_manager, register_rules, tmp_path):
+    register_rules(DelayedRule("rule", 0.0))
+    now = datetime(2025, 10, 10, 12, 0, tzinfo=timezone.utc)
+    history = HistoryStore(tmp_path / "history", clock=lambda: now)
+    appends = []
+    append = history.append
+    
+    def recording_append(checks):
+        appends.append((threading.current_thread(), len(checks)))
+        return append(checks)
+    history.append = recording_append
+    service = ComplianceService(history=history)
+    
+    await asyncio.gather(*(service.check_project_compliance(f"project-{index}") for index in range(10)))
+    await service.flush_history()
+    
+    assert sum(count for _, count in appends) == 10
+    assert len(appends) < 10
+    assert threading.main_thread() not in {thread for thread, _ in appends}
+    assert len(list(history.iter_records(now.date(), now.date()))) == 10
+    history.close()
@@ -0,0 +1,123 @@
+import pytest
+from src.backend.core.compliance.declarative import RulePlan, load_rule_definitions
+from src.backend.core.compliance.engine import RuleEngine
+from src.backend.core.compliance.prefetch import BRANCH_POLICIES
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.services.compliance_service import ComplianceService
+
+def definitions(*conditions, level="error"):
+    return load_rule_definitions({
+        "rules": {
+            "repository": [{
+                "rule": "test_rule",
+                "level": level,
+                "description": "Test rule",
+                "conditions": list(conditions)
+            }]
+        }
+    })
+
+def test_settings_example_rules_load():
+    loaded = load_rule_definitions("config/settings.example.yaml")
+    
+    assert {definition.category for definition in loaded} == {"repository", "pipeline", "security"}
+    engine = RuleEngine()
+    engine.register_definitions(loaded)
+    assert "require_2fa" in engine.rules
+    # Rules without conditions are registered but have nothing to evaluate
+    assert engine.compile().rules == []
+
+def test_shipped_rules_compile():
+    engine = RuleEngine()
+    engine.register_definitions(load_rule_definitions("config/rules.yaml"))
+    engine.rules["require_build_validation"].enabled = False
+    
+    plan = engine.compile()
+    
+    assert [rule.id for rule in plan.rules] == ["require_branch_protection", "require_code_review"]
+
+def test_plan_evaluates_columns_of_settings():
+    plan = RulePlan(definitions(
+        {"setting": "required_reviewers", "at_least": 2},
+        {"setting": "dismiss_stale_reviews", "equals": True}
+    ))
+    
+    results = plan.evaluate_rows([
+        {"required_reviewers": 2, "dismiss_stale_reviews": True},
+        {"required_reviewers": 1, "dismiss_stale_reviews": True},
+        {}
+    ])
+    
+    assert results == [[(), ("required_reviewers",), ("required_reviewers", "dismiss_stale_reviews")]]
+
+def test_shared_conditions_are_tested_once():
+    loaded = definitions({"setting": "require_pull_request", "equals": True})
+    loaded.append(loaded[0].model_copy(update={"rule": "other_rule"}))
+    
+    plan = RulePlan(loaded)
+    
+    assert len(plan.rules) == 2
+    assert len(plan._tests) == 1
+
+@pytest.mark.parametrize("condition", [
+    {"setting": "required_reviewers"},
+    {"setting": "required_reviewers", "at_least": 1, "at_most": 3},
+    {"setting": "no_such_setting", "equals": True}
+])
+def test_invalid_conditions_are_rejected(condition):
+    with pytest.raises(ValueError):
+        RulePlan(definitions(condition))
+
+def test_failing_warning_rules_report_warnings():
+    plan = RulePlan(definitions({"setting": "require_status_checks", "present": True}, level="warning"))
+    views = {
+        "protected": {BRANCH_POLICIES: FakeDevOpsServer.protected_policies("protected")},
+        "open": {BRANCH_POLICIES: []}
+    }
+    
+    checks = plan.evaluate("project-a", ["protected", "open", "missing"], views)
+    
+    assert [(check.repository, check.status) for check in checks] == [
+        ("protected", "passed"),
+        ("open", "warning"),
+        ("missing", "error")
+    ]
+    assert checks[1].details["missing_settings"] == ["require_status_checks"]
+    assert checks[0].project_id == "project-a"
+
+async def test_service_evaluates_plan_with_prefetched_data(
+    devops_server,
+    devops_client,
+    plugin_manager,
+    feature_manager,
+    enable_feature
+):
+    feature_manager.unregister_feature('branch-protection', persist=False)
+    enable_feature('declarative-rules', path="config/rules.yaml")
+    for index in range(6):
+        devops_server.add_repository("project-a", f"repo-{index}", protected=index % 2 == 0)
+    service = ComplianceService(devops_client=devops_client)
+    
+    report = await service.check_project_compliance("project-a")
+    
+    # Six repositories on top of the fixture's protected and open ones
+    assert len(report.checks) == 3 * 8
+    assert report.repositories == {
+        "protected-repo": "passed",
+        "open-repo": "failed",
+        **{f"repo-{index}": "passed" if index % 2 == 0 else "failed" for index in range(6)}
+    }
+    assert devops_server.request_counts["/project-a/_apis/policy/configurations"] == 1
+
+def test_relative_rules_path_is_resolved_against_the_repository(
+    plugin_manager,
+    enable_feature,
+    monkeypatch,
+    tmp_path
+):
+    enable_feature('declarative-rules', path="config/rules.yaml")
+    monkeypatch.chdir(tmp_path)
+    
+    service = ComplianceService()
+    
+    assert service.rule_plan is not None and service.rule_plan.rules
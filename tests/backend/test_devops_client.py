@@ -0,0 +1,131 @@
+import pytest
+from src.backend.core.devops.client import DevOpsClientError
+from src.backend.plugins.rules.branch_protection import BranchProtectionRule
+from src.backend.services.compliance_service import ComplianceService
+
+async def test_fresh_responses_are_served_from_cache(devops_server, devops_client):
+    first = await devops_client.list_repositories("project-a")
+    second = await devops_client.list_repositories("project-a")
+    
+    assert first == second
+    assert devops_server.total_requests == 1
+    assert devops_client.cache.get_stats()["hits"] == 1
+
+async def test_stale_responses_are_revalidated_with_etag(devops_server, devops_client, clock):
+    await devops_client.list_repositories("project-a")
+    clock.now += 60
+    repositories = await devops_client.list_repositories("project-a")
+    
+    assert len(repositories) == 2
+    assert devops_server.total_requests == 2
+    assert devops_server.not_modified_count == 1
+
+async def test_cache_evicts_least_recently_used(devops_client):
+    await devops_client.get_project("project-a")
+    await devops_client.list_repositories("project-a")
+    await devops_client.get_repository("project-a", "open-repo")
+    
+    assert devops_client.cache.get_stats()["entries"] == 2
+
+async def test_transient_failures_are_retried(devops_server, devops_client):
+    devops_server.fail_next(503, count=2)
+    
+    project = await devops_client.get_project("project-a")
+    
+    assert project["name"] == "project-a"
+    assert devops_client.retry_count == 2
+
+async def test_client_errors_are_not_retried(devops_client):
+    with pytest.raises(DevOpsClientError) as error:
+        await devops_client.get_project("missing")
+    
+    assert error.value.status == 404
+    assert devops_client.retry_count == 0
+
+async def test_branch_protection_rule_uses_shared_client(
+    devops_server,
+    devops_client,
+    plugin_manager,
+    enable_feature
+):
+    service = ComplianceService(devops_client=devops_client)
+    rule = plugin_manager.get_plugin("Branch Protection Rule")
+    enable_feature(rule.get_name())
+    
+    report = await service.check_project_compliance("project-a")
+    
+    assert rule.rule.id == "branch-protection"
+    assert rule.devops_client is devops_client
+    assert report.repositories == {"protected-repo": "passed", "open-repo": "failed"}
+    assert report.overall_status == "failed"
+
+async def test_writes_are_not_replayed_after_server_errors(devops_server, devops_client):
+    devops_server.fail_next(503)
+    
+    with pytest.raises(DevOpsClientError):
+        await devops_client.create_policy_configuration("project-a", {"settings": {}})
+    
+    assert devops_server.request_counts["/project-a/_apis/policy/configurations"] == 1
+
+async def test_writes_are_retried_when_throttled(devops_server, devops_client):
+    devops_server.fail_next(429, headers={"Retry-After": "0"})
+    repository = devops_server.projects["project-a"]["repositories"]["open-repo"]
+    
+    await devops_client.create_policy_configuration("project-a", {
+        "settings": {"scope": [{"repositoryId": repository["id"]}]}
+    })
+    
+    assert len(repository["policies"]) == 1
+
+async def test_auto_fix_converges_without_duplicate_policies(devops_server, devops_client):
+    repository = devops_server.add_repository(
+        "project-a",
+        "master-repo",
+        default_branch="refs/heads/master"
+    )
+    # Everything but the minimum reviewers policy is in place
+    repository["policies"] = repository["policies"][1:]
+    rule = BranchProtectionRule()
+    rule.initialize({})
+    rule.devops_client = devops_client
+    context = {"project_id": "project-a", "repository": "master-repo"}
+    
+    results = [await rule.execute_with_auto_fix(context) for _ in range(3)]
+    
+    assert [result.status for result in results] == ["passed"] * 3
+    assert results[0].details["auto_fixed"] is True
+    assert len(repository["policies"]) == 3
+    scope = repository["policies"][-1]["settings"]["scope"][0]
+    assert scope["refName"] == "refs/heads/master"
+
+async def test_auto_fix_skips_repositories_it_cannot_bring_to_compliance(devops_server, devops_client):
+    rule = BranchProtectionRule()
+    rule.initialize({})
+    rule.devops_client = devops_client
+    context = {"project_id": "project-a", "repository": "open-repo"}
+    
+    result = await rule.execute_with_auto_fix(context)
+    
+    assert result.status == "failed"
+    assert "auto_fixed" not in result.details
+    assert devops_server.projects["project-a"]["repositories"]["open-repo"]["policies"] == []
+
+async def test_large_projects_are_paged_and_permission_checks_chunked(devops_server, devops_client):
+    for index in range(45):
+        devops_server.add_repository("project-a", f"repo-{index}", protected=False)
+    devops_server.page_size = 10
+    devops_server.max_url_length = 2000
+    
+    repositories = await devops_client.list_repositories("project-a")
+    policies = await devops_client.list_project_policy_configurations("project-a")
+    tokens = [f"repoV2/project-a/{repository['id']}" for repository in repositories]
+    devops_server.permissions[tokens[-1]] = False
+    allowed = await devops_client.has_permissions("namespace", 2048, tokens)
+    
+    assert len(repositories) == 47
+    assert len({repository["id"] for repository in repositories}) == 47
+    # The protected repository has three policies, the rest none
+    assert len(policies) == 3
+    assert devops_server.request_counts["/project-a/_apis/git/repositories"] == 5
+    assert allowed == [True] * 46 + [False]
+    assert devops_server.request_counts["/_apis/permissions/namespace/2048"] == 3
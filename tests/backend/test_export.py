@@ -0,0 +1,129 @@
+import gzip
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from fastapi.testclient import TestClient
+from src.backend.api.main import app
+from src.backend.core.compliance.history_store import HistoryStore
+from src.backend.core.reporting.storage import LocalStorage
+from src.backend.models.compliance import ComplianceCheck, ExportRequest
+from src.backend.services.export_service import ExportService
+
+NOW = datetime(2026, 3, 31, 12, 0, tzinfo=timezone.utc)
+STATUSES = ("passed", "passed", "failed", "warning")
+
+def check(index: int, day: date) -> ComplianceCheck:
+    return ComplianceCheck(
+        rule_id=f"rule-{index % 3}",
+        status=STATUSES[index % len(STATUSES)],
+        details={},
+        timestamp=f"{day.isoformat()}T08:30:00",
+        repository=f"repo-<{index}>" if index % 5 else None,
+        project_id=f"project-{index % 2}"
+    )
+
+@pytest.fixture
+def history(tmp_path):
+    store = HistoryStore(tmp_path / "history", retention_days=30, clock=lambda: NOW)
+    yield store
+    store.close()
+
+@pytest.fixture
+def exports(history, tmp_path):
+    # Threads instead of spawned processes keep the test fast; render_rows is the same either way
+    executor = ThreadPoolExecutor(max_workers=2)
+    service = ExportService(history, LocalStorage(tmp_path / "exports"), batch_size=7, executor=executor)
+    yield service
+    executor.shutdown()
+
+def fill(history: HistoryStore, count: int) -> None:
+    today = NOW.date()
+    for age in (2, 1, 0):
+        history.append([check(index, today - timedelta(days=age)) for index in range(age, count, 3)])
+
+async def export(exports: ExportService, tmp_path, **request) -> bytes:
+    job = exports.submit(ExportRequest(**request))
+    job = await exports.wait(job.id)
+    assert job.status == "completed", job.error
+    assert (tmp_path / "exports" / job.name).stat().st_size == job.bytes_written
+    return gzip.decompress(b"".join([chunk async for chunk in exports.read(job)]))
+
+async def test_json_export_streams_every_check_in_batches(history, exports, tmp_path):
+    fill(history, 100)
+    
+    document = json.loads(await export(exports, tmp_path))
+    
+    assert len(document["checks"]) == 100
+    assert document["totals"] == {"passed": 50, "warning": 25, "failed": 25, "error": 0}
+    # Oldest day first
+    assert document["checks"][0] == {
+        "timestamp": "2026-03-29T08:30:00+00:00",
+        "project_id": "project-0",
+        "repository": "repo-<2>",
+        "rule_id": "rule-2",
+        "status": "failed"
+    }
+    assert exports.get_stats()["rows_exported"] == 100
+
+async def test_filtered_html_and_pdf_exports(history, exports, tmp_path):
+    fill(history, 200)
+    
+    html = (await export(exports, tmp_path, format="html", project_id="project-1", days=1)).decode()
+    pdf = await export(exports, tmp_path, format="pdf", rule_id="rule-2")
+    
+    assert html.startswith("<!DOCTYPE html>") and html.endswith("</html>\n")
+    # Every third check is today's, and half of those are project-1's
+    assert html.count("<tr class=") == 33
+    assert "repo-&lt;3&gt;" in html
+    assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+    # Pages also break between batches: 66 checks in ten batches of up to 7, and the title page
+    assert b"/Count 11" in pdf
+    startxref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    assert pdf[startxref:].startswith(b"xref\n")
+    assert pdf[int(pdf[startxref:].split(b"\n")[3][:10]):].startswith(b"1 0 obj")
+
+async def test_failed_export_leaves_no_file(history, exports, tmp_path):
+    fill(history, 20)
+    iter_records = history.iter_records
+    
+    def failing(*args):
+        yield from islice(iter_records(*args), 10)
+        raise OSError("disk full")
+    history.iter_records = failing
+    job = exports.submit(ExportRequest(format="json"))
+    job = await exports.wait(job.id)
+    
+    assert job.status == "failed"
+    assert job.error == "disk full"
+    assert job.checks == 7
+    assert list((tmp_path / "exports").iterdir()) == []
+    with pytest.raises(ValueError):
+        exports.read(job)
+
+def test_unsupported_format_is_rejected(history, tmp_path):
+    exports = ExportService(history, LocalStorage(tmp_path), formats=["json"])
+    
+    with pytest.raises(ValueError):
+        exports.submit(ExportRequest(format="pdf"))
+
+def test_export_endpoints(feature_manager, enable_feature, tmp_path):
+    enable_feature('reporting', formats=["json"], export_path=str(tmp_path / "exports"))
+    with TestClient(app) as client:
+        client.app.state.container.history.append([check(index, datetime.utcnow().date()) for index in range(10)])
+        unsupported = client.post("/api/v1/compliance/exports", json={"format": "pdf"})
+        submitted = client.post("/api/v1/compliance/exports", json={"format": "json", "project_id": "project-0"})
+        export_id = submitted.json()["id"]
+        client.portal.call(client.app.state.container.exports.wait, export_id)
+        job = client.get(f"/api/v1/compliance/exports/{export_id}").json()
+        download = client.get(f"/api/v1/compliance/exports/{export_id}/download")
+        missing = client.get("/api/v1/compliance/exports/unknown")
+    
+    assert unsupported.status_code == 400
+    assert submitted.status_code == 202
+    assert job["status"] == "completed" and job["checks"] == 5
+    assert download.headers["content-type"] == "application/json"
+    assert download.headers["content-encoding"] == "gzip"
+    assert len(download.json()["checks"]) == 5
+    assert missing.status_code == 404
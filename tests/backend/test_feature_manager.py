@@ -0,0 +1,132 @@
+import asyncio
+import os
+import pytest
+import yaml
+from src.backend.core.features.feature_manager import FeatureFlag, FeatureManager, FeatureOverride
+from src.backend.services.compliance_service import ComplianceService
+from tests.backend.test_compliance_service import DelayedRule
+
+CONFIG = """
+features:
+  auto-fix:
+    enabled: true
+    description: Fixes
+    parameters:
+      max_auto_fixes_per_day: 10
+    projects:
+      legacy:
+        enabled: false
+      pilot:
+        parameters:
+          max_auto_fixes_per_day: 50
+    rules:
+      branch-protection:
+        enabled: true
+  reporting:
+    enabled: false
+    description: Reports
+"""
+
+@pytest.fixture
+def features_path(tmp_path, monkeypatch):
+    """A private feature flag file, loaded by a fresh FeatureManager"""
+    path = tmp_path / "features.yaml"
+    path.write_text(CONFIG)
+    monkeypatch.setenv("COMPLIANCEX_FEATURES_PATH", str(path))
+    FeatureManager._instance = None
+    yield path
+    FeatureManager._instance = None
+
+def rewrite(path, text: str) -> None:
+    path.write_text(text)
+    # Make sure the change shows even on file systems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_overrides_resolve_by_project_then_rule(features_path):
+    features = FeatureManager().snapshot
+    
+    assert features.is_enabled('auto-fix')
+    assert not features.is_enabled('auto-fix', project_id="legacy")
+    # A rule override wins over a project override
+    assert features.is_enabled('auto-fix', project_id="legacy", rule_id="branch-protection")
+    assert features.get_parameter('auto-fix', 'max_auto_fixes_per_day', project_id="pilot") == 50
+    assert features.get_parameter('auto-fix', 'max_auto_fixes_per_day', project_id="other") == 10
+    assert features.get_parameter('auto-fix', 'max_auto_fixes_per_day', project_id="legacy") is None
+    assert features.has_project_overrides("legacy") and not features.has_project_overrides("other")
+    assert not features.is_enabled('reporting') and not features.is_enabled('missing', project_id="legacy")
+
+def test_reload_swaps_the_snapshot_and_keeps_old_ones_intact(features_path):
+    manager = FeatureManager()
+    before = manager.snapshot
+    
+    assert manager.reload() is False
+    rewrite(features_path, CONFIG.replace("enabled: false\n    description: Reports", "enabled: true\n    description: Reports"))
+    assert manager.reload() is True
+    
+    assert manager.is_enabled('reporting')
+    assert not before.is_enabled('reporting')
+    assert manager.snapshot.fingerprint != before.fingerprint
+
+async def test_watcher_reloads_changes_and_survives_bad_files(features_path):
+    manager = FeatureManager()
+    manager.start_watching(interval=0.01)
+    try:
+        rewrite(features_path, "features: [")
+        await asyncio.sleep(0.1)
+        assert manager.is_enabled('auto-fix')
+        assert manager.last_error is not None
+        
+        rewrite(features_path, "features: {}\n")
+        await asyncio.sleep(0.1)
+        assert not manager.is_enabled('auto-fix')
+    finally:
+        await manager.stop_watching()
+
+async def test_registered_features_are_written_atomically_in_the_background(features_path):
+    manager = FeatureManager()
+    manager.start_watching(interval=0.01)
+    try:
+        manager.register_feature(FeatureFlag(
+            name="exports",
+            enabled=True,
+            description="Exports",
+            rules={"rule-a": FeatureOverride(enabled=False)}
+        ))
+        # The swap is immediate; the write happens off the event loop
+        assert manager.is_enabled('exports') and not manager.is_enabled('exports', rule_id="rule-a")
+        manager.unregister_feature('reporting')
+        manager.register_feature(FeatureFlag(name="local", enabled=True, description="Local"), persist=False)
+        await manager.flush()
+        await asyncio.sleep(0.05)
+    finally:
+        await manager.stop_watching()
+    
+    config = yaml.safe_load(features_path.read_text())["features"]
+    assert config["exports"]["rules"] == {"rule-a": {"enabled": False}}
+    assert config["auto-fix"]["projects"]["pilot"] == {"parameters": {"max_auto_fixes_per_day": 50}}
+    assert "reporting" not in config
+    assert [path.name for path in features_path.parent.iterdir()] == ["features.yaml"]
+    # The watcher recognised its own write and kept the registered flags
+    assert manager.is_enabled('exports')
+    FeatureManager._instance = None
+    assert FeatureManager().snapshot.fingerprint == manager.snapshot.fingerprint
+
+async def test_project_overrides_select_rules_per_project(plugin_manager, register_rules, feature_manager):
+    register_rules(DelayedRule("everywhere"), DelayedRule("most"))
+    most = feature_manager.snapshot.features["most"]
+    feature_manager.register_feature(
+        most.model_copy(update={"projects": {"legacy": FeatureOverride(enabled=False)}}),
+        persist=False
+    )
+    service = ComplianceService()
+    in_flight = feature_manager.snapshot
+    
+    legacy = await service.check_project_compliance("legacy")
+    other = await service.check_project_compliance("other")
+    feature_manager.unregister_feature("everywhere", persist=False)
+    
+    assert [check.rule_id for check in legacy.checks] == ["everywhere"]
+    assert [check.rule_id for check in other.checks] == ["everywhere", "most"]
+    assert [rule.rule.id for rule in service.get_enabled_rules(in_flight, "other")] == ["everywhere", "most"]
+    assert [rule.rule.id for rule in service.get_enabled_rules()] == ["most"]
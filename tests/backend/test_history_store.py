@@ -0,0 +1,133 @@
+import pytest
+import threading
+from datetime import date, datetime, timedelta, timezone
+from src.backend.core.compliance.history_store import RECORD, HistoryStore
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+
+NOW = datetime(2026, 3, 31, 12, 0, tzinfo=timezone.utc)
+
+def check(day: date, project_id="project-a", rule_id="branch-protection", status="passed", repository="repo"):
+    return ComplianceCheck(
+        rule_id=rule_id,
+        status=status,
+        details={},
+        timestamp=f"{day.isoformat()}T08:30:00",
+        repository=repository,
+        project_id=project_id
+    )
+
+@pytest.fixture
+def history_clock():
+    now = {"value": NOW}
+    
+    def current() -> datetime:
+        return now["value"]
+    current.now = now
+    return current
+
+@pytest.fixture
+def store(tmp_path, history_clock):
+    history = HistoryStore(tmp_path / "history", retention_days=30, clock=history_clock)
+    yield history
+    history.close()
+
+def test_trend_counts_statuses_per_day(store):
+    today = NOW.date()
+    yesterday = today - timedelta(days=1)
+    store.append([
+        check(yesterday, status="failed"),
+        check(today),
+        check(today, project_id="project-b", status="failed"),
+        check(today, rule_id="other-rule", status="warning")
+    ])
+    
+    trend = store.trend(days=2)
+    
+    assert trend == [
+        {"date": yesterday.isoformat(), "passed": 0, "warning": 0, "failed": 1, "error": 0},
+        {"date": today.isoformat(), "passed": 1, "warning": 1, "failed": 1, "error": 0}
+    ]
+    assert store.trend(project_id="project-a", days=1)[0]["warning"] == 1
+    assert store.trend(project_id="project-a", rule_id="branch-protection", days=1)[0]["passed"] == 1
+    assert store.trend(rule_id="other-rule", days=1)[0]["warning"] == 1
+    assert store.trend(project_id="unknown", days=1)[0]["passed"] == 0
+
+def test_history_survives_a_restart(tmp_path, history_clock, store):
+    store.append([check(NOW.date()), check(NOW.date(), status="error", repository=None)])
+    store.close()
+    
+    reopened = HistoryStore(tmp_path / "history", retention_days=30, clock=history_clock)
+    records = list(reopened.iter_records(NOW.date(), NOW.date()))
+    reopened.close()
+    
+    assert reopened.trend(days=1)[0]["error"] == 1
+    assert records[1] == (
+        f"{NOW.date().isoformat()}T08:30:00+00:00",
+        "project-a",
+        None,
+        "branch-protection",
+        "error"
+    )
+
+def test_retention_drops_whole_segments(store, history_clock):
+    old = NOW.date() - timedelta(days=29)
+    store.append([check(old), check(NOW.date())])
+    assert store.get_days() == [old, NOW.date()]
+    
+    history_clock.now["value"] = NOW + timedelta(days=1)
+    dropped = store.enforce_retention()
+    
+    assert dropped == [old]
+    assert store.get_days() == [NOW.date()]
+    assert not (store.path / f"{old.isoformat()}.seg").exists()
+    # Checks already outside the retention period are not stored
+    assert store.append([check(old)]) == 0
+
+def test_partial_records_and_stale_summaries_are_recovered(tmp_path, history_clock, store):
+    store.append([check(NOW.date()), check(NOW.date(), status="failed")])
+    store.close()
+    segment = tmp_path / "history" / f"{NOW.date().isoformat()}.seg"
+    with open(segment, 'ab') as f:
+        # A record cut short by a crash
+        f.write(RECORD.pack(0, 0, 0, 0, 0)[:7])
+    (tmp_path / "history" / f"{NOW.date().isoformat()}.sum").write_text("{}")
+    
+    reopened = HistoryStore(tmp_path / "history", retention_days=30, clock=history_clock)
+    reopened.append([check(NOW.date(), status="warning")])
+    trend = reopened.trend(days=1)[0]
+    records = list(reopened.iter_records(NOW.date(), NOW.date(), rule_id="branch-protection"))
+    reopened.close()
+    
+    assert (trend["passed"], trend["failed"], trend["warning"]) == (1, 1, 1)
+    assert [record[4] for record in records] == ["passed", "failed", "warning"]
+
+def test_iteration_reads_only_what_was_stored_when_it_started(store):
+    today = NOW.date()
+    store.append([check(today, repository=f"repo-{index}") for index in range(100)])
+    
+    records = store.iter_records(today, today)
+    first = next(records)
+    # Appended from another thread while an export is reading, then half of one more record
+    appender = threading.Thread(target=store.append, args=([check(today, repository="late")] * 50,))
+    appender.start()
+    appender.join()
+    store.flush()
+    with open(store.path / f"{today.isoformat()}.seg", "ab") as f:
+        f.write(b"\0" * (RECORD.size // 2))
+    rest = list(records)
+    
+    assert [record[2] for record in [first] + rest] == [f"repo-{index}" for index in range(100)]
+    assert len(list(store.iter_records(today, today))) == 150
+
+async def test_project_checks_are_recorded(tmp_path, devops_server, devops_client, plugin_manager, feature_manager):
+    history = HistoryStore(tmp_path / "service-history")
+    service = ComplianceService(devops_client=devops_client, history=history)
+    
+    report = await service.check_project_compliance("project-a")
+    await service.flush_history()
+    point = history.trend(project_id="project-a", days=1)[0]
+    history.close()
+    
+    assert point["passed"] == point["failed"] == 1
+    assert len(report.checks) == 2
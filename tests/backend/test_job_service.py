@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from src.backend.core.compliance.history_store import HistoryStore
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.job_service import JobService
+from tests.backend.test_compliance_service import DelayedRule
+
+@pytest.fixture
+async def job_service(plugin_manager, feature_manager, enable_feature):
+    enable_feature('scan-jobs', workers=1)
+    service = JobService(ComplianceService())
+    await service.start()
+    yield service
+    await service.stop()
+
+def record_scans(job_service, monkeypatch, delay: float = 0.0):
+    """Make project checks sleep briefly and record the order they start in"""
+    started = []
+    original = ComplianceService.check_project_compliance
+    
+    async def check_project_compliance(self, project_id):
+        started.append(project_id)
+        await asyncio.sleep(delay)
+        return await original(self, project_id)
+    monkeypatch.setattr(ComplianceService, "check_project_compliance", check_project_compliance)
+    return started
+
+async def test_submitted_job_runs_in_background(job_service, plugin_manager, enable_feature):
+    rule = DelayedRule("rule", 0.0)
+    plugin_manager._plugins[rule.get_name()] = rule
+    enable_feature(rule.get_name())
+    
+    job = job_service.submit(["project-b", "project-a"])
+    
+    assert job.status == "queued"
+    assert job.priority == "bulk"
+    assert job.total == 2
+    
+    job = await job_service.wait(job.id)
+    
+    assert job.status == "completed"
+    assert job.completed == 2
+    assert sorted(report.project_id for report in job.reports) == ["project-a", "project-b"]
+
+async def test_duplicate_scopes_coalesce(job_service):
+    first = job_service.submit(["project-a", "project-b"])
+    second = job_service.submit(["project-b", "project-a"])
+    other = job_service.submit(["project-a"])
+    
+    assert second is first
+    assert other is not first
+
+async def test_interactive_jobs_run_ahead_of_bulk(job_service, monkeypatch):
+    started = record_scans(job_service, monkeypatch, delay=0.02)
+    running = job_service.submit(["bulk-1"], priority="bulk")
+    await asyncio.sleep(0)
+    queued = job_service.submit(["bulk-2"], priority="bulk")
+    interactive = job_service.submit(["interactive"])
+    
+    for job in (running, queued, interactive):
+        await job_service.wait(job.id)
+    
+    assert started == ["bulk-1", "interactive", "bulk-2"]
+
+async def test_resubmitting_interactively_promotes_a_queued_job(job_service, monkeypatch):
+    started = record_scans(job_service, monkeypatch, delay=0.02)
+    running = job_service.submit(["bulk-1"], priority="bulk")
+    await asyncio.sleep(0)
+    queued = job_service.submit(["bulk-2"], priority="bulk")
+    later = job_service.submit(["bulk-3"], priority="bulk")
+    promoted = job_service.submit(["bulk-3"], priority="interactive")
+    
+    for job in (running, queued, later):
+        await job_service.wait(job.id)
+    
+    assert promoted is later
+    assert started == ["bulk-1", "bulk-3", "bulk-2"]
+
+async def test_organization_job_fails_without_devops_client(job_service):
+    job = job_service.submit()
+    
+    job = await job_service.wait(job.id)
+    
+    assert job.scope == "organization"
+    assert job.status == "failed"
+    assert "No Azure DevOps client" in job.error
+
+async def test_jobs_keep_statuses_beyond_the_report_limit(job_service, plugin_manager, enable_feature):
+    enable_feature('scan-jobs', workers=1, max_job_reports=2)
+    rule = DelayedRule("rule", 0.0)
+    plugin_manager._plugins[rule.get_name()] = rule
+    enable_feature(rule.get_name())
+    
+    job = await job_service.wait(job_service.submit(["project-a", "project-b", "project-c"]).id)
+    
+    assert job.completed == 3
+    assert len(job.reports) == 2
+    assert job.reports_omitted == 1
+    assert job.statuses == dict.fromkeys(["project-a", "project-b", "project-c"], "passed")
+
+async def test_organization_jobs_run_on_worker_processes(
+    plugin_manager, feature_manager, enable_feature, monkeypatch, tmp_path
+):
+    monkeypatch.setenv("COMPLIANCEX_PLUGIN_MANIFEST", str(tmp_path / "plugin_manifest.json"))
+    enable_feature('scan-jobs', workers=1, scan_processes=2, scan_shard_size=2)
+    server = FakeDevOpsServer()
+    project_ids = [f"project-{index}" for index in range(5)]
+    for project_id in project_ids:
+        server.add_repository(project_id, "protected-repo")
+        server.add_repository(project_id, "open-repo", protected=False)
+    history = HistoryStore(tmp_path / "history")
+    
+    async with server:
+        async with DevOpsClient(server.url) as client:
+            service = ComplianceService(devops_client=client, history=history)
+            jobs = JobService(service)
+            await jobs.start()
+            try:
+                job = await jobs.wait(jobs.submit().id)
+            finally:
+                await jobs.stop()
+            await service.flush_history()
+    
+    assert job.status == "completed", job.error
+    assert job.completed == 5
+    assert job.statuses == dict.fromkeys(project_ids, "failed")
+    assert job.reports[0].repositories == {"protected-repo": "passed", "open-repo": "failed"}
+    # Merged checks go through the same recording path as local scans
+    today = datetime.utcnow().date()
+    assert len(list(history.iter_records(today - timedelta(days=1), today, project_id="project-3"))) == 2
+    cached = service.report_cache.get(("project-3", feature_manager.snapshot.fingerprint))
+    assert cached is not None and cached.overall_status == "failed"
+    history.close()
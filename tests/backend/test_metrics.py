@@ -0,0 +1,159 @@
+import itertools
+from contextlib import contextmanager
+from typing import Any, Dict
+from fastapi.testclient import TestClient
+from opentelemetry import trace
+from src.backend.api.main import app
+from src.backend.core.telemetry.metrics import REGISTRY, MetricsRegistry
+from src.backend.core.telemetry.tracing import Tracer
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+from tests.backend.test_compliance_service import DelayedRule, RepositoryRule
+
+SPAN_IDS = itertools.count(1)
+
+class FailingRule(DelayedRule):
+    """Test rule whose check raises"""
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        raise LookupError("no such branch")
+
+class RecordedSpan(trace.NonRecordingSpan):
+    """Span that remembers its name, parent and attributes"""
+    
+    def __init__(self, name: str, parent: Any, attributes: Dict[str, Any]):
+        super().__init__(trace.SpanContext(trace_id=1, span_id=next(SPAN_IDS), is_remote=False))
+        self.name = name
+        self.parent = parent if isinstance(parent, RecordedSpan) else None
+        self.attributes = dict(attributes or {})
+        self.ended = False
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def end(self, end_time=None) -> None:
+        self.ended = True
+
+class RecordingTracer(trace.Tracer):
+    """In-memory stand-in for an OpenTelemetry SDK tracer"""
+    
+    def __init__(self):
+        self.spans = []
+    
+    def start_span(self, name, context=None, kind=None, attributes=None, **kwargs):
+        span = RecordedSpan(name, trace.get_current_span(context), attributes)
+        self.spans.append(span)
+        return span
+    
+    @contextmanager
+    def start_as_current_span(self, name, context=None, kind=None, attributes=None, **kwargs):
+        span = self.start_span(name, context, attributes=attributes)
+        with trace.use_span(span, end_on_exit=True):
+            yield span
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, **labels) or 0.0
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+    
+    lines = registry.render().splitlines()
+    
+    assert lines[:3] == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a\\"b"} 3'
+    ]
+    assert lines[4:] == [
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 3.55",
+        "latency_seconds_count 3"
+    ]
+    assert registry.counter("requests_total", "Requests", ("path",)) is requests
+
+async def test_rule_durations_timeouts_and_errors_are_recorded(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', rule_timeout_seconds=0.05)
+    register_rules(DelayedRule("metrics-hung", 10.0), DelayedRule("metrics-ok"), FailingRule("metrics-failing"))
+    before = {
+        "ok": sample("compliancex_rule_duration_seconds_count", rule="metrics-ok"),
+        "timeouts": sample("compliancex_rule_timeouts_total", rule="metrics-hung"),
+        "errors": sample("compliancex_rule_checks_total", rule="metrics-failing", status="error"),
+        "exceptions": sample("compliancex_rule_exceptions_total", rule="metrics-failing", exception="LookupError")
+    }
+    
+    await ComplianceService().check_project_compliance("test-project")
+    
+    assert sample("compliancex_rule_duration_seconds_count", rule="metrics-ok") == before["ok"] + 1
+    assert sample("compliancex_rule_duration_seconds_sum", rule="metrics-hung") >= 0.05
+    assert sample("compliancex_rule_timeouts_total", rule="metrics-hung") == before["timeouts"] + 1
+    assert sample("compliancex_rule_checks_total", rule="metrics-failing", status="error") == before["errors"] + 1
+    assert sample(
+        "compliancex_rule_exceptions_total",
+        rule="metrics-failing",
+        exception="LookupError"
+    ) == before["exceptions"] + 1
+
+async def test_devops_requests_are_counted(devops_client):
+    before = sample("compliancex_devops_requests_total", method="GET", status="200")
+    
+    await devops_client.list_repositories("project-a")
+    await devops_client.get_project("project-a")
+    
+    assert sample("compliancex_devops_requests_total", method="GET", status="200") == before + 2
+    assert sample("compliancex_devops_request_duration_seconds_count", method="GET") >= 2
+
+async def test_spans_nest_project_repository_and_rule(plugin_manager, register_rules, enable_feature):
+    enable_feature('rule-execution', repository_concurrency=3)
+    register_rules(DelayedRule("traced-project"), RepositoryRule("traced-a"), RepositoryRule("traced-b"))
+    service = ComplianceService()
+    service.tracer = Tracer(enabled=True)
+    service.tracer._tracer = recorder = RecordingTracer()
+    
+    async def build_context(project_id: str) -> Dict[str, Any]:
+        return {"project_id": project_id, "project_name": "", "repositories": ["repo-0", "repo-1"]}
+    service._build_project_context = build_context
+    
+    await service.check_project_compliance("test-project")
+    
+    by_name: Dict[str, list] = {}
+    for span in recorder.spans:
+        by_name.setdefault(span.name, []).append(span)
+    [project] = by_name["compliance.project"]
+    repositories = by_name["compliance.repository"]
+    rules = by_name["compliance.rule"]
+    assert sorted(span.attributes["repository"] for span in repositories) == ["repo-0", "repo-1"]
+    assert all(span.parent is project for span in repositories)
+    assert len(rules) == 5
+    for span in rules:
+        parent = span.parent
+        if span.attributes["rule_id"] == "traced-project":
+            assert parent is project
+        else:
+            assert parent.attributes["repository"] == span.attributes["repository"]
+        assert span.attributes["status"] == "passed"
+    assert all(span.ended for span in recorder.spans)
+
+def test_tracing_is_off_by_default(feature_manager, plugin_manager):
+    assert ComplianceService().tracer.enabled is False
+
+def test_metrics_endpoint_exports_caches(feature_manager, plugin_manager):
+    with TestClient(app) as client:
+        client.get("/api/v1/compliance/check/test-project")
+        response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'compliancex_cache_misses_total{cache="reports"} 1' in response.text
+    assert "# TYPE compliancex_rule_duration_seconds histogram" in response.text
+    # The collector goes away with the application's services
+    assert REGISTRY.get_sample_value("compliancex_cache_entries", cache="reports") is None
@@ -0,0 +1,179 @@
+import asyncio
+import json
+from typing import Any, Dict
+from src.backend.core.compliance.base_rules import NotifiableRule
+from src.backend.core.compliance.notifications import LocalSink, NotificationQueue, NotificationSink
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.notification_service import NotificationService
+from tests.backend.test_compliance_service import RepositoryRule
+
+class NotifyingRule(RepositoryRule, NotifiableRule):
+    """Test repository rule that notifies about its failures"""
+    
+    async def should_notify(self, check_result: ComplianceCheck) -> bool:
+        return check_result.status == "failed"
+    
+    async def get_notification_message(self, check_result: ComplianceCheck) -> str:
+        return f"{self.rule.id} failed"
+
+class BlockedSink(NotificationSink):
+    """Sink that holds every delivery until released"""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.digests = []
+    
+    async def send(self, digest) -> None:
+        await self.release.wait()
+        self.digests.append(digest.to_dict())
+
+class FlakySink(LocalSink):
+    """Local sink that fails a number of deliveries first"""
+    
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+    
+    async def send(self, digest) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("SMTP relay unavailable")
+        await super().send(digest)
+
+def failed_check(rule_id: str) -> ComplianceCheck:
+    return ComplianceCheck(rule_id=rule_id, status="failed", details={}, timestamp="2025-10-10T00:00:00Z")
+
+def make_rules(count: int):
+    return [NotifyingRule(f"notify-{index}") for index in range(count)]
+
+async def test_checks_do_not_wait_for_delivery(plugin_manager, register_rules, enable_feature):
+    enable_feature('notifications')
+    rule = NotifyingRule("notify-branches", failing={"repo-0", "repo-1"})
+    register_rules(rule)
+    queue = NotificationQueue()
+    sink = BlockedSink()
+    dispatcher = NotificationService(queue, sink)
+    service = ComplianceService(notifications=queue)
+    
+    async def build_context(project_id: str) -> Dict[str, Any]:
+        return {"project_id": project_id, "project_name": "", "repositories": ["repo-0", "repo-1", "repo-2"]}
+    service._build_project_context = build_context
+    
+    dispatcher.start()
+    try:
+        report = await asyncio.wait_for(service.check_project_compliance("test-project"), 1.0)
+        await asyncio.sleep(0)
+        assert sink.digests == []
+        assert [check.details.get("notification_queued") for check in report.checks] == [True, True, None]
+        sink.release.set()
+        await asyncio.sleep(0.01)
+    finally:
+        await dispatcher.stop()
+    
+    [digest] = sink.digests
+    [notification] = digest["notifications"]
+    assert notification["repositories"] == ["repo-0", "repo-1"]
+    assert notification["message"] == "notify-branches failed"
+    assert notification["count"] == 2
+    assert dispatcher.get_stats()["queue"]["deduplicated"] == 1
+
+async def test_failed_digests_are_retried_with_backoff():
+    queue = NotificationQueue()
+    sleeps = []
+    
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+    sink = FlakySink(failures=2)
+    dispatcher = NotificationService(queue, sink, max_attempts=3, backoff_base=0.5, sleep=sleep)
+    [rule] = make_rules(1)
+    queue.enqueue(rule, "project-a", "repo-0", failed_check(rule.rule.id))
+    
+    assert await dispatcher.flush() == 1
+    assert sleeps == [0.5, 1.0]
+    assert dispatcher.get_stats()["retries"] == 2
+    assert len(sink.digests) == 1
+
+async def test_undelivered_notifications_go_back_into_the_queue():
+    queue = NotificationQueue()
+    
+    async def sleep(seconds: float) -> None:
+        pass
+    sink = FlakySink(failures=2)
+    dispatcher = NotificationService(queue, sink, frequency="daily", max_attempts=2, sleep=sleep)
+    first, second = make_rules(2)
+    queue.enqueue(first, "project-a", "repo-0", failed_check(first.rule.id))
+    
+    assert await dispatcher.flush() == 0
+    queue.enqueue(second, "project-a", "repo-0", failed_check(second.rule.id))
+    queue.enqueue(first, "project-a", "repo-1", failed_check(first.rule.id))
+    assert await dispatcher.flush() == 2
+    
+    [digest] = sink.digests
+    assert digest["frequency"] == "daily"
+    assert [(entry["rule_id"], entry["repositories"]) for entry in digest["notifications"]] == [
+        ("notify-0", ["repo-0", "repo-1"]),
+        ("notify-1", ["repo-0"])
+    ]
+    assert dispatcher.failed_digests == 1
+
+def test_queue_keeps_only_the_newest_projects_and_rules():
+    queue = NotificationQueue(max_pending=2)
+    [rule] = make_rules(1)
+    
+    for project_id in ("project-a", "project-b", "project-c", "project-c"):
+        queue.enqueue(rule, project_id, None, failed_check(rule.rule.id))
+    
+    assert [notification.project_id for notification in queue.drain()] == ["project-b", "project-c"]
+    assert queue.get_stats() == {"pending": 0, "enqueued": 4, "deduplicated": 1, "dropped": 1}
+
+async def test_local_sink_digests_a_burst(tmp_path):
+    queue = NotificationQueue()
+    sink = LocalSink(tmp_path / "notifications.jsonl")
+    dispatcher = NotificationService(queue, sink, channels=["email"])
+    rules = make_rules(4)
+    
+    for index in range(10000):
+        rule = rules[index % len(rules)]
+        queue.enqueue(rule, f"project-{index // 200}", f"repo-{index % 7}", failed_check(rule.rule.id))
+    delivered = await dispatcher.flush()
+    
+    assert delivered == 200
+    [line] = (tmp_path / "notifications.jsonl").read_text().splitlines()
+    digest = json.loads(line)
+    assert digest["channels"] == ["email"]
+    assert len(digest["notifications"]) == 200
+    assert sum(entry["count"] for entry in digest["notifications"]) == 10000
+
+async def test_dispatcher_waits_on_injected_sleep_and_retries_requeued_digests():
+    sleeps = []
+    
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        await asyncio.sleep(0)
+    [rule] = make_rules(1)
+    
+    queue = NotificationQueue()
+    sink = FlakySink(failures=2)
+    immediate = NotificationService(queue, sink, max_attempts=1, backoff_base=0.5, sleep=sleep)
+    immediate.start()
+    queue.enqueue(rule, "project-a", "repo-0", failed_check(rule.rule.id))
+    while not sink.digests:
+        await asyncio.sleep(0)
+    await immediate.stop()
+    
+    # Both failed digests were requeued and retried without another enqueue
+    assert immediate.failed_digests == 2
+    assert sleeps == [0.5, 0.5]
+    
+    sleeps.clear()
+    queue = NotificationQueue()
+    sink = FlakySink(failures=0)
+    hourly = NotificationService(queue, sink, frequency="hourly", sleep=sleep)
+    queue.enqueue(rule, "project-a", "repo-0", failed_check(rule.rule.id))
+    hourly.start()
+    while not sink.digests:
+        await asyncio.sleep(0)
+    await hourly.stop()
+    
+    assert sleeps[0] == 3600
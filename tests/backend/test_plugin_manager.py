@@ -0,0 +1,129 @@
+import sys
+import pytest
+from src.backend.core.compliance.base_rules import ComplianceRulePlugin
+from src.backend.core.plugins.plugin_manager import PluginLoadError, PluginManager
+from tests.benchmarks.synthetic import write_rule_package
+
+@pytest.fixture
+def rule_package(tmp_path, monkeypatch, request):
+    """A fresh synthetic plugin package importable from tmp_path"""
+    package = f"synthetic_rules_{request.node.name}"
+    package_dir = write_rule_package(tmp_path / "plugins", package, 3)
+    monkeypatch.syspath_prepend(str(tmp_path / "plugins"))
+    yield package, package_dir
+    for name in [name for name in sys.modules if name.startswith(package)]:
+        del sys.modules[name]
+
+def forget_modules(package: str) -> None:
+    for name in [name for name in sys.modules if name.startswith(f"{package}.")]:
+        del sys.modules[name]
+
+def fresh_manager(manifest_path) -> PluginManager:
+    PluginManager._instance = None
+    manager = PluginManager()
+    manager.manifest_path = manifest_path
+    return manager
+
+def test_cold_discovery_writes_manifest(plugin_manager, rule_package):
+    package, _ = rule_package
+    
+    plugin_manager.discover_plugins(package)
+    
+    names = plugin_manager.get_plugin_names_by_type(ComplianceRulePlugin)
+    assert sorted(names) == ["Synthetic Rule 0", "Synthetic Rule 1", "Synthetic Rule 2"]
+    assert plugin_manager.manifest_path.exists()
+
+def test_warm_discovery_defers_imports_until_first_use(plugin_manager, rule_package):
+    package, _ = rule_package
+    plugin_manager.discover_plugins(package)
+    forget_modules(package)
+    
+    manager = fresh_manager(plugin_manager.manifest_path)
+    manager.discover_plugins(package)
+    
+    assert len(manager.get_plugin_names_by_type(ComplianceRulePlugin)) == 3
+    assert f"{package}.synthetic_rule_1" not in sys.modules
+    
+    rule = manager.get_plugin("Synthetic Rule 1")
+    
+    assert rule.rule.id == "synthetic-1"
+    assert f"{package}.synthetic_rule_1" in sys.modules
+    assert f"{package}.synthetic_rule_2" not in sys.modules
+
+def test_changed_module_is_reimported(plugin_manager, rule_package):
+    package, package_dir = rule_package
+    plugin_manager.discover_plugins(package)
+    forget_modules(package)
+    module_path = package_dir / "synthetic_rule_0.py"
+    module_path.write_text(module_path.read_text().replace("Synthetic Rule 0", "Renamed Rule"))
+    
+    manager = fresh_manager(plugin_manager.manifest_path)
+    manager.discover_plugins(package)
+    
+    assert "Renamed Rule" in manager.get_plugin_names()
+    assert "Synthetic Rule 0" not in manager.get_plugin_names()
+    assert f"{package}.synthetic_rule_0" in sys.modules
+    assert f"{package}.synthetic_rule_1" not in sys.modules
+
+def test_rediscovery_keeps_loading_lazy(plugin_manager, rule_package):
+    package, package_dir = rule_package
+    plugin_manager.discover_plugins(package)
+    old_rule = plugin_manager.get_plugin("Synthetic Rule 1")
+    module_path = package_dir / "synthetic_rule_2.py"
+    module_path.write_text(module_path.read_text().replace("Synthetic Rule 2", "Renamed Rule"))
+    
+    entries = plugin_manager.rediscover_plugins(package)
+    plugin_manager.replace_plugins(package, entries)
+    
+    assert sorted(entries) == ["Renamed Rule", "Synthetic Rule 0", "Synthetic Rule 1"]
+    assert f"{package}.synthetic_rule_1" not in sys.modules
+    assert plugin_manager.get_plugin("Synthetic Rule 1") is not old_rule
+    
+    manager = fresh_manager(plugin_manager.manifest_path)
+    forget_modules(package)
+    manager.discover_plugins(package)
+    
+    assert f"{package}.synthetic_rule_2" not in sys.modules
+    assert "Renamed Rule" in manager.get_plugin_names()
+
+def test_failed_load_stays_pending_until_fixed(plugin_manager, rule_package):
+    package, package_dir = rule_package
+    plugin_manager.discover_plugins(package)
+    forget_modules(package)
+    module_path = package_dir / "synthetic_rule_1.py"
+    source = module_path.read_text()
+    module_path.write_text(source + "\nraise ImportError('broken')\n")
+    
+    with pytest.raises(PluginLoadError):
+        plugin_manager.get_plugin("Synthetic Rule 1")
+    
+    module_path.write_text(source)
+    
+    assert plugin_manager.get_plugin("Synthetic Rule 1").rule.id == "synthetic-1"
+    assert plugin_manager.get_plugin("Synthetic Rule 0").rule.id == "synthetic-0"
+
+def test_unwritable_manifest_does_not_break_discovery(plugin_manager, rule_package, tmp_path):
+    package, _ = rule_package
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    plugin_manager.manifest_path = blocker / "plugin_manifest.json"
+    
+    plugin_manager.discover_plugins(package)
+    
+    assert len(plugin_manager.get_plugin_names()) == 3
+    assert not plugin_manager.manifest_path.exists()
+
+def test_manifest_write_leaves_no_temporary_files(plugin_manager, rule_package):
+    package, _ = rule_package
+    
+    plugin_manager.discover_plugins(package)
+    
+    manifest_path = plugin_manager.manifest_path
+    assert [path.name for path in manifest_path.parent.glob(f"{manifest_path.name}*")] == [
+        manifest_path.name
+    ]
+
+def test_abstract_and_imported_classes_are_not_plugins(plugin_manager):
+    plugin_manager.discover_plugins("src.backend.plugins.rules")
+    
+    assert plugin_manager.get_plugin_names() == ["Branch Protection Rule"]
@@ -0,0 +1,98 @@
+import pytest
+from typing import Any, Dict
+from src.backend.core.compliance.base_rules import ComplianceRuleBase
+from src.backend.core.compliance.prefetch import (
+    BRANCH_POLICIES,
+    EDIT_POLICIES,
+    REPOSITORY,
+    RepositoryDataPlanner
+)
+from src.backend.models.compliance import ComplianceRule, ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+
+class DataRule(ComplianceRuleBase):
+    """Test rule that records the data it is handed for each repository"""
+    
+    scope = "repository"
+    
+    def __init__(self, rule_id: str, requires):
+        super().__init__()
+        self.rule_id = rule_id
+        self.requires = tuple(requires)
+        self.seen: Dict[str, Dict[str, Any]] = {}
+        self.initialize({})
+    
+    def get_rule_definition(self) -> ComplianceRule:
+        return ComplianceRule(
+            id=self.rule_id,
+            name=self.rule_id,
+            description="Data test rule",
+            level="warning"
+        )
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        self.seen[context['repository']] = {
+            kind: await self.get_data(context, kind) for kind in self.requires
+        }
+        return ComplianceCheck(
+            rule_id=self.rule.id,
+            status="passed",
+            details={},
+            timestamp="2025-10-10T00:00:00Z"
+        )
+
+@pytest.fixture
+def many_repositories(devops_server):
+    for index in range(10):
+        devops_server.add_repository("project-a", f"repo-{index}", protected=index % 2 == 0)
+    return devops_server
+
+async def test_rules_share_one_fetch_per_data_kind(
+    many_repositories,
+    devops_client,
+    plugin_manager,
+    feature_manager,
+    enable_feature
+):
+    feature_manager.unregister_feature('branch-protection', persist=False)
+    rules = [
+        DataRule("policies", [BRANCH_POLICIES]),
+        DataRule("permissions", [BRANCH_POLICIES, EDIT_POLICIES]),
+        DataRule("metadata", [REPOSITORY, BRANCH_POLICIES])
+    ]
+    for rule in rules:
+        plugin_manager._plugins[rule.get_name()] = rule
+        enable_feature(rule.get_name())
+    service = ComplianceService(devops_client=devops_client)
+    
+    report = await service.check_project_compliance("project-a")
+    
+    requests = many_repositories.request_counts
+    assert len(report.checks) == 3 * 12
+    assert requests["/project-a/_apis/policy/configurations"] == 1
+    assert sum(count for path, count in requests.items() if "/_apis/permissions/" in path) == 1
+    assert not any(path.startswith("/project-a/_apis/git/repositories/") for path in requests)
+    seen = rules[1].seen["repo-1"]
+    assert seen[BRANCH_POLICIES] == []
+    assert seen[EDIT_POLICIES] is True
+    assert len(rules[0].seen["repo-2"][BRANCH_POLICIES]) == 3
+    assert rules[2].seen["repo-3"][REPOSITORY]["name"] == "repo-3"
+
+async def test_views_are_read_only(many_repositories, devops_client):
+    views = await RepositoryDataPlanner(devops_client).fetch(
+        "project-a",
+        ["repo-0", "repo-1"],
+        [BRANCH_POLICIES]
+    )
+    
+    with pytest.raises(TypeError):
+        views["repo-0"][BRANCH_POLICIES] = []
+    assert set(views) == {"repo-0", "repo-1"}
+
+async def test_rules_fetch_their_own_data_when_run_alone(many_repositories, devops_client):
+    rule = DataRule("alone", [BRANCH_POLICIES])
+    rule.devops_client = devops_client
+    
+    await rule.execute_check({"project_id": "project-a", "repository": "repo-4"})
+    
+    assert len(rule.seen["repo-4"][BRANCH_POLICIES]) == 3
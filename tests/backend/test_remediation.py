@@ -0,0 +1,148 @@
+import pytest
+from datetime import date
+from fastapi.testclient import TestClient
+from src.backend.api.main import app
+from src.backend.core.compliance.base_rules import AutoFixMixin, ComplianceRuleBase
+from src.backend.core.compliance.remediation import FixBudget, FixQueue
+from src.backend.models.compliance import ComplianceRule, FixPlan
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.remediation_service import RemediationService
+
+POLICIES_PATH = "/project-a/_apis/policy/configurations"
+
+def add_unreviewed_repository(server, name: str):
+    """Repository with every branch policy but minimum reviewers, which auto-fix can add"""
+    repository = server.add_repository("project-a", name)
+    repository["policies"] = repository["policies"][1:]
+    return repository
+
+def make_service(devops_client, plugin_manager, enable_feature, fixes: FixQueue) -> ComplianceService:
+    service = ComplianceService(devops_client=devops_client, fixes=fixes)
+    enable_feature(plugin_manager.get_plugin("Branch Protection Rule").get_name())
+    enable_feature('auto-fix')
+    return service
+
+async def test_checks_plan_fixes_without_writing(devops_server, devops_client, plugin_manager, enable_feature):
+    repository = add_unreviewed_repository(devops_server, "unreviewed-repo")
+    fixes = FixQueue()
+    service = make_service(devops_client, plugin_manager, enable_feature, fixes)
+    
+    report = await service.check_project_compliance("project-a")
+    service.invalidate_reports()
+    await service.check_project_compliance("project-a")
+    
+    [plan] = fixes.list()
+    assert plan.repository == "unreviewed-repo"
+    assert plan.status == "pending"
+    assert [change["setting"] for change in plan.changes] == [
+        "require_pull_request",
+        "required_reviewers",
+        "dismiss_stale_reviews"
+    ]
+    assert plan.action["policy_id"] is None
+    # open-repo lacks status checks too, which auto-fix cannot add
+    checks = {check.repository: check for check in report.checks}
+    assert checks["unreviewed-repo"].details["fix_plan"] == plan.id
+    assert "fix_plan" not in checks["open-repo"].details
+    assert len(repository["policies"]) == 2
+
+async def test_approved_plans_are_applied_within_the_daily_budget(
+    tmp_path,
+    devops_server,
+    devops_client,
+    plugin_manager,
+    enable_feature
+):
+    repositories = [add_unreviewed_repository(devops_server, f"unreviewed-{index}") for index in range(3)]
+    fixes = FixQueue()
+    service = make_service(devops_client, plugin_manager, enable_feature, fixes)
+    budget = FixBudget(tmp_path / "budget.json", max_per_day=2, today=lambda: date(2026, 1, 5))
+    remediation = RemediationService(service, fixes, budget, write_concurrency=2)
+    await service.check_project_compliance("project-a")
+    
+    assert await remediation.apply() == {"applied": 0, "failed": 0, "deferred": 0}
+    fixes.approve([plan.id for plan in fixes.list()])
+    devops_server.reset_stats()
+    result = await remediation.apply()
+    
+    assert result == {"applied": 2, "failed": 0, "deferred": 1}
+    assert [len(repository["policies"]) for repository in repositories] == [3, 3, 2]
+    # One write and one targeted re-read per fix, no full re-check
+    assert devops_server.request_counts == {POLICIES_PATH: 4}
+    assert [plan.status for plan in fixes.list()] == ["applied", "applied", "approved"]
+    assert FixBudget(tmp_path / "budget.json", max_per_day=2, today=lambda: date(2026, 1, 5)).remaining() == 0
+    
+    budget._today = lambda: date(2026, 1, 6)
+    assert await remediation.apply() == {"applied": 1, "failed": 0, "deferred": 0}
+    assert remediation.get_stats()["applied"] == 3
+
+async def test_rejected_and_repeated_plans_are_not_reapplied(tmp_path, plugin_manager, enable_feature):
+    fixes = FixQueue()
+    service = ComplianceService(fixes=fixes)
+    remediation = RemediationService(service, fixes, FixBudget(tmp_path / "budget.json"))
+    plan = FixPlan(id="fix-1", rule_id="branch-protection", project_id="p", repository="r", created_at="")
+    
+    fixes.submit(plan)
+    fixes.reject(["fix-1"])
+    again = fixes.submit(plan.model_copy(update={"status": "pending"}))
+    
+    assert again.status == "rejected"
+    assert fixes.approve(["fix-1"]) == []
+    assert await remediation.apply() == {"applied": 0, "failed": 0, "deferred": 0}
+    assert remediation.budget.remaining() == 10
+
+async def test_plans_of_disabled_rules_fail_without_using_budget(tmp_path, plugin_manager, feature_manager):
+    fixes = FixQueue(require_approval=False)
+    service = ComplianceService(fixes=fixes)
+    remediation = RemediationService(service, fixes, FixBudget(tmp_path / "budget.json", max_per_day=1))
+    fixes.submit(FixPlan(id="fix-1", rule_id="retired-rule", project_id="p", repository="r", created_at=""))
+    
+    result = await remediation.apply()
+    
+    assert result == {"applied": 0, "failed": 1, "deferred": 0}
+    assert fixes.get("fix-1").error == "Rule is not enabled: retired-rule"
+    assert remediation.budget.remaining() == 1
+
+def test_fix_rules_must_implement_plan_writes():
+    class InlineFixRule(ComplianceRuleBase, AutoFixMixin):
+        def get_rule_definition(self):
+            return ComplianceRule(id="inline", name="inline", description="Inline fix", level="error")
+        
+        async def check_compliance(self, context):
+            pass
+        
+        async def can_auto_fix(self, context):
+            return True
+        
+        async def apply_fix(self, context):
+            return True
+    
+    class PlannedFixRule(InlineFixRule):
+        async def apply_plan(self, plan):
+            pass
+        
+        async def verify_plan(self, plan):
+            pass
+    
+    with pytest.raises(TypeError):
+        InlineFixRule()
+    assert PlannedFixRule()
+
+def test_fix_endpoints_require_admin_token_to_change_plans(feature_manager, plugin_manager, monkeypatch):
+    with TestClient(app) as client:
+        fixes = app.state.container.remediation.fixes
+        fixes.submit(FixPlan(id="fix-1", rule_id="branch-protection", project_id="p", repository="r", created_at=""))
+        denied = client.post("/api/v1/compliance/fixes/reject", json={"ids": ["fix-1"]})
+        monkeypatch.setenv("COMPLIANCEX_ADMIN_TOKEN", "secret")
+        rejected = client.post(
+            "/api/v1/compliance/fixes/reject",
+            json={"ids": ["fix-1"]},
+            headers={"X-Admin-Token": "secret"}
+        )
+        plans = client.get("/api/v1/compliance/fixes", params={"status": "rejected"}).json()
+        stats = client.get("/api/v1/compliance/fixes/stats").json()
+    
+    assert denied.status_code == 403
+    assert [plan["id"] for plan in rejected.json()] == ["fix-1"]
+    assert [plan["id"] for plan in plans] == ["fix-1"]
+    assert stats["plans"]["rejected"] == 1
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from src.backend.api.main import app
+from src.backend.core.compliance.report_cache import ReportCache
+from src.backend.models.compliance import ComplianceReport
+from src.backend.services.compliance_service import ComplianceService
+from tests.backend.test_compliance_service import DelayedRule
+
+def report(project_id: str) -> ComplianceReport:
+    return ComplianceReport(
+        project_id=project_id,
+        project_name=project_id,
+        checks=[],
+        overall_status="passed",
+        generated_at="2026-03-31T00:00:00"
+    )
+
+class CountingCheck:
+    """Compute function that counts its runs and finishes when released"""
+    
+    def __init__(self, project_id: str = "project-a"):
+        self.project_id = project_id
+        self.runs = 0
+        self.release = asyncio.Event()
+    
+    async def __call__(self) -> ComplianceReport:
+        self.runs += 1
+        await self.release.wait()
+        return report(self.project_id)
+
+async def test_concurrent_requests_share_one_check(clock):
+    cache = ReportCache(clock=clock)
+    compute = CountingCheck()
+    
+    requests = [
+        asyncio.ensure_future(cache.get_or_compute(("project-a", "features"), compute))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    compute.release.set()
+    reports = await asyncio.gather(*requests)
+    cached = await cache.get_or_compute(("project-a", "features"), compute)
+    
+    assert compute.runs == 1
+    assert all(result is reports[0] for result in reports + [cached])
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+    assert stats["in_flight"] == 0
+
+async def test_entries_expire_and_are_evicted(clock):
+    cache = ReportCache(max_entries=2, ttl_seconds=10, clock=clock)
+    for project_id in ("a", "b"):
+        cache.put((project_id, "features"), report(project_id))
+    
+    assert cache.get(("a", "features")) is not None
+    cache.put(("c", "features"), report("c"))
+    assert cache.get(("b", "features")) is None
+    clock.now += 10
+    assert cache.get(("a", "features")) is None
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_stats()["expirations"] == 1
+
+async def test_invalidation_during_a_check_keeps_its_result_out(clock):
+    cache = ReportCache(clock=clock)
+    compute = CountingCheck()
+    
+    request = asyncio.ensure_future(cache.get_or_compute(("project-a", "features"), compute))
+    await asyncio.sleep(0)
+    cache.invalidate("project-a")
+    compute.release.set()
+    await request
+    
+    assert cache.get(("project-a", "features")) is None
+    cache.put(("project-b", "features"), report("project-b"))
+    cache.invalidate()
+    assert cache.get(("project-b", "features")) is None
+
+async def test_a_cancelled_caller_does_not_cancel_the_shared_check(clock):
+    cache = ReportCache(clock=clock)
+    compute = CountingCheck()
+    
+    first = asyncio.ensure_future(cache.get_or_compute(("project-a", "features"), compute))
+    second = asyncio.ensure_future(cache.get_or_compute(("project-a", "features"), compute))
+    await asyncio.sleep(0)
+    first.cancel()
+    compute.release.set()
+    
+    assert (await second).project_id == "project-a"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+async def test_feature_changes_and_reloads_bypass_cached_reports(plugin_manager, enable_feature):
+    rule = DelayedRule("delayed", 0.01)
+    plugin_manager._plugins[rule.get_name()] = rule
+    enable_feature(rule.get_name())
+    service = ComplianceService()
+    
+    reports = await asyncio.gather(*(service.check_project_compliance("test-project") for _ in range(3)))
+    enable_feature("some-feature", value=1)
+    changed = await service.check_project_compliance("test-project")
+    await service.reload_plugins()
+    
+    assert reports[1] is reports[0]
+    assert changed is not reports[0]
+    assert service.get_cache_stats()["reports"]["misses"] == 2
+    assert service.get_cache_stats()["reports"]["entries"] == 0
+
+def test_cache_stats_endpoint(feature_manager, plugin_manager):
+    with TestClient(app) as client:
+        for _ in range(2):
+            client.get("/api/v1/compliance/check/test-project")
+        stats = client.get("/api/v1/compliance/cache/stats").json()
+    
+    assert stats["reports"]["hits"] == 1
+    assert stats["reports"]["misses"] == 1
+    assert "entries" in stats["results"]
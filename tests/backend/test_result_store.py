@@ -0,0 +1,75 @@
+from src.backend.core.compliance.result_store import ResultStore
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+
+def make_check(status: str) -> ComplianceCheck:
+    return ComplianceCheck(
+        rule_id="rule",
+        status=status,
+        details={},
+        timestamp="2025-10-10T00:00:00Z"
+    )
+
+def test_results_are_reused_only_for_matching_fingerprints():
+    store = ResultStore()
+    store.put(("rule", "project", None), "abc", make_check("passed"))
+    
+    assert store.get(("rule", "project", None), "abc").status == "passed"
+    assert store.get(("rule", "project", None), "def") is None
+    assert store.get_stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+def test_least_recently_used_results_are_evicted():
+    store = ResultStore(max_entries=2)
+    for repository in ("a", "b", "c"):
+        store.put(("rule", "project", repository), "abc", make_check("passed"))
+    
+    assert store.get(("rule", "project", "a"), "abc") is None
+    assert store.get_stats()["entries"] == 2
+
+def test_store_size_is_configurable(feature_manager, plugin_manager, enable_feature):
+    enable_feature('rule-execution', result_store_max_entries=10)
+    
+    service = ComplianceService()
+    
+    assert service.result_store.max_entries == 10
+
+async def test_unchanged_repositories_reuse_previous_results(
+    devops_server,
+    devops_client,
+    plugin_manager,
+    enable_feature,
+    feature_manager,
+    clock
+):
+    feature_manager.unregister_feature('auto-fix', persist=False)
+    # Run every check rather than serving the cached report
+    enable_feature('rule-execution', report_cache_max_entries=0)
+    service = ComplianceService(devops_client=devops_client)
+    enable_feature("Branch Protection Rule")
+    
+    first = await service.check_project_compliance("project-a")
+    second = await service.check_project_compliance("project-a")
+    
+    devops_server.projects["project-a"]["repositories"]["protected-repo"]["policies"] = []
+    clock.now += 60
+    third = await service.check_project_compliance("project-a")
+    
+    assert first.reuse_stats == {"hits": 0, "misses": 2}
+    assert second.reuse_stats == {"hits": 2, "misses": 0}
+    assert all(check.reused for check in second.checks)
+    assert third.reuse_stats == {"hits": 1, "misses": 1}
+    assert third.repositories == {"protected-repo": "failed", "open-repo": "failed"}
+
+async def test_policies_are_fetched_once_per_check(
+    devops_server,
+    devops_client,
+    plugin_manager,
+    feature_manager
+):
+    feature_manager.unregister_feature('auto-fix', persist=False)
+    service = ComplianceService(devops_client=devops_client)
+    
+    report = await service.check_project_compliance("project-a")
+    
+    assert report.reuse_stats == {"hits": 0, "misses": 2}
+    assert devops_server.request_counts["/project-a/_apis/policy/configurations"] == 1
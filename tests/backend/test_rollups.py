@@ -0,0 +1,157 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from src.backend.api.main import app
+from src.backend.core.compliance.history_store import HistoryStore
+from src.backend.core.compliance.rollups import RollupStore
+from src.backend.models.compliance import ComplianceCheck, ComplianceRule
+from tests.backend.test_compliance_service import DelayedRule
+
+TODAY = date(2026, 3, 31)
+
+def check(day: date = TODAY, status="passed", rule_id="branch-protection", repository="repo", project_id="project-a"):
+    return ComplianceCheck(
+        rule_id=rule_id,
+        status=status,
+        details={},
+        timestamp=f"{day.isoformat()}T08:30:00",
+        repository=repository,
+        project_id=project_id
+    )
+
+def test_counts_follow_the_latest_status_of_each_target():
+    rollups = RollupStore()
+    rollups.record([check(), check(repository="other", status="failed")])
+    rollups.record([check(status="failed")])
+    
+    project = rollups.get_project("project-a")
+    
+    assert project.counts == {"passed": 0, "warning": 0, "failed": 2, "error": 0}
+    assert json.loads(rollups.get_overview_payload())["overallScore"] == 0.0
+    rollups.record([check(), check(repository="other")])
+    assert project.counts["passed"] == 2
+    assert json.loads(rollups.get_overview_payload())["overallScore"] == 100.0
+
+def test_payload_is_serialized_once_per_change():
+    rollups = RollupStore()
+    rollups.describe_rules([ComplianceRule(
+        id="branch-protection",
+        name="Branch Protection Rule",
+        description="Protected default branches",
+        level="warning"
+    )])
+    rollups.record([check(), check(repository="other", status="warning")])
+    
+    payload = rollups.get_project_payload("project-a")
+    
+    assert rollups.get_project_payload("project-a") is payload
+    data = json.loads(payload)
+    assert data["rules"] == [{
+        "ruleId": "branch-protection",
+        "ruleName": "Branch Protection Rule",
+        "status": "warning",
+        "severity": "medium",
+        "description": "Protected default branches",
+        "lastScanned": "2026-03-31T08:30:00",
+        "counts": {"passed": 1, "warning": 1, "failed": 0, "error": 0}
+    }]
+    assert data["chartData"] == [
+        {"category": "compliant", "count": 1},
+        {"category": "warning", "count": 1},
+        {"category": "non-compliant", "count": 0}
+    ]
+    rollups.record([check(repository="other")])
+    assert rollups.get_project_payload("project-a") is not payload
+    assert rollups.get_project_payload("unknown") is None
+
+def test_trend_closes_a_bucket_per_day():
+    rollups = RollupStore(max_history_days=3)
+    for offset in range(5, -1, -1):
+        day = TODAY - timedelta(days=offset)
+        rollups.record([check(day, status="passed" if offset % 2 else "failed")])
+    
+    trend = json.loads(rollups.get_project_payload("project-a"))["trend"]
+    
+    assert [point["date"] for point in trend] == [
+        (TODAY - timedelta(days=offset)).isoformat() for offset in (2, 1, 0)
+    ]
+    assert [point["score"] for point in trend] == [0.0, 100.0, 0.0]
+
+def test_rollups_are_rebuilt_from_history(tmp_path):
+    now = datetime(2026, 3, 31, 12, 0, tzinfo=timezone.utc)
+    history = HistoryStore(tmp_path / "history", clock=lambda: now)
+    history.append([check(TODAY - timedelta(days=1), status="failed"), check(), check(repository=None, status="error")])
+    recorded = RollupStore()
+    recorded.record([check(TODAY - timedelta(days=1), status="failed"), check(), check(repository=None, status="error")])
+    
+    replayed = RollupStore()
+    replayed.replay(history.iter_records(TODAY - timedelta(days=1), TODAY))
+    history.close()
+    
+    assert replayed.get_project_payload("project-a") == recorded.get_project_payload("project-a")
+
+def test_dashboard_endpoint_serves_rollups(feature_manager, plugin_manager, enable_feature):
+    feature_manager.unregister_feature('branch-protection', persist=False)
+    rule = DelayedRule("delayed")
+    plugin_manager._plugins[rule.get_name()] = rule
+    enable_feature(rule.get_name())
+    
+    with TestClient(app) as client:
+        missing = client.get("/api/v1/compliance/dashboard/test-project")
+        client.get("/api/v1/compliance/check/test-project")
+        response = client.get("/api/v1/compliance/dashboard/test-project")
+        overview = client.get("/api/v1/compliance/dashboard").json()
+    
+    assert missing.status_code == 404
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["projectId"] == "test-project"
+    assert data["overallScore"] == 100.0
+    assert [(rule["ruleId"], rule["description"]) for rule in data["rules"]] == [("delayed", "Delayed test rule")]
+    assert overview["projects"] == 1
+
+def test_changes_since_a_version_or_timestamp():
+    rollups = RollupStore()
+    rollups.record([check(), check(repository="other")])
+    version = json.loads(rollups.get_project_payload("project-a"))["version"]
+    rollups.record([check(TODAY + timedelta(days=1)), check(TODAY + timedelta(days=1), repository="other", status="failed")])
+    
+    by_version = json.loads(rollups.get_project_changes("project-a", str(version)))
+    by_timestamp = json.loads(rollups.get_project_changes("project-a", f"{TODAY.isoformat()}T23:00:00Z"))
+    
+    assert by_version["changes"] == [{
+        "ruleId": "branch-protection",
+        "repository": "other",
+        "status": "failed",
+        "changedAt": "2026-04-01T08:30:00",
+        "version": 4
+    }]
+    assert by_timestamp["changes"] == by_version["changes"]
+    assert by_version["counts"]["failed"] == 1
+    assert json.loads(rollups.get_project_changes("project-a", "4"))["changes"] == []
+    assert len(json.loads(rollups.get_project_changes("project-a", "0"))["changes"]) == 2
+
+def test_dashboard_honors_etags_and_deltas(feature_manager, plugin_manager):
+    with TestClient(app) as client:
+        client.app.state.container.rollups.record([check(project_id="test-project")])
+        first = client.get("/api/v1/compliance/dashboard/test-project")
+        etag = first.headers["etag"]
+        unchanged = client.get("/api/v1/compliance/dashboard/test-project", headers={"If-None-Match": f'"other", W/{etag}'})
+        overview = client.get("/api/v1/compliance/dashboard")
+        overview_unchanged = client.get("/api/v1/compliance/dashboard", headers={"If-None-Match": overview.headers["etag"]})
+        
+        client.app.state.container.rollups.record([check(project_id="test-project", status="failed")])
+        changed = client.get("/api/v1/compliance/dashboard/test-project", headers={"If-None-Match": etag})
+        delta = client.get(f"/api/v1/compliance/dashboard/test-project?since={first.json()['version']}")
+        invalid = client.get("/api/v1/compliance/dashboard/test-project?since=yesterday")
+    
+    assert etag.startswith('"')
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert overview_unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert [change["status"] for change in delta.json()["changes"]] == ["failed"]
+    assert invalid.status_code == 400
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.job_service import JobService
+from src.backend.services.scheduler import ComplianceScheduler
+from tests.backend.test_compliance_service import fake_organization
+
+class FakeScheduleClock:
+    """Wall clock that only moves when the scheduler sleeps"""
+    
+    def __init__(self, now: datetime):
+        self.now = now
+    
+    def __call__(self) -> datetime:
+        return self.now
+    
+    async def sleep(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+        await asyncio.sleep(0)
+
+@pytest.fixture
+def configure_schedule(enable_feature, tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    
+    def configure(**parameters):
+        settings = {
+            "frequency": "daily",
+            "time": "02:00",
+            "timezone": "Europe/Amsterdam",
+            "window_minutes": 60,
+            "checkpoint_path": str(checkpoint_path)
+        }
+        settings.update(parameters)
+        enable_feature('compliance-scheduling', **settings)
+        return checkpoint_path
+    return configure
+
+@pytest.fixture
+async def scheduler(plugin_manager, feature_manager, enable_feature, configure_schedule):
+    configure_schedule()
+    enable_feature('scan-jobs', workers=2)
+    compliance_service = ComplianceService()
+    fake_organization(compliance_service, project_count=20, repository_count=0)
+    job_service = JobService(compliance_service)
+    await job_service.start()
+    clock = FakeScheduleClock(datetime(2025, 7, 1, 0, 0, tzinfo=timezone.utc))
+    yield ComplianceScheduler(compliance_service, job_service, clock=clock, sleep=clock.sleep)
+    await job_service.stop()
+
+def record_scans(scheduler):
+    scanned = []
+    original = scheduler.compliance_service.check_project_compliance
+    
+    async def check_project_compliance(project_id):
+        scanned.append((scheduler.clock(), project_id))
+        return await original(project_id)
+    scheduler.compliance_service.check_project_compliance = check_project_compliance
+    return scanned
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+async def test_runs_follow_configured_time_and_timezone(scheduler, configure_schedule):
+    # 02:00 in Amsterdam is 00:00 UTC in summer
+    now = utc(2025, 7, 2, 1, 30)
+    
+    assert scheduler.get_run_start(now) == utc(2025, 7, 2, 0, 0)
+    assert scheduler.get_next_run_start(now) == utc(2025, 7, 3, 0, 0)
+    
+    configure_schedule(frequency="weekly")
+    
+    assert scheduler.get_run_start(now) == utc(2025, 6, 30, 0, 0)
+    assert scheduler.get_next_run_start(now) == utc(2025, 7, 7, 0, 0)
+
+async def test_projects_are_spread_across_the_window_and_shards(scheduler, configure_schedule):
+    run_start = utc(2025, 7, 1, 0, 0)
+    project_ids = [f"project-{index}" for index in range(200)]
+    
+    plan = scheduler.plan_run(run_start, project_ids)
+    times = [scan_at for scan_at, _ in plan]
+    
+    assert len(plan) == 200
+    assert plan == scheduler.plan_run(run_start, project_ids)
+    assert run_start <= min(times) < run_start + timedelta(minutes=5)
+    assert run_start + timedelta(minutes=55) < max(times) < run_start + timedelta(minutes=60)
+    
+    shards = []
+    for shard_index in range(3):
+        configure_schedule(shard_count=3, shard_index=shard_index)
+        shards.append({project_id for _, project_id in scheduler.plan_run(run_start, project_ids)})
+    
+    assert set.union(*shards) == set(project_ids)
+    assert sum(len(shard) for shard in shards) == 200
+
+async def test_run_scans_every_project_at_its_slot(scheduler, configure_schedule):
+    checkpoint_path = configure_schedule()
+    scanned = record_scans(scheduler)
+    run_start = utc(2025, 7, 1, 0, 0)
+    plan = dict((project_id, scan_at) for scan_at, project_id in scheduler.plan_run(
+        run_start, [f"project-{index}" for index in range(20)]
+    ))
+    
+    count = await scheduler.run_once(run_start)
+    
+    assert count == 20
+    assert sorted(project_id for _, project_id in scanned) == sorted(plan)
+    assert all(scanned_at >= plan[project_id] for scanned_at, project_id in scanned)
+    records = [json.loads(line) for line in checkpoint_path.read_text().splitlines()]
+    assert records[0] == {"run": run_start.isoformat()}
+    assert records[-1] == {"finished": True}
+    assert len(records) == 22
+
+async def test_interrupted_run_resumes_from_checkpoint(scheduler, configure_schedule):
+    checkpoint_path = configure_schedule()
+    run_start = utc(2025, 7, 1, 0, 0)
+    checkpoint_path.write_text("\n".join(
+        [json.dumps({"run": run_start.isoformat()})] +
+        [json.dumps({"project_id": f"project-{index}"}) for index in range(15)]
+    ) + "\n{\"project_id\": \"proj")
+    scanned = record_scans(scheduler)
+    
+    count = await scheduler.run_once(run_start)
+    
+    assert count == 5
+    assert sorted(project_id for _, project_id in scanned) == [f"project-{index}" for index in range(15, 20)]
+
+async def test_scheduler_resumes_unfinished_runs_and_waits_for_new_ones(scheduler, configure_schedule):
+    checkpoint_path = configure_schedule()
+    started = []
+    
+    async def run_once(run_start):
+        started.append((scheduler.clock(), run_start))
+        raise asyncio.CancelledError()
+    scheduler.run_once = run_once
+    scheduler.clock.now = utc(2025, 7, 1, 0, 30)
+    
+    with pytest.raises(asyncio.CancelledError):
+        await scheduler.run_forever()
+    
+    scheduler.clock.now = utc(2025, 7, 1, 0, 30)
+    checkpoint_path.write_text(json.dumps({"run": utc(2025, 7, 1, 0, 0).isoformat()}) + "\n")
+    
+    with pytest.raises(asyncio.CancelledError):
+        await scheduler.run_forever()
+    
+    assert started == [
+        (utc(2025, 7, 2, 0, 0), utc(2025, 7, 2, 0, 0)),
+        (utc(2025, 7, 1, 0, 30), utc(2025, 7, 1, 0, 0))
+    ]
+
+async def test_failed_runs_back_off_and_the_next_run_still_happens(scheduler, configure_schedule):
+    checkpoint_path = configure_schedule(retry_seconds=60)
+    checkpoint_path.write_text(json.dumps({"run": utc(2025, 7, 1, 0, 0).isoformat()}) + "\n")
+    started = []
+    
+    async def run_once(run_start):
+        started.append((scheduler.clock(), run_start))
+        if len(started) < 3:
+            raise RuntimeError("DevOps unavailable")
+        raise asyncio.CancelledError()
+    scheduler.run_once = run_once
+    scheduler.clock.now = utc(2025, 7, 1, 0, 30)
+    
+    with pytest.raises(asyncio.CancelledError):
+        await scheduler.run_forever()
+    
+    # The interrupted run is retried after 60 s, then after another 120 s
+    assert started == [
+        (utc(2025, 7, 1, 0, 30), utc(2025, 7, 1, 0, 0)),
+        (utc(2025, 7, 1, 0, 31), utc(2025, 7, 1, 0, 0)),
+        (utc(2025, 7, 1, 0, 33), utc(2025, 7, 1, 0, 0))
+    ]
+    assert scheduler.failures == 2
+    assert scheduler.last_error == "DevOps unavailable"
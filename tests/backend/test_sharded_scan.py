@@ -0,0 +1,34 @@
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.sharded_scan import ShardedScanner, decode_checks, encode_checks
+
+def test_checks_round_trip_through_rows():
+    check = ComplianceCheck(
+        rule_id="branch-protection",
+        status="failed",
+        details={"missing_settings": ["required_reviewers"]},
+        timestamp="2025-10-10T00:00:00Z",
+        repository="repo",
+        project_id="project",
+        reused=False
+    )
+    
+    assert list(decode_checks(encode_checks([check]))) == [check]
+
+async def test_projects_are_scanned_across_processes(monkeypatch, tmp_path):
+    monkeypatch.setenv("COMPLIANCEX_PLUGIN_MANIFEST", str(tmp_path / "plugin_manifest.json"))
+    server = FakeDevOpsServer()
+    project_ids = [f"project-{index}" for index in range(5)]
+    for project_id in project_ids:
+        server.add_repository(project_id, "protected-repo")
+        server.add_repository(project_id, "open-repo", protected=False)
+    
+    async with server:
+        with ShardedScanner(processes=2, shard_size=2, organization_url=server.url) as scanner:
+            checks = [check async for check in scanner.scan(project_ids)]
+    
+    results = {(check.project_id, check.repository): check.status for check in checks}
+    assert len(checks) == 10
+    assert {project_id for project_id, _ in results} == set(project_ids)
+    assert {status for (_, repository), status in results.items() if repository == "open-repo"} == {"failed"}
+    assert {status for (_, repository), status in results.items() if repository == "protected-repo"} == {"passed"}
@@ -0,0 +1,101 @@
+import asyncio
+import time
+import pytest
+from src.backend.core.devops.cache import ResponseCache
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.devops.throttle import AdaptiveLimiter, ConcurrencyController
+
+@pytest.fixture
+def limiter(clock):
+    return AdaptiveLimiter("read", 8, maximum=16, latency_target=1.0, clock=clock)
+
+async def test_throttling_halves_the_limit_once_per_burst(limiter, clock):
+    started = [await limiter.acquire() for _ in range(4)]
+    
+    for start in started:
+        limiter.release(start, throttled=True)
+    
+    assert limiter.limit == 4
+    assert limiter.get_stats()["decreases"] == 1
+    assert limiter.get_stats()["throttled"] == 4
+
+async def test_slow_responses_shrink_the_limit(limiter, clock):
+    start = await limiter.acquire()
+    clock.now += 1.5
+    limiter.release(start)
+    
+    assert limiter.limit == 4
+    assert limiter.get_stats()["slow"] == 1
+
+async def test_limit_grows_only_while_saturated(limiter):
+    start = await limiter.acquire()
+    limiter.release(start)
+    assert limiter.limit == 8
+    
+    for _ in range(30):
+        started = [await limiter.acquire() for _ in range(limiter.limit)]
+        for start in started:
+            limiter.release(start)
+    
+    assert limiter.limit == 16
+
+async def test_requests_beyond_the_limit_wait(clock):
+    limiter = AdaptiveLimiter("write", 1, maximum=1, clock=clock)
+    first = await limiter.acquire()
+    second = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not second.done()
+    
+    limiter.release(first)
+    limiter.release(await second)
+    
+    assert limiter.get_stats()["waits"] == 1
+    assert limiter.in_flight == 0
+
+async def test_client_adapts_to_a_throttling_server(devops_server):
+    for index in range(100):
+        devops_server.add_project(f"project-{index}")
+    devops_server.latency = 0.01
+    devops_server.throttle(4)
+    client = DevOpsClient(
+        devops_server.url,
+        max_retries=10,
+        backoff_base=0.001,
+        cache=ResponseCache(max_entries=0)
+    )
+    
+    async with client:
+        projects = await asyncio.gather(*(
+            client.get_project(f"project-{index}") for index in range(100)
+        ))
+        stats = client.get_stats()["concurrency"]
+    
+    assert len(projects) == 100
+    assert stats["read"]["throttled"] == devops_server.throttled_count > 0
+    assert stats["read"]["limit"] < 8
+    # Most requests got through without being throttled once the limit adapted
+    assert devops_server.throttled_count < 50
+    assert stats["write"]["decreases"] == 0
+
+async def test_retry_after_pauses_the_read_budget_only(devops_server):
+    repository = devops_server.add_repository("project-a", "fixed-repo", protected=False)
+    controller = ConcurrencyController()
+    client = DevOpsClient(devops_server.url, backoff_base=0.001, concurrency=controller)
+    devops_server.fail_next(429, headers={"Retry-After": "0.2"})
+    
+    async with client:
+        start = time.monotonic()
+        await client.get_project("project-a")
+        assert time.monotonic() - start >= 0.2
+        
+        controller.read.pause(5)
+        await asyncio.wait_for(
+            client.create_policy_configuration("project-a", {
+                "type": {"id": "x"},
+                "settings": {"scope": [{"repositoryId": repository["id"]}]}
+            }),
+            timeout=1
+        )
+    
+    assert controller.read.get_stats()["pauses"] == 2
+    assert controller.write.get_stats()["pauses"] == 0
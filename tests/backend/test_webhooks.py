@@ -0,0 +1,124 @@
+import json
+from fastapi.testclient import TestClient
+from src.backend.api.main import app
+from src.backend.core.compliance.prefetch import BRANCH_POLICIES, REPOSITORY
+from src.backend.core.compliance.rollups import RollupStore
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.webhook_service import WebhookService, parse_event
+from tests.benchmarks.replay_webhooks import load_samples, render
+
+SAMPLES = load_samples()
+
+def event(sample: str, repository: dict, project_id: str = "project-a") -> dict:
+    return render(SAMPLES[sample], project_id, repository["id"])
+
+def repository(devops_server, name: str) -> dict:
+    return devops_server.projects["project-a"]["repositories"][name]
+
+def test_samples_map_to_repositories_and_data_kinds():
+    policy = parse_event(json.loads(SAMPLES["policy-updated"]))
+    created = parse_event(json.loads(SAMPLES["repo-created"]))
+    branch = parse_event(json.loads(SAMPLES["branch-created"]))
+    
+    assert policy.project_id == "6ce954b1-ce1f-45d1-b94d-e6bf2464ba2c"
+    assert policy.repositories == {"a65f60e9-aa6b-542d-af1e-522fa119a530"}
+    assert policy.kinds == {BRANCH_POLICIES}
+    assert created.repositories == {"568f764d-4f04-5b27-9ad2-b4ca4f6753ea"}
+    assert created.kinds is None
+    assert branch.kinds == {REPOSITORY, BRANCH_POLICIES}
+    assert parse_event(json.loads(SAMPLES["code-pushed"])) is None
+    assert parse_event({"eventType": "ms.vss-policy.policy-updated"}) is None
+
+def test_project_wide_policies_affect_every_repository():
+    payload = json.loads(SAMPLES["policy-updated"])
+    payload["resource"]["policy"]["settings"]["scope"] = [{"refName": "refs/heads/main"}]
+    
+    assert parse_event(payload).repositories is None
+
+async def test_bursts_are_merged_and_redeliveries_dropped(clock):
+    service = ComplianceService()
+    webhooks = WebhookService(service, debounce_seconds=10, max_delay_seconds=25, clock=clock)
+    first = render(SAMPLES["policy-updated"], "project-a", "repo-1")
+    
+    statuses = [webhooks.ingest(first), webhooks.ingest(first)]
+    clock.now = 8
+    statuses.append(webhooks.ingest(render(SAMPLES["branch-created"], "project-a", "repo-2")))
+    pending = webhooks._pending["project-a"]
+    deadline = pending.deadline
+    clock.now = 16
+    statuses.append(webhooks.ingest(render(SAMPLES["code-pushed"], "project-a", "repo-3")))
+    webhooks.ingest(render(SAMPLES["policy-updated"], "project-a", "repo-3"))
+    
+    assert statuses == ["queued", "duplicate", "queued", "ignored"]
+    assert deadline == 18
+    # Never later than max_delay_seconds after the first event
+    assert pending.deadline == 25
+    assert pending.repositories == {"repo-1", "repo-2", "repo-3"}
+    assert pending.kinds == {REPOSITORY, BRANCH_POLICIES}
+    assert webhooks.get_stats()["coalesced"] == 2
+    await webhooks.close()
+    assert webhooks.get_stats()["pending"] == 0
+
+async def test_policy_change_rechecks_only_the_affected_repository(
+    devops_server,
+    devops_client,
+    plugin_manager,
+    feature_manager
+):
+    feature_manager.unregister_feature('auto-fix', persist=False)
+    rollups = RollupStore()
+    service = ComplianceService(devops_client=devops_client, rollups=rollups)
+    webhooks = WebhookService(service, debounce_seconds=0.01)
+    report = await service.check_project_compliance("project-a")
+    assert report.repositories["open-repo"] == "failed"
+    
+    open_repo = repository(devops_server, "open-repo")
+    open_repo["policies"] = devops_server.protected_policies(open_repo["id"])
+    devops_server.reset_stats()
+    for _ in range(3):
+        webhooks.ingest(event("policy-updated", open_repo))
+    await webhooks.flush()
+    
+    assert webhooks.get_stats()["rechecks"] == 1
+    assert webhooks.get_stats()["checks"] == 1
+    assert rollups.get_project("project-a").latest[("branch-protection", "open-repo")] == "passed"
+    # The cached report is dropped rather than served stale
+    report = await service.check_project_compliance("project-a")
+    assert report.repositories["open-repo"] == "passed"
+
+async def test_new_repository_is_checked(devops_server, devops_client, plugin_manager, feature_manager):
+    feature_manager.unregister_feature('auto-fix', persist=False)
+    service = ComplianceService(devops_client=devops_client)
+    webhooks = WebhookService(service, debounce_seconds=0.01)
+    await devops_client.list_repositories("project-a")
+    created = devops_server.add_repository("project-a", "new-repo", protected=False)
+    
+    webhooks.ingest(event("repo-created", created))
+    await webhooks.flush()
+    
+    assert webhooks.get_stats()["checks"] == 1
+    checks = await service.recheck_repositories("project-a", [created["id"]], [BRANCH_POLICIES])
+    assert [(check.repository, check.status) for check in checks] == [("new-repo", "failed")]
+
+def test_ingest_endpoint_requires_a_token(feature_manager, plugin_manager, monkeypatch):
+    payload = render(SAMPLES["code-pushed"], "test-project", "repo")
+    with TestClient(app) as client:
+        disabled = client.post("/api/v1/compliance/webhooks/devops", json=payload)
+        monkeypatch.setenv("COMPLIANCEX_WEBHOOK_TOKEN", "secret")
+        wrong = client.post(
+            "/api/v1/compliance/webhooks/devops",
+            json=payload,
+            headers={"X-Webhook-Token": "guess"}
+        )
+        accepted = client.post(
+            "/api/v1/compliance/webhooks/devops",
+            json=payload,
+            headers={"X-Webhook-Token": "secret"}
+        )
+        stats = client.get("/api/v1/compliance/webhooks/stats").json()
+    
+    assert disabled.status_code == 403
+    assert wrong.status_code == 401
+    assert accepted.status_code == 202
+    assert accepted.json() == {"status": "ignored"}
+    assert stats["received"] == 1
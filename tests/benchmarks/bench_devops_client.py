@@ -0,0 +1,58 @@
+"""Benchmark the shared DevOps client against the in-process fake server
+
+Runs the branch protection rule over every repository of a synthetic project
+twice, cold and then warm, and reports latency, request counts and cache hit
+rate. Run from the repository root:
+
+    python -m tests.benchmarks.bench_devops_client --repositories 200 --latency 0.005
+"""
+import argparse
+import asyncio
+import time
+from src.backend.core.devops.cache import ResponseCache
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.plugins.rules.branch_protection import BranchProtectionRule
+
+async def run_pass(rule: BranchProtectionRule, repositories, concurrency: int) -> float:
+    """Check every repository once and return the elapsed seconds"""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def check(repository: str) -> None:
+        async with semaphore:
+            await rule.execute_check({"project_id": "bench", "repository": repository})
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(check(repository) for repository in repositories))
+    return time.perf_counter() - start
+
+async def main(args: argparse.Namespace) -> None:
+    server = FakeDevOpsServer(latency=args.latency)
+    repositories = [f"repo-{index}" for index in range(args.repositories)]
+    for index, repository in enumerate(repositories):
+        server.add_repository("bench", repository, protected=index % 3 != 0)
+    
+    async with server, DevOpsClient(server.url, cache=ResponseCache(ttl_seconds=args.ttl)) as client:
+        rule = BranchProtectionRule()
+        rule.initialize({})
+        rule.devops_client = client
+        
+        for label in ("cold", "warm"):
+            server.reset_stats()
+            client.reset_stats()
+            elapsed = await run_pass(rule, repositories, args.concurrency)
+            stats = client.get_stats()["cache"]
+            print(
+                f"{label}: {elapsed * 1000:.1f} ms, "
+                f"{server.total_requests} requests "
+                f"({server.not_modified_count} not modified), "
+                f"cache hit rate {stats['hit_rate']:.1%}"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repositories", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--ttl", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""Benchmark streaming report exports of a large check history
+
+Fills a history store with `--checks` checks spread over `--days` days,
+then exports all of them in each format through the export service's
+worker pool, reporting throughput, the compressed size, the peak memory
+traced in the serving process and the longest the event loop went without
+running a 10 ms ticker. Run from the repository root:
+
+    python -m tests.benchmarks.bench_export --checks 1000000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from src.backend.core.compliance.history_store import HistoryStore
+from src.backend.core.reporting.storage import LocalStorage
+from src.backend.models.compliance import ExportRequest
+from src.backend.services.export_service import ExportService
+from tests.benchmarks.bench_history_store import scan
+
+TICK = 0.01
+
+async def ticker(lags: list) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - start - TICK)
+
+async def export(exports: ExportService, format: str) -> None:
+    lags: list = []
+    tick = asyncio.ensure_future(ticker(lags))
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    job = await exports.wait(exports.submit(ExportRequest(format=format)).id)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tick.cancel()
+    if job.status != "completed":
+        raise RuntimeError(job.error)
+    print(
+        f"{format}: {job.checks:,} checks in {elapsed:.2f} s ({job.checks / elapsed:,.0f} checks/s), "
+        f"{job.bytes_written / 1e6:.1f} MB compressed, peak {peak / 1e6:.1f} MB traced, "
+        f"longest loop stall {max(lags, default=0) * 1000:.0f} ms"
+    )
+
+async def run(args: argparse.Namespace, directory: Path) -> None:
+    now = datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+    history = HistoryStore(directory / "history", retention_days=args.days, clock=lambda: now)
+    projects = args.checks // args.days // args.rules
+    for offset in range(args.days - 1, -1, -1):
+        history.append(scan(now - timedelta(days=offset), projects, args.rules))
+    exports = ExportService(
+        history,
+        LocalStorage(directory / "exports"),
+        batch_size=args.batch_size,
+        processes=args.processes
+    )
+    tracemalloc.start()
+    try:
+        for format in args.formats:
+            await export(exports, format)
+    finally:
+        tracemalloc.stop()
+        await exports.close()
+        history.close()
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, Path(directory)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--rules", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--formats", nargs="+", default=["json", "html", "pdf"])
+    main(parser.parse_args())
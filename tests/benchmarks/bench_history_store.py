@@ -0,0 +1,75 @@
+"""Benchmark history store appends, reopening and trend queries
+
+Fills a history store with a synthetic organization scanned once a day for
+the whole retention period, then times reopening it and answering trend
+queries over every day. Run from the repository root:
+
+    python -m tests.benchmarks.bench_history_store --projects 1500 --days 90
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from src.backend.core.compliance.history_store import HistoryStore
+from src.backend.models.compliance import ComplianceCheck
+
+STATUSES = ("passed", "passed", "passed", "failed", "warning")
+
+def scan(day: datetime, projects: int, rules: int):
+    """Build one day's checks without validation, as a scan would produce them"""
+    timestamp = day.replace(tzinfo=None).isoformat()
+    for project in range(projects):
+        for rule in range(rules):
+            yield ComplianceCheck.model_construct(
+                rule_id=f"rule-{rule}",
+                status=STATUSES[(project + rule + day.day) % len(STATUSES)],
+                details={},
+                timestamp=timestamp,
+                repository=f"repo-{rule % 3}",
+                project_id=f"project-{project}",
+                reused=None
+            )
+
+def timed(label: str, function, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label}: {elapsed * 1000:.2f} ms")
+    return result
+
+def main(args: argparse.Namespace) -> None:
+    now = datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "history"
+        store = HistoryStore(path, retention_days=args.days, clock=lambda: now)
+        start = time.perf_counter()
+        total = 0
+        for offset in range(args.days - 1, -1, -1):
+            total += store.append(scan(now - timedelta(days=offset), args.projects, args.rules))
+        store.close()
+        elapsed = time.perf_counter() - start
+        size = sum(item.stat().st_size for item in path.iterdir())
+        print(f"appended {total:,} checks in {elapsed:.2f} s ({total / elapsed:,.0f} checks/s), "
+              f"{size / total:.1f} bytes per check on disk")
+        
+        start = time.perf_counter()
+        store = HistoryStore(path, retention_days=args.days, clock=lambda: now)
+        print(f"reopened in {(time.perf_counter() - start) * 1000:.0f} ms")
+        timed("organization trend", lambda: store.trend(days=args.days))
+        timed("project trend", lambda: store.trend(project_id="project-7", days=args.days))
+        timed("rule trend", lambda: store.trend(rule_id="rule-3", days=args.days))
+        timed("project and rule trend", lambda: store.trend(
+            project_id="project-7",
+            rule_id="rule-3",
+            days=args.days
+        ))
+        store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=1500)
+    parser.add_argument("--rules", type=int, default=10)
+    parser.add_argument("--days", type=int, default=90)
+    main(parser.parse_args())
@@ -0,0 +1,73 @@
+"""Benchmark plugin discovery with a cold and a warm manifest
+
+Generates a package of synthetic rule plugins and times discovery in fresh
+interpreters, first without a manifest and then with the manifest the first
+run wrote. Run from the repository root:
+
+    python -m tests.benchmarks.bench_plugin_discovery --rules 250
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from .synthetic import write_rule_package
+
+PACKAGE = "bench_synthetic_rules"
+
+DISCOVERY_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+from src.backend.core.compliance.base_rules import ComplianceRulePlugin
+from src.backend.core.plugins.plugin_manager import PluginManager
+imported = time.perf_counter()
+manager = PluginManager()
+manager.manifest_path = __import__("pathlib").Path(sys.argv[1])
+manager.discover_plugins(sys.argv[2])
+names = manager.get_plugin_names_by_type(ComplianceRulePlugin)
+discovered = time.perf_counter()
+manager.get_plugin(names[0])
+first_use = time.perf_counter()
+print(json.dumps({
+    "rules": len(names),
+    "discovery_ms": (discovered - imported) * 1000,
+    "first_use_ms": (first_use - discovered) * 1000,
+    "total_ms": (first_use - start) * 1000
+}))
+'''
+
+def run_discovery(root: Path, manifest_path: Path) -> dict:
+    """Run discovery in a fresh interpreter and return its timings"""
+    repository_root = Path(__file__).resolve().parents[2]
+    environment = {"PYTHONPATH": f"{repository_root}:{root}", "PYTHONDONTWRITEBYTECODE": "1"}
+    output = subprocess.run(
+        [sys.executable, "-c", DISCOVERY_SCRIPT, str(manifest_path), PACKAGE],
+        capture_output=True,
+        check=True,
+        cwd=repository_root,
+        env=environment,
+        text=True
+    ).stdout
+    return json.loads(output)
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        write_rule_package(root, PACKAGE, args.rules)
+        manifest_path = root / "manifest.json"
+        
+        for label in ["cold"] + ["warm"] * args.warm_runs:
+            timings = run_discovery(root, manifest_path)
+            print(
+                f"{label}: {timings['rules']} rules, "
+                f"discovery {timings['discovery_ms']:.1f} ms, "
+                f"first use {timings['first_use_ms']:.1f} ms, "
+                f"process total {timings['total_ms']:.1f} ms"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=250)
+    parser.add_argument("--warm-runs", type=int, default=2)
+    main(parser.parse_args())
@@ -0,0 +1,93 @@
+"""Benchmark building checks and serializing large reports
+
+Times building one check each way the code base does (validated, with
+model_construct and with trusted_check), serializing a report of
+`--checks` checks through dicts and straight to bytes, and serving it
+through FastAPI with response_model validation and as bytes from
+dump_json. Run from the repository root:
+
+    python -m tests.benchmarks.bench_results --checks 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+from src.backend.models.compliance import ComplianceCheck, ComplianceReport, dump_json, trusted_check
+
+STATUSES = ("passed", "passed", "passed", "failed", "warning")
+
+def check_values(index: int):
+    return {
+        "rule_id": f"rule-{index % 10}",
+        "status": STATUSES[index % len(STATUSES)],
+        "details": {"message": "Branch protection is configured", "repository": f"repo-{index}"},
+        "timestamp": datetime.utcnow().isoformat(),
+        "repository": f"repo-{index}",
+        "project_id": "project-0",
+        "reused": None
+    }
+
+def per_check(label: str, build, count: int) -> None:
+    values = [check_values(index) for index in range(count)]
+    start = time.perf_counter()
+    for value in values:
+        build(value)
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {elapsed / count * 1e6:.2f} us per check")
+
+async def serve(app: FastAPI, path: str, repeat: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            response = await client.get(path)
+            response.raise_for_status()
+    return (time.perf_counter() - start) / repeat
+
+def timed(label: str, function, count: int, repeat: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label}: {elapsed * 1000:.1f} ms per report, {elapsed / count * 1e6:.2f} us per check")
+
+def main(args: argparse.Namespace) -> None:
+    per_check("validated", lambda value: ComplianceCheck(**value), args.checks)
+    per_check("model_construct", lambda value: ComplianceCheck.model_construct(**value), args.checks)
+    per_check("trusted_check", lambda value: trusted_check(**value), args.checks)
+    
+    report = ComplianceReport(
+        project_id="project-0",
+        project_name="project-0",
+        checks=[trusted_check(**check_values(index)) for index in range(args.checks)],
+        overall_status="failed",
+        generated_at=datetime.utcnow().isoformat()
+    )
+    timed("model_dump + json.dumps", lambda: json.dumps(report.model_dump()), args.checks, args.repeat)
+    timed("model_dump_json", report.model_dump_json, args.checks, args.repeat)
+    timed("dump_json", lambda: dump_json(report), args.checks, args.repeat)
+    
+    app = FastAPI()
+    
+    @app.get("/validated", response_model=ComplianceReport)
+    async def validated():
+        return report
+    
+    @app.get("/bytes", response_model=ComplianceReport)
+    async def as_bytes():
+        return Response(content=dump_json(report), media_type="application/json")
+    
+    for label, path in (("GET with response_model", "/validated"), ("GET with dump_json", "/bytes")):
+        elapsed = asyncio.run(serve(app, path, args.repeat))
+        print(f"{label}: {elapsed * 1000:.1f} ms per report, {elapsed / args.checks * 1e6:.2f} us per check")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,93 @@
+"""Benchmark sharded organization scans on 1 to N processes
+
+Serves a synthetic organization from the fake Azure DevOps server in its own
+process and scans it with ShardedScanner on an increasing number of worker
+processes, reporting checks per second for each. Run from the repository root:
+
+    python -m tests.benchmarks.bench_sharded_scan --projects 200 --repositories 25 --max-processes 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.services.sharded_scan import ShardedScanner
+
+def serve(projects: int, repositories: int, latency: float, ready) -> None:
+    """Serve a synthetic organization until terminated"""
+    async def main() -> None:
+        server = FakeDevOpsServer(latency=latency)
+        for project in range(projects):
+            for repository in range(repositories):
+                server.add_repository(
+                    f"project-{project}",
+                    f"repo-{repository}",
+                    protected=repository % 3 != 0
+                )
+        async with server:
+            ready.put(server.url)
+            await asyncio.Event().wait()
+    asyncio.run(main())
+
+def process_counts(maximum: int):
+    count = 1
+    while count < maximum:
+        yield count
+        count *= 2
+    yield maximum
+
+async def run_pass(url: str, processes: int, project_ids, shard_size: int) -> tuple:
+    """Scan every project once on a warm pool and return (checks, elapsed seconds)"""
+    with ShardedScanner(processes=processes, shard_size=shard_size, organization_url=url) as scanner:
+        # Start every worker before timing; unknown projects cost one request each
+        warmup = [f"warmup-{index}" for index in range(processes * shard_size)]
+        async for _ in scanner.scan(warmup):
+            pass
+        
+        start = time.perf_counter()
+        checks = 0
+        async for _ in scanner.scan(project_ids):
+            checks += 1
+        return checks, time.perf_counter() - start
+
+async def main(args: argparse.Namespace) -> None:
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    server = context.Process(
+        target=serve,
+        args=(args.projects, args.repositories, args.latency, ready),
+        daemon=True
+    )
+    server.start()
+    project_ids = [f"project-{index}" for index in range(args.projects)]
+    try:
+        url = ready.get(timeout=60)
+        baseline = None
+        for processes in process_counts(args.max_processes):
+            checks, elapsed = await run_pass(url, processes, project_ids, args.shard_size)
+            throughput = checks / elapsed
+            baseline = baseline or throughput
+            print(
+                f"{processes} process(es): {checks} checks in {elapsed:.2f} s, "
+                f"{throughput:,.0f} checks/s ({throughput / baseline:.2f}x)"
+            )
+    finally:
+        server.terminate()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--repositories", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--shard-size", type=int, default=10)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    # Keep the benchmark's plugin manifest out of the source tree
+    os.environ.setdefault(
+        "COMPLIANCEX_PLUGIN_MANIFEST",
+        str(Path(tempfile.gettempdir()) / "compliancex_bench_manifest.json")
+    )
+    asyncio.run(main(args))
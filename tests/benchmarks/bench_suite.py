@@ -0,0 +1,317 @@
+"""Reproducible end-to-end benchmark suite on a synthetic organization
+
+Serves N projects x M repositories from the fake Azure DevOps server, with
+simulated latency and branch policies drawn from a configurable
+distribution, and checks every project against K synthetic repository rules
+through three paths: ComplianceService, RuleEngine with one checker per rule,
+and the API over ASGI. Each scenario reports throughput, p50/p99 latency per
+project check and peak traced memory. Results can be saved as a named
+baseline, and later runs compared with it fail when a metric regresses by
+more than the tolerance. Run from the repository root:
+
+    python -m tests.benchmarks.bench_suite --projects 20 --repositories 25 --rules 10 --save-baseline local
+    python -m tests.benchmarks.bench_suite --projects 20 --repositories 25 --rules 10 --compare local
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+import httpx
+from src.backend.api.main import app
+from src.backend.core.compliance.base_rules import ComplianceRulePlugin
+from src.backend.core.compliance.engine import ComplianceChecker, RuleEngine
+from src.backend.core.compliance.prefetch import RepositoryDataPlanner
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.core.features.feature_manager import FeatureFlag, FeatureManager
+from src.backend.core.plugins.plugin_manager import PluginManager
+from src.backend.models.compliance import ComplianceCheck
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.container import HISTORY_PATH_ENV, ServiceContainer
+from .replay_webhooks import percentile
+from .synthetic import DEFAULT_POLICY_DISTRIBUTION, parse_distribution, populate_organization, write_rule_package
+
+PACKAGE = "bench_suite_rules"
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_TOLERANCE = 0.2
+
+# Features that would write to Azure DevOps or run work of their own during a pass
+DISABLED_FEATURES = ("branch-protection", "auto-fix", "notifications", "compliance-scheduling")
+
+# Metric, and whether a higher value is better
+COMPARED_METRICS = (
+    ("checks_per_second", True),
+    ("p50_ms", False),
+    ("p99_ms", False),
+    ("peak_memory_mb", False)
+)
+
+ProjectCheck = Callable[[str], Awaitable[int]]
+
+def prepare(root: Path, rules: int) -> None:
+    """Write the synthetic rules and make them the only enabled ones
+    
+    Report caching and result reuse are turned off, so every pass checks
+    the organization from scratch.
+    """
+    write_rule_package(root, PACKAGE, rules, scope="repository")
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    PluginManager().discover_plugins(PACKAGE)
+    feature_manager = FeatureManager()
+    for name in DISABLED_FEATURES:
+        feature_manager.unregister_feature(name, persist=False)
+    for index in range(rules):
+        name = f"synthetic-{index}"
+        feature_manager.register_feature(FeatureFlag(
+            name=name,
+            enabled=True,
+            description="Synthetic benchmark rule",
+            parameters={}
+        ), persist=False)
+    rule_execution = feature_manager.snapshot.features.get('rule-execution')
+    if rule_execution is not None:
+        parameters = dict(rule_execution.parameters, report_cache_max_entries=0, result_store_max_entries=0)
+        feature_manager.register_feature(rule_execution.model_copy(update={"parameters": parameters}), persist=False)
+
+class RepositoryRuleChecker(ComplianceChecker):
+    """Runs one repository rule over every repository of a project, for RuleEngine"""
+    
+    def __init__(self, rule: ComplianceRulePlugin, client: DevOpsClient):
+        self.rule = rule
+        self.client = client
+    
+    async def check_compliance(self, project_id: str) -> List[ComplianceCheck]:
+        repositories = [record['name'] for record in await self.client.list_repositories(project_id)]
+        views = await RepositoryDataPlanner(self.client).fetch(project_id, repositories, self.rule.requires)
+        return [
+            await self.rule.execute_check({
+                "project_id": project_id,
+                "repository": repository,
+                "data": views.get(repository)
+            })
+            for repository in repositories
+        ]
+
+@asynccontextmanager
+async def service_scenario(url: str) -> AsyncIterator[ProjectCheck]:
+    async with DevOpsClient(url) as client:
+        service = ComplianceService(devops_client=client, plugin_package=PACKAGE)
+        
+        async def check(project_id: str) -> int:
+            return len((await service.check_project_compliance(project_id)).checks)
+        yield check
+
+@asynccontextmanager
+async def engine_scenario(url: str) -> AsyncIterator[ProjectCheck]:
+    async with DevOpsClient(url) as client:
+        plugin_manager = PluginManager()
+        engine = RuleEngine()
+        for name in plugin_manager.get_plugin_names_by_type(ComplianceRulePlugin):
+            rule = plugin_manager.get_plugin(name)
+            if rule.rule.id.startswith("synthetic-"):
+                rule.result_store = None
+                engine.register_rule(rule.rule)
+                engine.register_checker(rule.rule.id, RepositoryRuleChecker(rule, client))
+        
+        async def check(project_id: str) -> int:
+            return len(await engine.run_checks(project_id))
+        yield check
+
+@asynccontextmanager
+async def api_scenario(url: str) -> AsyncIterator[ProjectCheck]:
+    container = ServiceContainer(devops_client=DevOpsClient(url))
+    await container.startup()
+    app.state.container = container
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            async def check(project_id: str) -> int:
+                response = await http.get(f"/api/v1/compliance/check/{project_id}")
+                response.raise_for_status()
+                return len(response.json()["checks"])
+            yield check
+    finally:
+        await container.shutdown()
+
+SCENARIOS = {
+    "service": service_scenario,
+    "engine": engine_scenario,
+    "api": api_scenario
+}
+
+async def run_pass(
+    scenario: str,
+    url: str,
+    project_ids: Sequence[str],
+    concurrency: int,
+    trace_memory: bool = False
+) -> Dict[str, Any]:
+    """Check every project once on a fresh client and collect the measurements"""
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        async with SCENARIOS[scenario](url) as check:
+            semaphore = asyncio.Semaphore(concurrency)
+            latencies: List[float] = []
+            
+            async def run(project_id: str) -> int:
+                async with semaphore:
+                    started = time.perf_counter()
+                    count = await check(project_id)
+                    latencies.append(time.perf_counter() - started)
+                    return count
+            
+            start = time.perf_counter()
+            counts = await asyncio.gather(*(run(project_id) for project_id in project_ids))
+            elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return {
+        "checks": sum(counts),
+        "elapsed_s": elapsed,
+        "checks_per_second": sum(counts) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_memory_mb": peak / 2 ** 20 if peak is not None else None
+    }
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Run every selected scenario `repeat` times and keep the median pass of each
+    
+    Peak memory is measured in one extra pass under tracemalloc, which
+    slows Python down too much for the timed passes.
+    """
+    server = FakeDevOpsServer(latency=args.latency)
+    organization = populate_organization(
+        server,
+        args.projects,
+        args.repositories,
+        parse_distribution(args.policies),
+        args.seed
+    )
+    project_ids = list(organization)
+    results = {}
+    async with server:
+        for scenario in args.scenarios:
+            passes = [
+                await run_pass(scenario, server.url, project_ids, args.concurrency)
+                for _ in range(args.repeat)
+            ]
+            result = sorted(passes, key=lambda item: item["elapsed_s"])[len(passes) // 2]
+            result["elapsed_s_spread"] = statistics.pstdev(item["elapsed_s"] for item in passes)
+            if args.memory:
+                traced = await run_pass(scenario, server.url, project_ids, args.concurrency, trace_memory=True)
+                result["peak_memory_mb"] = traced["peak_memory_mb"]
+            results[scenario] = result
+    return results
+
+def get_parameters(args: argparse.Namespace) -> Dict[str, Any]:
+    """The inputs a baseline is only comparable under"""
+    return {
+        "projects": args.projects,
+        "repositories": args.repositories,
+        "rules": args.rules,
+        "policies": parse_distribution(args.policies),
+        "latency": args.latency,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "machine": platform.machine()
+    }
+
+def compare(
+    baseline: Dict[str, Any],
+    results: Dict[str, Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """Get the metrics that got worse than the baseline by more than `tolerance`"""
+    regressions = []
+    for scenario, result in results.items():
+        previous = baseline["results"].get(scenario) or {}
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{scenario} {metric}: {old:,.1f} -> {new:,.1f} ({change:+.0%})")
+    return regressions
+
+def report(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None) -> None:
+    for scenario, result in results.items():
+        memory = result.get("peak_memory_mb")
+        line = (
+            f"{scenario:>8}: {result['checks']} checks in {result['elapsed_s']:.2f} s "
+            f"(+/- {result['elapsed_s_spread']:.2f}), {result['checks_per_second']:,.0f} checks/s, "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+        )
+        if memory is not None:
+            line += f", peak {memory:.1f} MiB"
+        previous = (baseline or {}).get("results", {}).get(scenario)
+        if previous:
+            line += f" [baseline {previous['checks_per_second']:,.0f} checks/s, p99 {previous['p99_ms']:.1f} ms]"
+        print(line)
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--repositories", type=int, default=25)
+    parser.add_argument("--rules", type=int, default=10)
+    parser.add_argument(
+        "--policies",
+        default=",".join(f"{name}={weight}" for name, weight in DEFAULT_POLICY_DISTRIBUTION.items()),
+        help="share of repositories per policy profile: protected, partial, none"
+    )
+    parser.add_argument("--latency", type=float, default=0.002, help="simulated API latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=4, help="projects checked at once")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per scenario; the median is kept")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline-dir", type=Path, default=BASELINE_DIR)
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args(argv)
+
+def main(args: argparse.Namespace) -> int:
+    baseline = None
+    if args.compare:
+        baseline = json.loads((args.baseline_dir / f"{args.compare}.json").read_text())
+        if baseline["parameters"] != get_parameters(args):
+            print(f"warning: baseline {args.compare!r} was recorded with {baseline['parameters']}")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        os.environ.setdefault("COMPLIANCEX_PLUGIN_MANIFEST", str(root / "manifest.json"))
+        os.environ.setdefault(HISTORY_PATH_ENV, str(root / "history"))
+        prepare(root / "plugins", args.rules)
+        results = asyncio.run(run_suite(args))
+    report(results, baseline)
+    
+    if args.save_baseline:
+        args.baseline_dir.mkdir(parents=True, exist_ok=True)
+        path = args.baseline_dir / f"{args.save_baseline}.json"
+        path.write_text(json.dumps({"parameters": get_parameters(args), "results": results}, indent=2))
+        print(f"saved baseline {path}")
+    if baseline is not None:
+        regressions = compare(baseline, results, args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
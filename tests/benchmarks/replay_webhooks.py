@@ -0,0 +1,173 @@
+"""Replay recorded Azure DevOps service hook payloads for load testing
+
+Renders the samples in tests/benchmarks/webhooks for random synthetic
+projects and repositories, with bursts and redeliveries, and replays them.
+By default events go straight into a WebhookService whose re-checks run
+against the fake Azure DevOps server, and the work done is compared with
+running a full project check per event. With --url they are POSTed to a
+running backend instead. Run from the repository root:
+
+    python -m tests.benchmarks.replay_webhooks --events 5000 --projects 50 --repositories 20
+    python -m tests.benchmarks.replay_webhooks --url http://localhost:8000 --token <token>
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+import aiohttp
+from src.backend.core.devops.client import DevOpsClient
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+from src.backend.services.compliance_service import ComplianceService
+from src.backend.services.webhook_service import WebhookService
+
+SAMPLES_DIR = Path(__file__).parent / "webhooks"
+INGEST_PATH = "/api/v1/compliance/webhooks/devops"
+
+# Ids in the recorded samples, replaced when rendering
+RECORDED_PROJECT = "6ce954b1-ce1f-45d1-b94d-e6bf2464ba2c"
+RECORDED_REPOSITORIES = (
+    "a65f60e9-aa6b-542d-af1e-522fa119a530",
+    "568f764d-4f04-5b27-9ad2-b4ca4f6753ea"
+)
+
+def load_samples() -> Dict[str, str]:
+    """Get the recorded payloads by name, as JSON text"""
+    return {path.stem: path.read_text() for path in sorted(SAMPLES_DIR.glob("*.json"))}
+
+def render(sample: str, project_id: str, repository_id: str) -> Dict[str, Any]:
+    """Retarget a recorded payload at a project and repository, as a new event"""
+    text = sample.replace(RECORDED_PROJECT, project_id)
+    for recorded in RECORDED_REPOSITORIES:
+        text = text.replace(recorded, repository_id)
+    payload = json.loads(text)
+    payload["id"] = str(uuid.uuid4())
+    return payload
+
+def generate_events(args: argparse.Namespace, repositories: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """Bursts of events for one project at a time, some of them delivered twice"""
+    samples = list(load_samples().values())
+    rng = random.Random(args.seed)
+    project_ids = list(repositories)
+    events: List[Dict[str, Any]] = []
+    while len(events) < args.events:
+        project_id = rng.choice(project_ids)
+        for _ in range(min(args.burst, args.events - len(events))):
+            if events and rng.random() < args.duplicate_rate:
+                events.append(rng.choice(events))
+                continue
+            repository_id = rng.choice(repositories[project_id])
+            events.append(render(rng.choice(samples), project_id, repository_id))
+    return events
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def replay_offline(args: argparse.Namespace) -> None:
+    server = FakeDevOpsServer(latency=args.latency)
+    repositories: Dict[str, List[str]] = {}
+    for project in range(args.projects):
+        project_id = f"project-{project}"
+        repositories[project_id] = [
+            server.add_repository(project_id, f"repo-{index}", protected=index % 3 != 0)["id"]
+            for index in range(args.repositories)
+        ]
+    events = generate_events(args, repositories)
+    
+    async with server:
+        async with DevOpsClient(server.url) as client:
+            service = ComplianceService(devops_client=client)
+            webhooks = WebhookService(
+                service,
+                debounce_seconds=args.debounce,
+                max_delay_seconds=args.max_delay
+            )
+            server.reset_stats()
+            start = time.perf_counter()
+            statuses: Dict[str, int] = {}
+            for index, event in enumerate(events):
+                status = webhooks.ingest(event)
+                statuses[status] = statuses.get(status, 0) + 1
+                if args.rate and index % 100 == 99:
+                    await asyncio.sleep(100 / args.rate)
+            ingested = time.perf_counter() - start
+            await webhooks.flush()
+            elapsed = time.perf_counter() - start
+            stats = webhooks.get_stats()
+    
+    rule_count = len(service.get_enabled_rules())
+    print(f"{len(events)} events ingested in {ingested:.2f} s ({len(events) / ingested:,.0f} events/s): {statuses}")
+    print(
+        f"{stats['rechecks']} re-checks ran {stats['checks']} checks with "
+        f"{server.total_requests} DevOps requests; done after {elapsed:.2f} s"
+    )
+    full_checks = statuses.get("queued", 0) * args.repositories * rule_count
+    print(
+        f"A full project check per queued event would run {full_checks} checks "
+        f"({full_checks / max(1, stats['checks']):.0f}x)"
+    )
+    if stats["failures"]:
+        print(f"{stats['failures']} re-checks failed, last: {stats['last_error']}")
+
+async def replay_live(args: argparse.Namespace) -> None:
+    repositories = {
+        f"project-{project}": [str(uuid.uuid4()) for _ in range(args.repositories)]
+        for project in range(args.projects)
+    }
+    events = generate_events(args, repositories)
+    url = args.url.rstrip("/") + INGEST_PATH
+    headers = {"X-Webhook-Token": args.token} if args.token else {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for event in events:
+        queue.put_nowait(event)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    
+    async def sender(session: aiohttp.ClientSession) -> None:
+        while not queue.empty():
+            event = queue.get_nowait()
+            sent = time.perf_counter()
+            async with session.post(url, json=event, headers=headers) as response:
+                body = await response.json()
+            latencies.append(time.perf_counter() - sent)
+            key = body.get("status") if response.status == 202 else str(response.status)
+            statuses[key] = statuses.get(key, 0) + 1
+    
+    start = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(sender(session) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    print(f"{len(events)} events in {elapsed:.2f} s ({len(events) / elapsed:,.0f} events/s): {statuses}")
+    print(
+        f"latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--repositories", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=20, help="events per project in a row")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--rate", type=float, default=0, help="events per second; 0 for as fast as possible")
+    parser.add_argument("--debounce", type=float, default=0.2)
+    parser.add_argument("--max-delay", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="POST to a running backend instead of replaying in-process")
+    parser.add_argument("--token", default=os.environ.get("COMPLIANCEX_WEBHOOK_TOKEN"))
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    # Keep the benchmark's plugin manifest out of the source tree
+    os.environ.setdefault(
+        "COMPLIANCEX_PLUGIN_MANIFEST",
+        str(Path(tempfile.gettempdir()) / "compliancex_bench_manifest.json")
+    )
+    asyncio.run(replay_live(args) if args.url else replay_offline(args))
@@ -0,0 +1,138 @@
+"""Generators for synthetic benchmark inputs"""
+import random
+from pathlib import Path
+from typing import Dict, List
+from src.backend.core.devops.client import (
+    BUILD_POLICY_TYPE,
+    MIN_REVIEWERS_POLICY_TYPE,
+    REQUIRED_REVIEWERS_POLICY_TYPE
+)
+from src.backend.core.devops.fake_server import FakeDevOpsServer
+
+RULE_MODULE_TEMPLATE = '''from typing import Any, Dict
+from src.backend.core.compliance.base_rules import ComplianceRuleBase
+from src.backend.models.compliance import ComplianceRule, ComplianceCheck
+
+class SyntheticRule{index}(ComplianceRuleBase):
+    """Synthetic rule {index}"""
+    
+    def get_rule_definition(self) -> ComplianceRule:
+        return ComplianceRule(
+            id="synthetic-{index}",
+            name="Synthetic Rule {index}",
+            description="Synthetic benchmark rule",
+            level="warning"
+        )
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        return ComplianceCheck(
+            rule_id=self.rule.id,
+            status="passed",
+            details={{}},
+            timestamp="2025-10-10T00:00:00Z"
+        )
+'''
+
+# Passes if the default branch has an enabled, blocking policy of one type
+REPOSITORY_RULE_MODULE_TEMPLATE = '''from typing import Any, Dict
+from src.backend.core.compliance.base_rules import ComplianceRuleBase
+from src.backend.core.compliance.prefetch import BRANCH_POLICIES
+from src.backend.models.compliance import ComplianceRule, ComplianceCheck
+
+class SyntheticRule{index}(ComplianceRuleBase):
+    """Synthetic repository rule {index}"""
+    
+    scope = "repository"
+    requires = (BRANCH_POLICIES,)
+    
+    def get_rule_definition(self) -> ComplianceRule:
+        return ComplianceRule(
+            id="synthetic-{index}",
+            name="Synthetic Rule {index}",
+            description="Synthetic benchmark rule",
+            level="warning"
+        )
+    
+    async def check_compliance(self, context: Dict[str, Any]) -> ComplianceCheck:
+        policies = (context.get('data') or {{}}).get(BRANCH_POLICIES) or []
+        found = any(
+            policy.get("isEnabled") and policy.get("isBlocking") and
+            policy["type"]["id"] == "{policy_type}"
+            for policy in policies
+        )
+        return ComplianceCheck(
+            rule_id=self.rule.id,
+            status="passed" if found else "failed",
+            details={{}},
+            timestamp="2025-10-10T00:00:00Z"
+        )
+'''
+
+SYNTHETIC_POLICY_TYPES = (MIN_REVIEWERS_POLICY_TYPE, REQUIRED_REVIEWERS_POLICY_TYPE, BUILD_POLICY_TYPE)
+
+# How much of the branch protection a synthetic repository has
+POLICY_PROFILES = ("protected", "partial", "none")
+DEFAULT_POLICY_DISTRIBUTION = {"protected": 0.6, "partial": 0.25, "none": 0.15}
+
+def write_rule_package(root: Path, package: str, count: int, scope: str = "project") -> Path:
+    """Write a plugin package with `count` synthetic rule modules under `root`
+    
+    Repository-scoped rules read the prefetched branch policies of each
+    repository and look for one policy type each, so every profile of
+    POLICY_PROFILES passes some of them and fails others.
+    """
+    package_dir = root / package
+    package_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        module_path = package_dir / f"synthetic_rule_{index}.py"
+        if scope == "repository":
+            module = REPOSITORY_RULE_MODULE_TEMPLATE.format(
+                index=index,
+                policy_type=SYNTHETIC_POLICY_TYPES[index % len(SYNTHETIC_POLICY_TYPES)]
+            )
+        else:
+            module = RULE_MODULE_TEMPLATE.format(index=index)
+        module_path.write_text(module)
+    return package_dir
+
+def parse_distribution(text: str) -> Dict[str, float]:
+    """Parse "protected=0.6,partial=0.3,none=0.1" into normalized weights"""
+    weights = {}
+    for item in text.split(","):
+        profile, _, weight = item.partition("=")
+        profile = profile.strip()
+        if profile not in POLICY_PROFILES:
+            raise ValueError(f"Unknown policy profile {profile!r}, expected one of {POLICY_PROFILES}")
+        weights[profile] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Policy distribution weights must add up to more than 0")
+    return {profile: weight / total for profile, weight in weights.items()}
+
+def populate_organization(
+    server: FakeDevOpsServer,
+    projects: int,
+    repositories: int,
+    distribution: Dict[str, float] = DEFAULT_POLICY_DISTRIBUTION,
+    seed: int = 0
+) -> Dict[str, List[str]]:
+    """Add `projects` x `repositories` repositories with policies drawn from `distribution`
+    
+    The same seed always yields the same organization. Returns the
+    repository names of each project id.
+    """
+    rng = random.Random(seed)
+    profiles = list(distribution)
+    weights = [distribution[profile] for profile in profiles]
+    organization = {}
+    for project in range(projects):
+        project_id = f"project-{project}"
+        organization[project_id] = []
+        for index in range(repositories):
+            name = f"repo-{index}"
+            profile = rng.choices(profiles, weights)[0]
+            repository = server.add_repository(project_id, name, protected=profile == "protected")
+            if profile == "partial":
+                repository["policies"] = server.protected_policies(repository["id"])[:1]
+            organization[project_id].append(name)
+    return organization